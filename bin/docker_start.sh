@@ -13,6 +13,9 @@ uwsgi_port=${UWSGI_PORT:-8000}
 uwsgi_processes=${UWSGI_PROCESSES:-4}
 uwsgi_threads=${UWSGI_THREADS:-1}
 
+# ``uwsgi`` (WSGI) or ``uvicorn`` (ASGI), see docs/install/production.rst
+app_server=${APP_SERVER:-uwsgi}
+
 mountpoint=${SUBPATH:-/}
 
 until pg_isready; do
@@ -28,6 +31,17 @@ python src/manage.py migrate
 
 # Start server
 >&2 echo "Starting server"
+if [ "$app_server" = "uvicorn" ]; then
+    # static files are served by the reverse proxy
+    exec uvicorn openzaak_new.asgi:application \
+        --app-dir src \
+        --host 0.0.0.0 \
+        --port $uwsgi_port \
+        --workers $uwsgi_processes \
+        --root-path "${SUBPATH:-}" \
+        --no-server-header
+fi
+
 exec uwsgi \
     --http :$uwsgi_port \
     --http-keepalive \
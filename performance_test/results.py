@@ -0,0 +1,140 @@
+"""
+Machine readable results of a Locust run, and their comparison with a baseline.
+
+The results are a JSON object with the latency percentiles (in ms) per request
+name::
+
+    {
+        "detail": {"requests": 1200, "failures": 0, "rps": 40.1,
+                   "p50": 21.0, "p95": 48.0, "p99": 95.0},
+        ...
+    }
+
+Compare two results with::
+
+    python performance_test/results.py baseline.json results.json --threshold 10
+
+which exits with status 1 when a percentile of a request is more than ``threshold``
+percent slower than in the baseline.
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+
+PERCENTILES = {"p50": 0.5, "p95": 0.95, "p99": 0.99}
+
+
+@dataclass
+class Regression:
+    name: str
+    percentile: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return (self.current - self.baseline) / self.baseline * 100
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name} {self.percentile}: {self.baseline:.0f}ms -> "
+            f"{self.current:.0f}ms (+{self.change:.0f}%)"
+        )
+
+
+def get_results(stats) -> dict[str, dict]:
+    """
+    The results of the ``locust.stats.RequestStats`` of a run.
+    """
+    return {
+        entry.name: {
+            "requests": entry.num_requests,
+            "failures": entry.num_failures,
+            "rps": round(entry.total_rps, 2),
+            **{
+                key: entry.get_response_time_percentile(percentile)
+                for key, percentile in PERCENTILES.items()
+            },
+        }
+        for entry in sorted(stats.entries.values(), key=lambda entry: entry.name)
+        if entry.num_requests
+    }
+
+
+def write_results(results: dict[str, dict], path: str) -> None:
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2)
+
+
+def read_results(path: str) -> dict[str, dict]:
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare(
+    baseline: dict[str, dict],
+    results: dict[str, dict],
+    threshold: float,
+    percentiles: tuple[str, ...] = ("p50", "p95", "p99"),
+    minimum: float = 5,
+) -> list[Regression]:
+    """
+    Return the percentiles that are more than ``threshold`` percent slower than in
+    the ``baseline``.
+
+    Requests that are not in both results are skipped, and so are differences of
+    less than ``minimum`` ms, which are noise for the fastest requests.
+    """
+    regressions = []
+    for name, current in results.items():
+        if name not in baseline:
+            continue
+        for percentile in percentiles:
+            before, after = baseline[name][percentile], current[percentile]
+            if (
+                before
+                and after - before >= minimum
+                and after > before * (1 + threshold / 100)
+            ):
+                regressions.append(Regression(name, percentile, before, after))
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare the results of a Locust run with a baseline."
+    )
+    parser.add_argument("baseline", help="The results to compare against")
+    parser.add_argument("results", help="The results of the run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10,
+        help="Allowed slowdown of a percentile, in percent (default: 10)",
+    )
+    parser.add_argument(
+        "--percentiles",
+        nargs="+",
+        choices=sorted(PERCENTILES),
+        default=sorted(PERCENTILES),
+        help="The percentiles to compare (default: all)",
+    )
+    args = parser.parse_args(argv)
+
+    regressions = compare(
+        read_results(args.baseline),
+        read_results(args.results),
+        args.threshold,
+        tuple(args.percentiles),
+    )
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print(f"No regressions of more than {args.threshold}%")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""
+Compare the concurrency of the WSGI (uwsgi) and the ASGI (uvicorn) deployment of the
+Zaken API at equal memory.
+
+Every server is first started with a single worker process, to measure the memory
+(RSS) of a worker once it has served some requests. It's then started with as many
+workers as fit in ``--memory`` MB, and the Locust scenarios of ``test_locust.py``
+run against it with an increasing number of concurrent ``--users``::
+
+    python performance_test/servers.py --memory 2048 --users 10 50 100
+
+The throughput, the failures and the slowest p95 latency of the scenarios are
+printed per server and number of users, and written to ``--output``. The servers
+run with the settings of the environment (``DJANGO_SETTINGS_MODULE``, ``DB_*``
+etc.), against a database with a dataset, see ``docs/testing.rst``. The memory is
+read from ``/proc``, so this only runs on Linux.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import requests
+from results import read_results
+
+ROOT = Path(__file__).resolve().parent.parent
+ENDPOINT = os.getenv("ENDPOINT", "/zaken/api/v1/zaken")
+
+SERVERS = {
+    "uwsgi": [
+        "uwsgi",
+        "--http=:{port}",
+        "--http-keepalive",
+        "--module=openzaak_new.wsgi:application",
+        "--chdir=src",
+        "--master",
+        "--enable-threads",
+        "--processes={workers}",
+        "--threads=1",
+        "--post-buffering=8192",
+        "--buffer-size=65535",
+    ],
+    "uvicorn": [
+        "uvicorn",
+        "openzaak_new.asgi:application",
+        "--app-dir=src",
+        "--port={port}",
+        "--workers={workers}",
+        "--no-access-log",
+    ],
+}
+
+
+def get_rss(pid: int) -> int:
+    """
+    Return the resident memory (in kB) of the process and all its descendants.
+    """
+    children: dict[int, list[int]] = {}
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            # the parent pid follows the (parenthesized) command name
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        parent = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(parent, []).append(int(entry.name))
+
+    rss = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        pending.extend(children.get(current, []))
+        try:
+            status = (Path("/proc") / str(current) / "status").read_text()
+        except OSError:
+            continue
+        for line in status.splitlines():
+            if line.startswith("VmRSS:"):
+                rss += int(line.split()[1])
+    return rss
+
+
+class Server:
+    def __init__(self, name: str, workers: int, port: int):
+        self.name = name
+        self.workers = workers
+        self.url = f"http://localhost:{port}"
+        self.command = [
+            argument.format(port=port, workers=workers) for argument in SERVERS[name]
+        ]
+
+    def __enter__(self) -> "Server":
+        self.process = subprocess.Popen(
+            self.command,
+            cwd=ROOT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            try:
+                requests.get(f"{self.url}{ENDPOINT}", timeout=5).raise_for_status()
+                return self
+            except requests.RequestException:
+                time.sleep(0.5)
+        self.__exit__()
+        raise RuntimeError(f"{self.name} didn't start: {' '.join(self.command)}")
+
+    def __exit__(self, *exc_info):
+        self.process.terminate()
+        self.process.wait(timeout=30)
+
+    def warm_up(self, requests_per_worker: int = 20) -> None:
+        with requests.Session() as session:
+            for page in range(1, requests_per_worker * self.workers + 1):
+                session.get(f"{self.url}{ENDPOINT}", params={"page": page % 10 + 1})
+
+    @property
+    def rss(self) -> int:
+        return get_rss(self.process.pid)
+
+
+def run_locust(url: str, users: int, run_time: str) -> dict:
+    with tempfile.NamedTemporaryFile(suffix=".json") as results_file:
+        subprocess.run(
+            [
+                "locust",
+                "--config=performance_test/locust.conf",
+                f"--host={url}",
+                f"--users={users}",
+                f"--spawn-rate={users}",
+                f"--run-time={run_time}",
+            ],
+            cwd=ROOT,
+            env={**os.environ, "RESULTS_FILE": results_file.name, "HOST": url},
+            check=True,
+            capture_output=True,
+        )
+        results = read_results(results_file.name)
+
+    return {
+        "rps": round(sum(result["rps"] for result in results.values()), 2),
+        "failures": sum(result["failures"] for result in results.values()),
+        "p95": max((result["p95"] for result in results.values()), default=0),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare the concurrency of the WSGI and ASGI servers."
+    )
+    parser.add_argument(
+        "--memory", type=int, default=2048, help="Memory per server, in MB"
+    )
+    parser.add_argument(
+        "--users",
+        type=int,
+        nargs="+",
+        default=[10, 50, 100],
+        help="The numbers of concurrent Locust users",
+    )
+    parser.add_argument("--run-time", default="60s", help="Duration of every run")
+    parser.add_argument(
+        "--servers", nargs="+", choices=sorted(SERVERS), default=sorted(SERVERS)
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--output", default="performance_test/servers.json")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name in args.servers:
+        with Server(name, workers=1, port=args.port) as server:
+            server.warm_up()
+            worker_rss = server.rss / 1024
+        workers = max(1, int(args.memory // worker_rss))
+
+        results[name] = {
+            "workers": workers,
+            "worker_rss": round(worker_rss),
+            "runs": {},
+        }
+        with Server(name, workers=workers, port=args.port) as server:
+            server.warm_up()
+            for users in args.users:
+                run = run_locust(server.url, users, args.run_time)
+                run["rss"] = round(server.rss / 1024)
+                results[name]["runs"][users] = run
+                print(
+                    f"{name:8} workers={workers:<3} users={users:<4} "
+                    f"rss={run['rss']}MB rps={run['rps']} p95={run['p95']}ms "
+                    f"failures={run['failures']}"
+                )
+
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,192 @@
+"""
+Load test scenarios for the Zaken API.
+
+The targets (zaken, hoofdzaken, bronorganisaties, zaaktypen) are sampled from the
+data of the tested server at the start of the run, so the scenarios work on any
+dataset, e.g. the one of ``generate_dataset``. The latency percentiles per scenario
+are written to ``RESULTS_FILE`` at the end of the run, and compared with
+``BASELINE_FILE`` if it's set: the run fails when a percentile regressed more than
+``THRESHOLD`` percent. See ``docs/testing.rst``.
+"""
+
+import logging
 import os
+import random
+
+import requests
+from locust import HttpUser, between, events, task
+from locust.runners import WorkerRunner
+from results import compare, get_results, read_results, write_results
+
+HOST = os.getenv("HOST", "http://localhost:8000")
+ENDPOINT = os.getenv("ENDPOINT", "/zaken/api/v1/zaken")
+# the number of random list pages the targets are sampled from
+SAMPLE_PAGES = int(os.getenv("SAMPLE_PAGES", "10"))
+PAGE_SIZE = 100
+RESULTS_FILE = os.getenv("RESULTS_FILE", "performance_test/results.json")
+BASELINE_FILE = os.getenv("BASELINE_FILE")
+THRESHOLD = float(os.getenv("THRESHOLD", "10"))
+
+logger = logging.getLogger(__name__)
+
+
+class Targets:
+    count = 0
+    uuids: list[str] = []
+    hoofdzaken: list[str] = []
+    bronorganisaties: list[str] = []
+    zaaktypen: list[str] = []
+    startdata: list[str] = []
+
+    @property
+    def pages(self) -> int:
+        return max(1, -(-self.count // PAGE_SIZE))
+
+
+targets = Targets()
+
+
+def get_uuid(zaak: dict) -> str:
+    return zaak["url"].rstrip("/").rsplit("/", 1)[-1]
+
+
+@events.test_start.add_listener
+def sample_targets(environment, **kwargs):
+    session = requests.Session()
+    url = f"{environment.host or HOST}{ENDPOINT}"
+
+    # the count is estimated on large tables, which could put the last page before
+    # the true end or past it
+    params = {"pageSize": PAGE_SIZE, "countStrategy": "exact"}
+
+    first = session.get(url, params=params)
+    first.raise_for_status()
+    targets.count = first.json()["count"]
+    # the hoofdzaken of ``generate_dataset`` are the oldest zaken, on the last page
+    pages = {targets.pages} | {
+        random.randint(1, targets.pages) for _ in range(SAMPLE_PAGES)
+    }
+    zaken = list(first.json()["results"])
+    for page in pages:
+        response = session.get(url, params={**params, "page": page})
+        response.raise_for_status()
+        zaken.extend(response.json()["results"])
+
+    targets.uuids = [get_uuid(zaak) for zaak in zaken]
+    targets.hoofdzaken = [
+        get_uuid(zaak)
+        for zaak in sorted(zaken, key=lambda zaak: len(zaak["deelzaken"]))[-10:]
+        if zaak["deelzaken"]
+    ]
+    targets.bronorganisaties = sorted(
+        {zaak["bronorganisatie"] for zaak in zaken if zaak["bronorganisatie"]}
+    )
+    targets.zaaktypen = sorted(
+        {zaaktype for zaak in zaken if (zaaktype := zaak.get("Zaaktype"))}
+    )
+    targets.startdata = sorted({zaak["startdatum"] for zaak in zaken})
+    logger.info(
+        "Sampled %d of %d zaken, %d hoofdzaken",
+        len(targets.uuids),
+        targets.count,
+        len(targets.hoofdzaken),
+    )
+
+
+@events.quitting.add_listener
+def report_results(environment, **kwargs):
+    # in a distributed run, the master has the stats of all workers
+    if isinstance(environment.runner, WorkerRunner):
+        return
+
+    results = get_results(environment.stats)
+    write_results(results, RESULTS_FILE)
+    logger.info("Results written to %s", RESULTS_FILE)
+
+    if not BASELINE_FILE:
+        return
+    regressions = compare(read_results(BASELINE_FILE), results, THRESHOLD)
+    for regression in regressions:
+        logger.error("REGRESSION %s", regression)
+    if regressions:
+        environment.process_exit_code = 1
+
+
+class ZakenUser(HttpUser):
+    host = HOST
+    wait_time = between(0, 0.5)
+
+    def on_start(self):
+        self.created: list[str] = []
+
+    @task(10)
+    def list_first_page(self):
+        self.client.get(ENDPOINT, name="list: first page")
+
+    @task(2)
+    def list_deep_page(self):
+        # the count is estimated on large tables, stay clear of the end
+        page = random.randint(
+            max(1, targets.pages // 2), max(1, targets.pages * 9 // 10)
+        )
+        self.client.get(
+            ENDPOINT,
+            params={"page": page, "pageSize": PAGE_SIZE},
+            name="list: deep page",
+        )
+
+    @task(10)
+    def detail(self):
+        if targets.uuids:
+            self.client.get(f"{ENDPOINT}/{random.choice(targets.uuids)}", name="detail")
+
+    @task(5)
+    def filtered_list(self):
+        filters = [{"archiefnominatie": "vernietigen"}]
+        if targets.bronorganisaties:
+            filters.append({"bronorganisatie": random.choice(targets.bronorganisaties)})
+        if targets.startdata:
+            filters.append({"startdatum__gte": random.choice(targets.startdata)})
+        if targets.zaaktypen:
+            filters.append({"zaaktype": random.choice(targets.zaaktypen)})
+        params = random.choice(filters)
+        self.client.get(
+            ENDPOINT, params=params, name=f"list: filter {', '.join(params)}"
+        )
 
-from locust import HttpUser, task
+    @task(2)
+    def hoofdzaak_with_deelzaken(self):
+        if targets.hoofdzaken:
+            self.client.get(
+                f"{ENDPOINT}/{random.choice(targets.hoofdzaken)}",
+                name="detail: hoofdzaak",
+            )
 
+    @task(2)
+    def create(self):
+        response = self.client.post(
+            ENDPOINT,
+            json={
+                "omschrijving": "Locust",
+                "bronorganisatie": "517439943",
+                "startdatum": "2025-01-01",
+            },
+            name="create",
+        )
+        if response.ok:
+            self.created.append(get_uuid(response.json()))
 
-class GetList(HttpUser):
-    host = os.getenv("HOST", "http://localhost:8000")
-    endpoint = os.getenv("ENDPOINT", "/zaken/api/v1/zaken")
+    @task(2)
+    def update(self):
+        # only the zaken created by this user are changed, the dataset isn't
+        if self.created:
+            self.client.patch(
+                f"{ENDPOINT}/{random.choice(self.created)}",
+                json={"toelichting": f"Locust {random.random()}"},
+                name="update",
+            )
 
-    @task
-    def get(self):
-        self.client.get(self.endpoint)
+    @task(1)
+    def delete(self):
+        if self.created:
+            self.client.delete(f"{ENDPOINT}/{self.created.pop()}", name="delete")
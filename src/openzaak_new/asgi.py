@@ -0,0 +1,26 @@
+"""
+ASGI config for openzaak_new project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+The ``list`` and ``retrieve`` actions of the Zaken API are served as coroutines
+(``ZAKEN_ASYNC_VIEWS``), and the requests share a pool of database connections
+(``DB_POOL_ENABLED``), see ``docs/install/production.rst``.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+from openzaak_new.setup import setup_env
+
+setup_env()
+
+os.environ.setdefault("ZAKEN_ASYNC_VIEWS", "true")
+# every request runs in a thread of its own, and every thread would keep a persistent
+# connection open
+os.environ.setdefault("DB_POOL_ENABLED", "true")
+
+application = get_asgi_application()
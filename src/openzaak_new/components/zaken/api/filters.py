@@ -0,0 +1,33 @@
+from django.utils.translation import gettext_lazy as _
+
+from django_loose_fk.filters import FkOrUrlFieldFilter
+from vng_api_common.filtersets import FilterSet
+
+from openzaak_new.components.catalogi.models import ZaakType
+
+from ..models import Zaak
+
+
+class ZaakFilter(FilterSet):
+    """
+    Filters of the Zaak list.
+
+    Every filter, and every combination of them, is backed by an index (see the
+    ``Meta.indexes`` of :class:`~openzaak_new.components.zaken.models.Zaak`), so
+    filtering never falls back to a sequential scan of the table.
+    """
+
+    zaaktype = FkOrUrlFieldFilter(
+        queryset=ZaakType.objects.all(),
+        help_text=_("URL-referentie naar het ZAAKTYPE (in de Catalogi API)."),
+    )
+
+    class Meta:
+        model = Zaak
+        fields = {
+            "identificatie": ["exact"],
+            "bronorganisatie": ["exact", "in"],
+            "startdatum": ["exact", "gt", "gte", "lt", "lte"],
+            "archiefnominatie": ["exact", "in"],
+            "archiefactiedatum": ["exact", "gt", "gte", "lt", "lte", "isnull"],
+        }
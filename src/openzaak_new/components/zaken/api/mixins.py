@@ -0,0 +1,537 @@
+import hashlib
+import json
+from functools import update_wrapper
+from typing import AsyncIterator, Callable, Iterator
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Expression
+from django.http import Http404, StreamingHttpResponse
+from django.utils.cache import parse_etags
+from django.utils.translation import gettext_lazy as _
+
+from asgiref.sync import sync_to_async
+from djangorestframework_camel_case.util import underscoreize
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from openzaak_new.utils.db import reads_from_replica
+from openzaak_new.utils.fields import as_geojson, get_geojson_key
+from openzaak_new.utils.serializers import (
+    get_field_names_by_key,
+    get_readable_field_names,
+)
+
+from ..cache import get_detail_generation, get_list_generation, get_response_cache
+from .serializers import GeometryParametersSerializer
+
+
+def get_etag(data) -> str:
+    content = json.dumps(data, cls=JSONEncoder, sort_keys=True).encode("utf-8")
+    return f'"{hashlib.md5(content, usedforsecurity=False).hexdigest()}"'
+
+
+class ResponseCacheMixin:
+    """
+    Cache the serialized data of ``list`` and ``retrieve`` responses.
+
+    Entries are keyed on the API version, the absolute URL (with normalized query
+    parameters), the authorisation scope of the request and whether it reads from a
+    replica (see ``ReadReplicaMiddleware``), together with the generation of the
+    list or the requested object (see :mod:`openzaak_new.components.zaken.cache`),
+    so writes invalidate them.
+
+    Responses carry an ``ETag``. A request with a matching ``If-None-Match`` header
+    gets a ``304 Not Modified``, which for cached entries doesn't even hit the
+    database or the serializer.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            get_list_generation(), super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return self.get_cached_response(
+            get_detail_generation(kwargs[lookup_url_kwarg]),
+            super().retrieve,
+            request,
+            *args,
+            **kwargs,
+        )
+
+    def get_cache_scope(self, request) -> str:
+        """
+        Identify the authorisation scope, cached responses are never shared between
+        scopes.
+        """
+        return request.META.get("HTTP_AUTHORIZATION", "")
+
+    def get_response_cache_key(self, request, generation: str) -> str:
+        parts = [
+            settings.ZAKEN_API_VERSION,
+            request.version or "",
+            # responses contain absolute URLs
+            request.build_absolute_uri(request.path),
+            urlencode(sorted(request.query_params.lists()), doseq=True),
+            self.get_cache_scope(request),
+            # a lagging replica may cache the old data under the new generation, which
+            # mustn't be served to the requests that read their writes
+            "replica" if reads_from_replica() else "primary",
+        ]
+        digest = hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+        return f"zaken:responses:{self.action}:{generation}:{digest}"
+
+    def get_response_cache_timeout(self) -> int:
+        timeout = settings.ZAKEN_RESPONSE_CACHE_TIMEOUT
+        if reads_from_replica():
+            # the replica may lag behind the writes of the generation, don't keep the
+            # response for longer than that
+            return min(timeout, settings.DB_REPLICA_STICKY_TTL)
+        return timeout
+
+    def get_cached_response(
+        self, generation: str | None, handler: Callable, request, *args, **kwargs
+    ) -> Response:
+        if not settings.ZAKEN_RESPONSE_CACHE_ENABLED or generation is None:
+            return self._add_etag(request, handler(request, *args, **kwargs))
+
+        cache = get_response_cache()
+        key = self.get_response_cache_key(request, generation)
+        cached = cache.get(key)
+
+        if cached is not None:
+            return self._from_cache_entry(request, cached)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code != status.HTTP_200_OK:
+            return response
+
+        response["ETag"] = get_etag(response.data)
+        cache.set(
+            key,
+            self._get_cache_entry(response),
+            timeout=self.get_response_cache_timeout(),
+        )
+        return self._not_modified(request, response["ETag"]) or response
+
+    async def alist(self, request, *args, **kwargs):
+        generation = await sync_to_async(get_list_generation)()
+        return await self.aget_cached_response(
+            generation, super().alist, request, *args, **kwargs
+        )
+
+    async def aretrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        generation = await sync_to_async(get_detail_generation)(
+            kwargs[lookup_url_kwarg]
+        )
+        return await self.aget_cached_response(
+            generation, super().aretrieve, request, *args, **kwargs
+        )
+
+    async def aget_cached_response(
+        self, generation: str | None, handler: Callable, request, *args, **kwargs
+    ) -> Response:
+        """
+        Async variant of :meth:`get_cached_response`, for an async ``handler``.
+        """
+        if not settings.ZAKEN_RESPONSE_CACHE_ENABLED or generation is None:
+            return self._add_etag(request, await handler(request, *args, **kwargs))
+
+        cache = get_response_cache()
+        key = self.get_response_cache_key(request, generation)
+        cached = await cache.aget(key)
+
+        if cached is not None:
+            return self._from_cache_entry(request, cached)
+
+        response = await handler(request, *args, **kwargs)
+        if response.status_code != status.HTTP_200_OK:
+            return response
+
+        response["ETag"] = get_etag(response.data)
+        await cache.aset(
+            key,
+            self._get_cache_entry(response),
+            timeout=self.get_response_cache_timeout(),
+        )
+        return self._not_modified(request, response["ETag"]) or response
+
+    def _add_etag(self, request, response: Response) -> Response:
+        if response.status_code != status.HTTP_200_OK:
+            return response
+
+        response["ETag"] = get_etag(response.data)
+        return self._not_modified(request, response["ETag"]) or response
+
+    def _get_cache_entry(self, response: Response) -> dict:
+        headers = {
+            header: value
+            for header, value in response.items()
+            if header.lower() != "content-type"
+        }
+        return {"data": response.data, "headers": headers, "etag": response["ETag"]}
+
+    def _from_cache_entry(self, request, cached: dict) -> Response:
+        if not_modified := self._not_modified(request, cached["etag"]):
+            return not_modified
+        return Response(cached["data"], headers=cached["headers"])
+
+    def _not_modified(self, request, etag: str) -> Response | None:
+        if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+        if not if_none_match:
+            return None
+
+        etags = parse_etags(if_none_match)
+        if "*" in etags or etag in etags or f"W/{etag}" in etags:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        return None
+
+
+class StreamingListMixin:
+    """
+    Stream large ``list`` pages instead of building them in memory.
+
+    With ``?stream=true`` only the primary keys of the page are selected through the
+    pagination. The page itself is then read with a server-side cursor in chunks of
+    ``stream_chunk_size`` rows, and every chunk is serialized and sent before the
+    next one is fetched. Peak memory is bound by the chunk size instead of the page
+    size, and the JSON envelope (``count``, ``next``, ``previous``, ``results``) is
+    the same as for regular responses.
+
+    Chunks are small compared to the uwsgi buffers, and ``X-Accel-Buffering``
+    prevents a reverse proxy from collecting the whole response before sending it.
+    """
+
+    stream_query_param = "stream"
+    stream_chunk_size = 100
+
+    def list(self, request, *args, **kwargs):
+        if not self.should_stream(request):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset.prefetch_related(None).values("pk"))
+        if page is None:
+            return super().list(request, *args, **kwargs)
+
+        pks = [row["pk"] for row in page]
+        objects = queryset.filter(pk__in=pks).iterator(
+            chunk_size=self.stream_chunk_size
+        )
+
+        response = StreamingHttpResponse(
+            self._stream_page(objects),
+            content_type=request.accepted_renderer.media_type,
+        )
+        response["X-Accel-Buffering"] = "no"
+        return self.paginator.add_count_headers(response)
+
+    async def alist(self, request, *args, **kwargs):
+        if not self.should_stream(request):
+            return await super().alist(request, *args, **kwargs)
+
+        queryset = await sync_to_async(self.filter_queryset)(self.get_queryset())
+        page = await sync_to_async(self.paginate_queryset)(
+            queryset.prefetch_related(None).values("pk")
+        )
+        if page is None:
+            return await super().alist(request, *args, **kwargs)
+
+        pks = [row["pk"] for row in page]
+        # ⚡ an async iterator is streamed by the ASGI handler, while a sync one is
+        # read into memory completely before the response starts
+        objects = queryset.filter(pk__in=pks).aiterator(
+            chunk_size=self.stream_chunk_size
+        )
+
+        response = StreamingHttpResponse(
+            self._astream_page(objects),
+            content_type=request.accepted_renderer.media_type,
+        )
+        response["X-Accel-Buffering"] = "no"
+        # keyset pages only count for the headers and the envelope
+        return await sync_to_async(self.paginator.add_count_headers)(response)
+
+    def should_stream(self, request) -> bool:
+        return request.query_params.get(self.stream_query_param) in (
+            "true",
+            "1",
+        ) and isinstance(request.accepted_renderer, JSONRenderer)
+
+    def _stream_page(self, objects: Iterator) -> Iterator[bytes]:
+        yield self._render_envelope()
+
+        # a single serializer instance, so the fields (and URL caches) are set up once
+        serializer = self.get_serializer()
+        chunk = []
+        separator = b""
+        for obj in objects:
+            chunk.append(obj)
+            if len(chunk) == self.stream_chunk_size:
+                yield separator + self._render_chunk(serializer, chunk)
+                chunk = []
+                separator = b","
+
+        if chunk:
+            yield separator + self._render_chunk(serializer, chunk)
+        yield b"]}"
+
+    async def _astream_page(self, objects: AsyncIterator) -> AsyncIterator[bytes]:
+        yield self._render_envelope()
+
+        serializer = self.get_serializer()
+        # the zaaktype URLs may read the services from the database
+        render_chunk = sync_to_async(self._render_chunk)
+        chunk = []
+        separator = b""
+        async for obj in objects:
+            chunk.append(obj)
+            if len(chunk) == self.stream_chunk_size:
+                yield separator + await render_chunk(serializer, chunk)
+                chunk = []
+                separator = b","
+
+        if chunk:
+            yield separator + await render_chunk(serializer, chunk)
+        yield b"]}"
+
+    def _render(self, data) -> bytes:
+        return self.request.accepted_renderer.render(
+            data, self.request.accepted_media_type, self.get_renderer_context()
+        )
+
+    def _render_envelope(self) -> bytes:
+        envelope = self._render(
+            {
+                "count": self.paginator.paginator.count,
+                "next": self.paginator.get_next_link(),
+                "previous": self.paginator.get_previous_link(),
+            }
+        )
+        return envelope[:-1] + b',"results":['
+
+    def _render_chunk(self, serializer, objects: list) -> bytes:
+        return b",".join(
+            self._render(serializer.to_representation(obj)) for obj in objects
+        )
+
+
+class SparseFieldsetMixin:
+    """
+    Only represent the fields in ``?fields=``, a comma separated list of the names in
+    the response, for ``list``, ``retrieve`` and ``_zoek``.
+
+    The names are passed to the serializer in the ``fields`` context (see
+    :class:`~openzaak_new.utils.serializers.SparseFieldsMixin`), and the view
+    narrows its queryset down with :meth:`get_field_names`.
+    """
+
+    fields_query_param = "fields"
+    sparse_fieldset_actions = ("list", "retrieve", "_zoek")
+
+    def get_field_names(self) -> frozenset[str] | None:
+        """
+        Return the names of the serializer fields in the response, or ``None`` for
+        all of them.
+        """
+        if self.action not in self.sparse_fieldset_actions:
+            return None
+
+        value = self.request.query_params.get(self.fields_query_param)
+        if not value:
+            return None
+
+        names_by_key = get_field_names_by_key(self.get_serializer_class())
+        keys = [key.strip() for key in value.split(",") if key.strip()]
+        if unknown := [key for key in keys if key not in names_by_key]:
+            raise ValidationError(
+                {
+                    self.fields_query_param: _("Unknown fields: {fields}.").format(
+                        fields=", ".join(unknown)
+                    )
+                },
+                code="unknown-fields",
+            )
+        return frozenset(names_by_key[key] for key in keys)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if (field_names := self.get_field_names()) is not None:
+            context["fields"] = field_names
+        return context
+
+
+class LazyGeometryMixin(SparseFieldsetMixin):
+    """
+    Leave the geometry out of list responses, unless it's asked for with
+    ``?expand=zaakgeometrie`` or ``?fields=``.
+
+    Most consumers of the list never look at the geometry, while large polygons are
+    expensive to read and encode for every row. The column isn't even selected when
+    the geometry is left out.
+
+    Wherever the geometry is included, ``?geometrySimplify=<tolerance>`` and
+    ``?geometryPrecision=<decimals>`` have PostGIS simplify it (with
+    ``ST_SimplifyPreserveTopology``) and encode it as GeoJSON, instead of encoding
+    the full geometry in Python.
+    """
+
+    geometry_field = "zaakgeometrie"
+    lazy_geometry_actions = ("list", "_zoek")
+    expand_query_param = "expand"
+
+    def get_field_names(self) -> frozenset[str] | None:
+        field_names = super().get_field_names()
+        if (
+            # the fields were asked for explicitly
+            field_names is not None
+            or self.action not in self.lazy_geometry_actions
+            or not settings.ZAKEN_LIST_LAZY_GEOMETRY
+        ):
+            return field_names
+
+        expand = self.request.query_params.get(self.expand_query_param, "")
+        if self.geometry_field in expand.split(","):
+            return None
+
+        field_names = get_readable_field_names(self.get_serializer_class())
+        return frozenset(field_names) - {self.geometry_field}
+
+    def get_geometry_annotations(
+        self, field_names: frozenset[str] | None
+    ) -> dict[str, Expression]:
+        """
+        Return the annotation that selects the geometry as GeoJSON, if the geometry is
+        included and the query parameters ask for it.
+        """
+        if field_names is not None and self.geometry_field not in field_names:
+            return {}
+
+        parameters = GeometryParametersSerializer(
+            data=underscoreize(self.request.query_params.dict())
+        )
+        parameters.is_valid(raise_exception=True)
+        if not parameters.validated_data:
+            return {}
+
+        return {
+            get_geojson_key(self.geometry_field): as_geojson(
+                self.geometry_field, **parameters.validated_data
+            )
+        }
+
+
+class AsyncViewSetMixin:
+    """
+    Serve the ``async_actions`` of the viewset as coroutines, when
+    ``ZAKEN_ASYNC_VIEWS`` is enabled (``asgi.py`` does).
+
+    Under ASGI, Django runs a sync view in a thread for the whole request. The async
+    actions only hand the blocking parts to that thread: the authentication and
+    permission checks, the filters and the pagination, and the serializer (which may
+    read the services of external URLs). The object of ``retrieve`` and the rows of
+    streamed lists are read through the async queryset API, and the response cache
+    through the async cache API. Streamed lists are sent chunk by chunk, instead of
+    being read into memory completely first, as happens to sync iterators under ASGI.
+
+    The other actions, e.g. the writes, run the sync view in the thread of the
+    request, like Django would. Each async action ``<action>`` is implemented as
+    ``a<action>``, with the same mixins involved as for the sync action.
+    """
+
+    async_actions = ("list", "retrieve")
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        if not settings.ZAKEN_ASYNC_VIEWS:
+            return view
+
+        sync_view = sync_to_async(view)
+        action_map = dict(actions)
+        if "get" in action_map and "head" not in action_map:
+            action_map["head"] = action_map["get"]
+
+        async def async_view(request, *args, **kwargs):
+            if action_map.get(request.method.lower()) not in cls.async_actions:
+                return await sync_view(request, *args, **kwargs)
+
+            self = cls(**initkwargs)
+            self.action_map = action_map
+            for method, action in action_map.items():
+                setattr(self, method, getattr(self, action))
+            self.request = request
+            self.args = args
+            self.kwargs = kwargs
+            return await self.adispatch(request, *args, **kwargs)
+
+        # the attributes DRF sets on its view, e.g. ``cls`` and ``actions``
+        return update_wrapper(async_view, view, assigned=(), updated=("__dict__",))
+
+    async def adispatch(self, request, *args, **kwargs):
+        """
+        Async variant of :meth:`rest_framework.views.APIView.dispatch`.
+        """
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            handler = getattr(self, f"a{self.action}")
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = await sync_to_async(self.handle_exception)(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = await sync_to_async(self.filter_queryset)(self.get_queryset())
+        page = await sync_to_async(self.paginate_queryset)(queryset)
+        if page is None:
+            objects = [obj async for obj in queryset]
+            return Response(await self.aserialize(objects, many=True))
+
+        data = await self.aserialize(page, many=True)
+        # keyset pages only count for the response
+        return await sync_to_async(self.get_paginated_response)(data)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        return Response(await self.aserialize(instance))
+
+    async def aget_object(self):
+        """
+        Async variant of :meth:`rest_framework.generics.GenericAPIView.get_object`.
+        """
+        queryset = await sync_to_async(self.filter_queryset)(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        except (
+            queryset.model.DoesNotExist,
+            DjangoValidationError,
+            TypeError,
+            ValueError,
+        ):
+            raise Http404
+
+        await sync_to_async(self.check_object_permissions)(self.request, obj)
+        return obj
+
+    async def aserialize(self, instance, many: bool = False):
+        return await sync_to_async(
+            lambda: self.get_serializer(instance, many=many).data
+        )()
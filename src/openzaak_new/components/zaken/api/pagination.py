@@ -0,0 +1,391 @@
+from base64 import b64decode, b64encode
+from typing import NamedTuple
+from urllib import parse
+
+from django.core.paginator import (
+    EmptyPage,
+    InvalidPage,
+    Page,
+    PageNotAnInteger,
+    Paginator as DjangoPaginator,
+)
+from django.db import connections, models
+from django.db.models import QuerySet
+from django.http import HttpResponseBase
+from django.utils.encoding import force_str
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from vng_api_common.pagination import DynamicPageSizeMixin
+
+COUNT_STRATEGY_HEADER = "X-Count-Strategy"
+COUNT_EXACT_HEADER = "X-Count-Exact"
+
+
+class CountStrategies(models.TextChoices):
+    exact = "exact", _("Exact (SELECT COUNT(*))")
+    estimated = (
+        "estimated",
+        _(
+            "Estimated from the PostgreSQL planner statistics for unfiltered lists, "
+            "capped for filtered lists"
+        ),
+    )
+    capped = "capped", _("Exact up to a maximum")
+
+
+class CountResult(NamedTuple):
+    count: int
+    strategy: str
+    exact: bool
+
+
+def get_estimated_count(queryset: QuerySet) -> int | None:
+    """
+    Read the row estimate the planner keeps for the table in ``pg_class``.
+
+    Returns ``None`` if the statistics are not available (yet), e.g. when the table
+    has never been vacuumed or analyzed.
+    """
+    connection = connections[queryset.db]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+
+    if row is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+class InexactPage(Page):
+    """
+    Page of a paginator that doesn't know the exact number of objects.
+
+    Whether there is a next page is derived from fetching one object more than fits
+    on the page instead of comparing with the (inexact) number of pages.
+    """
+
+    def __init__(self, object_list, number, paginator, has_next: bool):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class ExactPaginator(DjangoPaginator):
+    def __init__(
+        self,
+        *args,
+        count_strategy: str = CountStrategies.exact,
+        count_cap: int = 10_000,
+        estimate_threshold: int = 100_000,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.count_strategy = count_strategy
+        self.count_cap = count_cap
+        # below this many rows an exact count is cheap enough and always preferred
+        self.estimate_threshold = estimate_threshold
+
+    @cached_property
+    def count(self):
+        return self.count_result.count
+
+    @cached_property
+    def count_result(self) -> CountResult:
+        """
+        ⚡ restricts values to PK to remove implicit join from SQL query
+        """
+        queryset = self.object_list.values("pk")
+
+        if self.count_strategy == CountStrategies.estimated:
+            if not queryset.query.has_filters():
+                estimate = get_estimated_count(queryset)
+                if estimate is not None and estimate >= self.estimate_threshold:
+                    return CountResult(estimate, CountStrategies.estimated, False)
+                return CountResult(queryset.count(), CountStrategies.exact, True)
+            # filtered querysets have no usable table statistics, so cap instead
+            return self._capped_count(queryset)
+
+        if self.count_strategy == CountStrategies.capped:
+            return self._capped_count(queryset)
+
+        return CountResult(queryset.count(), CountStrategies.exact, True)
+
+    def _capped_count(self, queryset: QuerySet) -> CountResult:
+        count = queryset[: self.count_cap + 1].count()
+        if count > self.count_cap:
+            return CountResult(self.count_cap, CountStrategies.capped, False)
+        return CountResult(count, CountStrategies.capped, True)
+
+    def validate_number(self, number):
+        if self.count_result.exact:
+            return super().validate_number(number)
+
+        # an inexact count can't be used as upper bound, the page query decides
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages["invalid_page"])
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+
+    def page(self, number):
+        if self.count_result.exact:
+            return super().page(number)
+
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        object_list = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not object_list and number > 1:
+            raise EmptyPage(self.error_messages["no_results"])
+        return InexactPage(
+            object_list[: self.per_page],
+            number,
+            self,
+            has_next=len(object_list) > self.per_page,
+        )
+
+
+class ExactPagination(DynamicPageSizeMixin, PageNumberPagination):
+    """
+    Page number pagination with a selectable count strategy.
+
+    The strategy defaults to ``count_strategy`` on the view (or this class), and
+    clients can pick another one with the ``countStrategy`` query parameter. The
+    strategy that was actually used is reported in the ``X-Count-Strategy`` header,
+    ``X-Count-Exact`` tells if ``count`` is exact or a lower bound/estimate.
+    """
+
+    django_paginator_class = ExactPaginator
+    count_strategy = CountStrategies.exact
+    count_strategy_query_param = "countStrategy"
+    count_strategy_query_description = _(
+        "De manier waarop het totaal aantal resultaten (`count`) bepaald wordt."
+    )
+    count_cap = 10_000
+
+    def get_count_strategy(self, request, view=None) -> str:
+        strategy = request.query_params.get(self.count_strategy_query_param)
+        if strategy in CountStrategies.values:
+            return strategy
+        return getattr(view, "count_strategy", self.count_strategy)
+
+    def get_paginator(self, queryset, page_size: int) -> ExactPaginator:
+        return self.django_paginator_class(
+            queryset,
+            page_size,
+            count_strategy=self.get_count_strategy(self.request, self.view),
+            count_cap=self.count_cap,
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.view = view
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.paginator = self.get_paginator(queryset, page_size)
+        page_number = self.get_page_number(request, self.paginator)
+
+        try:
+            self.page = self.paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            )
+            raise NotFound(msg)
+
+        if self.paginator.num_pages > 1 and self.template is not None:
+            # The browsable API should display pagination controls.
+            self.display_page_controls = True
+
+        return list(self.page)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        return self.add_count_headers(response)
+
+    def add_count_headers(self, response: HttpResponseBase) -> HttpResponseBase:
+        count_result = self.paginator.count_result
+        response[COUNT_STRATEGY_HEADER] = str(count_result.strategy)
+        response[COUNT_EXACT_HEADER] = "true" if count_result.exact else "false"
+        return response
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.append(
+            {
+                "name": self.count_strategy_query_param,
+                "required": False,
+                "in": "query",
+                "description": force_str(self.count_strategy_query_description),
+                "schema": {
+                    "type": "string",
+                    "enum": CountStrategies.values,
+                },
+            }
+        )
+        return parameters
+
+
+class KeysetPagination(ExactPagination):
+    """
+    Page number pagination with an opt-in keyset (cursor) mode.
+
+    Clients opt in by passing the ``cursor`` query parameter (an empty value selects
+    the first page). Instead of ``OFFSET``, every page then seeks on the ordering
+    field (``WHERE pk < <last seen pk>``), so deep pages are as cheap as the first
+    one. The response envelope (``count``, ``next``, ``previous``, ``results``) stays
+    the same, only the ``next``/``previous`` links carry a ``cursor`` instead of a
+    ``page`` number.
+    """
+
+    cursor_query_param = "cursor"
+    cursor_query_description = _(
+        "De cursor van de op te vragen pagina. Geef een lege waarde mee om "
+        "cursor-paginering te gebruiken vanaf de eerste pagina."
+    )
+    invalid_cursor_message = _("Ongeldige cursor.")
+    # must match the ordering of the paginated queryset and be unique
+    ordering = "-pk"
+
+    keyset_mode = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view=view)
+
+        self.request = request
+        self.view = view
+        self.keyset_mode = True
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.paginator = self.get_paginator(queryset, page_size)
+        position, reverse = self.decode_cursor(request)
+
+        field_name = self.ordering.lstrip("-")
+        descending = self.ordering.startswith("-")
+        ordering = self.ordering
+        if reverse:
+            ordering = field_name if descending else f"-{field_name}"
+
+        if position is not None:
+            # walking backwards flips the comparison, just like the ordering
+            lookup = "lt" if descending != reverse else "gt"
+            queryset = queryset.filter(**{f"{field_name}__{lookup}": position})
+
+        # fetch one extra row to find out if there is another page in this direction
+        results = list(queryset.order_by(ordering)[: page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+
+        if reverse:
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.next_position = self.previous_position = None
+        if results:
+            self.next_position = self._get_position(results[-1])
+            self.previous_position = self._get_position(results[0])
+        elif position is not None:
+            # an exhausted page still allows navigating back to where we came from
+            self.next_position = self.previous_position = position
+
+        return results
+
+    def get_paginated_response(self, data):
+        if not self.keyset_mode:
+            return super().get_paginated_response(data)
+
+        response = Response(
+            {
+                "count": self.paginator.count,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+        return self.add_count_headers(response)
+
+    def get_next_link(self):
+        if not self.keyset_mode:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.next_position, reverse=False)
+
+    def get_previous_link(self):
+        if not self.keyset_mode:
+            return super().get_previous_link()
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def decode_cursor(self, request) -> tuple[int | None, bool]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            querystring = b64decode(encoded.encode("ascii")).decode("ascii")
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            position = int(tokens["p"][0])
+            reverse = bool(int(tokens.get("r", ["0"])[0]))
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, reverse
+
+    def encode_cursor(self, position: int, reverse: bool) -> str:
+        tokens = {"p": position}
+        if reverse:
+            tokens["r"] = "1"
+
+        querystring = parse.urlencode(tokens)
+        encoded = b64encode(querystring.encode("ascii")).decode("ascii")
+
+        url = remove_query_param(
+            self.request.build_absolute_uri(), self.page_query_param
+        )
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def _get_position(self, instance) -> int:
+        field_name = self.ordering.lstrip("-")
+        if isinstance(instance, dict):
+            return instance[field_name]
+        return getattr(instance, field_name)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.append(
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": force_str(self.cursor_query_description),
+                "schema": {
+                    "type": "string",
+                },
+            }
+        )
+        return parameters
@@ -1,3 +1,5 @@
+from django.utils.translation import gettext_lazy as _
+
 from rest_framework import serializers
 from vng_api_common.serializers import (
     CachedHyperlinkedIdentityField,
@@ -5,6 +7,13 @@ from vng_api_common.serializers import (
     GegevensGroepSerializer,
 )
 
+from openzaak_new.utils.fields import MAX_GEOJSON_PRECISION, GeoJSONGeometryField
+from openzaak_new.utils.performance import TimedListSerializer, TimedSerializerMixin
+from openzaak_new.utils.serializers import (
+    CompiledRepresentationMixin,
+    SparseFieldsMixin,
+)
+
 from ..models import Zaak
 
 
@@ -40,7 +49,12 @@ class VerlengingSerializer(GegevensGroepSerializer):
         return super().to_representation(instance)
 
 
-class ZaakSerializer(serializers.HyperlinkedModelSerializer):
+class ZaakSerializer(
+    TimedSerializerMixin,
+    CompiledRepresentationMixin,
+    SparseFieldsMixin,
+    serializers.HyperlinkedModelSerializer,
+):
     url = CachedHyperlinkedIdentityField(view_name="zaak-detail", lookup_field="uuid")
     processobject = ProcessobjectSerializer(
         required=False,
@@ -54,6 +68,11 @@ class ZaakSerializer(serializers.HyperlinkedModelSerializer):
         required=False,
         allow_null=True,
     )
+    zaakgeometrie = GeoJSONGeometryField(
+        required=False,
+        allow_null=True,
+        help_text=_("Punt, lijn of (multi-)vlak geometrie-informatie, in GeoJSON."),
+    )
     deelzaken = CachedHyperlinkedRelatedField(
         read_only=True,
         many=True,
@@ -64,6 +83,7 @@ class ZaakSerializer(serializers.HyperlinkedModelSerializer):
 
     class Meta:
         model = Zaak
+        list_serializer_class = TimedListSerializer
         fields = (
             "url",
             "omschrijving",
@@ -111,3 +131,53 @@ class ZaakSerializer(serializers.HyperlinkedModelSerializer):
                 "min_length": 1,
             },
         }
+
+
+class GeoSearchSerializer(serializers.Serializer):
+    within = GeoJSONGeometryField(
+        required=False,
+        help_text=_("Zaken waarvan de geometrie binnen deze geometrie ligt."),
+    )
+    intersects = GeoJSONGeometryField(
+        required=False,
+        help_text=_("Zaken waarvan de geometrie deze geometrie snijdt."),
+    )
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError(
+                _("Specify `within` and/or `intersects`."), code="required"
+            )
+        return attrs
+
+
+class ZaakZoekSerializer(serializers.Serializer):
+    """
+    The body of ``POST /zaken/_zoek``. The filters of the Zaak list can be given
+    next to these fields.
+    """
+
+    zaakgeometrie = GeoSearchSerializer(required=False)
+
+
+class GeometryParametersSerializer(serializers.Serializer):
+    """
+    The query parameters that shape the ``zaakgeometrie`` in responses.
+    """
+
+    geometry_simplify = serializers.FloatField(
+        source="simplify",
+        required=False,
+        min_value=0,
+        help_text=_(
+            "Vereenvoudig de geometrie met deze tolerantie, in de eenheid van de "
+            "coördinaten."
+        ),
+    )
+    geometry_precision = serializers.IntegerField(
+        source="precision",
+        required=False,
+        min_value=0,
+        max_value=MAX_GEOJSON_PRECISION,
+        help_text=_("Het aantal decimalen van de coördinaten."),
+    )
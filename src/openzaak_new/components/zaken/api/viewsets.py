@@ -1,15 +1,28 @@
-from django.core.paginator import Paginator as DjangoPaginator
+from django.conf import settings
 from django.db.models import Prefetch
-from django.utils.functional import cached_property
 
 from rest_framework import viewsets
-from rest_framework.pagination import PageNumberPagination
-from vng_api_common.pagination import DynamicPageSizeMixin
+from rest_framework.decorators import action
+from vng_api_common.search import SearchMixin
 
 from openzaak_new.components.catalogi.models import ZaakType
+from openzaak_new.utils.serializers import (
+    compile_values_representation,
+    get_lookup_arrays,
+    get_only_fields,
+    prune_related,
+)
 
 from ..models import Zaak
-from .serializers import ZaakSerializer
+from .filters import ZaakFilter
+from .mixins import (
+    AsyncViewSetMixin,
+    LazyGeometryMixin,
+    ResponseCacheMixin,
+    StreamingListMixin,
+)
+from .pagination import CountStrategies, KeysetPagination
+from .serializers import ZaakSerializer, ZaakZoekSerializer
 
 
 class CacheQuerysetMixin:
@@ -38,26 +51,18 @@ class CacheQuerysetMixin:
         return self._cached_queryset
 
 
-class ExactPaginator(DjangoPaginator):
-    @cached_property
-    def count(self):
-        """
-        ⚡ restricts values to PK to remove implicit join from SQL query
-        """
-        return self.object_list.values("pk").count()
-
-
-class ExactPagination(DynamicPageSizeMixin, PageNumberPagination):
-    django_paginator_class = ExactPaginator
-
-
-class ZaakViewSet(CacheQuerysetMixin, viewsets.ModelViewSet):
+class ZaakViewSet(
+    CacheQuerysetMixin,
+    LazyGeometryMixin,
+    StreamingListMixin,
+    ResponseCacheMixin,
+    SearchMixin,
+    AsyncViewSetMixin,
+    viewsets.ModelViewSet,
+):
     queryset = (
         Zaak.objects.select_related("hoofdzaak")
         .prefetch_related(
-            Prefetch(
-                "deelzaken", queryset=Zaak.objects.only("uuid", "pk", "hoofdzaak_id")
-            ),
             Prefetch(
                 "_zaaktype",
                 queryset=ZaakType.objects.only("uuid", "pk"),
@@ -67,4 +72,58 @@ class ZaakViewSet(CacheQuerysetMixin, viewsets.ModelViewSet):
     )
     serializer_class = ZaakSerializer
     lookup_field = "uuid"
-    pagination_class = ExactPagination
+    filterset_class = ZaakFilter
+    pagination_class = KeysetPagination
+    count_strategy = CountStrategies.estimated
+    search_input_serializer_class = ZaakZoekSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action not in ("list", "retrieve", "_zoek"):
+            return queryset
+
+        serializer_class = self.get_serializer_class()
+        field_names = self.get_field_names()
+        geometry_annotations = self.get_geometry_annotations(field_names)
+
+        if self.action != "retrieve" and settings.ZAKEN_VALUES_LIST_ENABLED:
+            # ⚡ select the serialized columns as plain rows, without building model
+            # instances or prefetching the related zaken and zaaktypen
+            values = compile_values_representation(serializer_class, field_names)
+            return values.get_queryset(queryset, geometry_annotations)
+
+        # ⚡ don't join or prefetch the relations of fields that were left out
+        queryset = prune_related(queryset, serializer_class, field_names)
+        # ⚡ only fetch the columns that are serialized, e.g. the select_related
+        # hoofdzaak only needs its uuid instead of the full row
+        queryset = queryset.only(
+            *get_only_fields(serializer_class, ("hoofdzaak",), field_names)
+        ).annotate(
+            # ⚡ the deelzaken UUIDs as an array in the same query, instead of
+            # prefetching the deelzaken themselves
+            **get_lookup_arrays(serializer_class, field_names)
+        )
+        if geometry_annotations:
+            # ⚡ PostGIS encodes the geometry as GeoJSON instead
+            queryset = queryset.defer(self.geometry_field).annotate(
+                **geometry_annotations
+            )
+        return queryset
+
+    @action(methods=["post"], detail=False)
+    def _zoek(self, request, *args, **kwargs):
+        """
+        Search zaken on their geometry, together with the filters of the list.
+
+        The ``zaakgeometrie`` lookups are answered with the GiST index on the
+        geometry, the results are paginated like the list.
+        """
+        search_input = self.get_search_input()
+        queryset = self.filter_queryset(self.get_queryset())
+
+        for lookup, geometry in search_input.get("zaakgeometrie", {}).items():
+            queryset = queryset.filter(**{f"zaakgeometrie__{lookup}": geometry})
+
+        return self.get_search_output(queryset)
+
+    _zoek.is_search_action = True
@@ -5,5 +5,4 @@ class ZakenConfig(AppConfig):
     name = "openzaak_new.components.zaken"
 
     def ready(self):
-        pass
-        # from .api.viewsets import ZaakViewSet
+        from . import signals  # noqa
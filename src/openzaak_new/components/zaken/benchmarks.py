@@ -0,0 +1,638 @@
+"""
+Benchmarks against the dataset in the configured database.
+
+These are meant to be run on a large dataset (e.g. the 1M zaken created with the
+``generate_dataset``, ``bulk_create`` or ``load_zaken`` command) with::
+
+    python src/manage.py benchmark <name> [<name> ...]
+
+Every benchmark runs variants of the same operation, typically the situation before
+and after an optimization, so the numbers can be compared side by side.
+
+The ``connections`` benchmark measures the connection setup of the requests, run it
+against the database server of the deployment.
+
+The microbenchmarks (``serializer``, ``queryset``, ``paginator_count``,
+``gegevensgroep`` and ``absolute_url``) measure a single hot path in process, on
+zaken they create themselves in a transaction that is rolled back afterwards. They
+run on any database, e.g. an empty local PostGIS database, and tell regressions of
+the serializer apart from regressions of the database. Keep track of the results
+over time with ``--history``.
+"""
+
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+from django.contrib.gis.geos import Polygon
+from django.core.signals import request_finished, request_started
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.db.models import Max, Prefetch, QuerySet
+from django.db.utils import load_backend
+from django.test import RequestFactory, override_settings
+
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.reverse import reverse
+from rest_framework.versioning import URLPathVersioning
+
+from openzaak_new.utils.serializers import (
+    compile_values_representation,
+    get_lookup_arrays,
+    get_only_fields,
+)
+
+from .api.pagination import CountStrategies, ExactPaginator
+from .api.serializers import ZaakSerializer
+from .api.viewsets import ZaakViewSet
+from .dataset import generate_zaken
+from .loading import copy_zaken
+from .models import Zaak
+
+BENCHMARKS: dict[str, Callable[[int], list["Result"]]] = {}
+
+
+def register(name: str):
+    def decorator(func: Callable[[int], list["Result"]]):
+        BENCHMARKS[name] = func
+        return func
+
+    return decorator
+
+
+@dataclass
+class Result:
+    label: str
+    timings: list[float]
+
+    @property
+    def mean(self) -> float:
+        return statistics.mean(self.timings)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.timings)
+
+    @property
+    def minimum(self) -> float:
+        return min(self.timings)
+
+
+def measure(label: str, func: Callable[[], object], iterations: int) -> Result:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return Result(label=label, timings=timings)
+
+
+def sample_uuids(size: int) -> list:
+    """
+    Pick random existing zaken without ``ORDER BY random()`` over the whole table.
+    """
+    bounds = Zaak.objects.values_list("pk", flat=True).order_by("pk")
+    lowest, highest = bounds.first(), bounds.last()
+    if lowest is None:
+        return []
+
+    pks = random.sample(range(lowest, highest + 1), min(size * 2, highest - lowest + 1))
+    uuids = list(Zaak.objects.filter(pk__in=pks).values_list("uuid", flat=True))
+    return uuids[:size]
+
+
+def get_api_request() -> Request:
+    """
+    A request for serializers that build hyperlinks.
+    """
+    request = Request(RequestFactory().get("/zaken/api/v1/zaken"))
+    request.version = "1"
+    request.versioning_scheme = URLPathVersioning()
+    return request
+
+
+def _without_indexes(func: Callable[[], object]) -> Callable[[], object]:
+    """
+    Run ``func`` with index scans disabled, as if the indexes did not exist.
+    """
+
+    def wrapper():
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_indexscan = off")
+            cursor.execute("SET LOCAL enable_indexonlyscan = off")
+            cursor.execute("SET LOCAL enable_bitmapscan = off")
+            return func()
+
+    return wrapper
+
+
+@register("uuid_lookup")
+def uuid_lookup(iterations: int) -> list[Result]:
+    """
+    ``GET /zaken/{uuid}`` queries: sequential scan vs. the unique index on ``uuid``,
+    and the full row (with the full ``hoofdzaak`` row) vs. the serialized columns.
+    """
+    uuids = iter(sample_uuids(iterations * 3))
+    full_queryset = ZaakViewSet.queryset
+    detail_queryset = full_queryset.only(
+        *get_only_fields(ZaakSerializer, ("hoofdzaak",))
+    )
+
+    def lookup(queryset):
+        return lambda: list(queryset.filter(uuid=next(uuids)))
+
+    return [
+        measure(
+            "seq scan, full row (before)",
+            _without_indexes(lookup(full_queryset)),
+            iterations,
+        ),
+        measure("index scan, full row", lookup(full_queryset), iterations),
+        measure("index scan, serialized columns", lookup(detail_queryset), iterations),
+    ]
+
+
+class DRFZaakSerializer(ZaakSerializer):
+    # the representation as it was, through the DRF fields
+    to_representation = serializers.HyperlinkedModelSerializer.to_representation
+
+
+@register("list_page")
+def list_page(iterations: int) -> list[Result]:
+    """
+    Fetch and serialize a page of 100 zaken (``GET /zaken``): model instances with the
+    DRF and the compiled serializer vs. ``values()`` rows.
+    """
+    context = {"request": get_api_request()}
+    queryset = ZaakViewSet.queryset.only(
+        *get_only_fields(ZaakSerializer, ("hoofdzaak",))
+    )
+    values_queryset = compile_values_representation(ZaakSerializer).get_queryset(
+        ZaakViewSet.queryset
+    )
+
+    def serialize(serializer_class, queryset):
+        return lambda: serializer_class(queryset[:100], many=True, context=context).data
+
+    return [
+        measure(
+            "instances, DRF serializer (before)",
+            serialize(DRFZaakSerializer, queryset),
+            iterations,
+        ),
+        measure(
+            "instances, compiled serializer",
+            serialize(ZaakSerializer, queryset),
+            iterations,
+        ),
+        measure("values rows", serialize(ZaakSerializer, values_queryset), iterations),
+    ]
+
+
+@register("deelzaken")
+def deelzaken(iterations: int) -> list[Result]:
+    """
+    Fetch and serialize a page of 10 hoofdzaken with 300 deelzaken each: prefetching
+    the deelzaken vs. aggregating their UUIDs into an array in the main query.
+
+    The hierarchy is created for the benchmark and rolled back afterwards.
+    """
+    context = {"request": get_api_request()}
+    queryset = ZaakViewSet.queryset.only(
+        *get_only_fields(ZaakSerializer, ("hoofdzaak",))
+    )
+
+    with transaction.atomic():
+        hoofdzaken = Zaak.objects.bulk_create(Zaak() for _ in range(10))
+        Zaak.objects.bulk_create(
+            Zaak(hoofdzaak=hoofdzaak) for hoofdzaak in hoofdzaken for _ in range(300)
+        )
+        queryset = queryset.filter(pk__in=[hoofdzaak.pk for hoofdzaak in hoofdzaken])
+
+        def serialize(queryset):
+            return lambda: (
+                ZaakSerializer(queryset.all(), many=True, context=context).data
+            )
+
+        results = [
+            measure(
+                "prefetch (before)",
+                serialize(
+                    queryset.prefetch_related(
+                        Prefetch(
+                            "deelzaken",
+                            queryset=Zaak.objects.only(
+                                "uuid", "pk", "hoofdzaak_id"
+                            ).order_by("pk"),
+                        )
+                    )
+                ),
+                iterations,
+            ),
+            measure(
+                "array annotation",
+                serialize(queryset.annotate(**get_lookup_arrays(ZaakSerializer))),
+                iterations,
+            ),
+            measure(
+                "array annotation, values rows",
+                serialize(
+                    compile_values_representation(ZaakSerializer).get_queryset(queryset)
+                ),
+                iterations,
+            ),
+        ]
+        transaction.set_rollback(True)
+
+    return results
+
+
+@register("url_reversal")
+def url_reversal(iterations: int) -> list[Result]:
+    """
+    Build the absolute URLs of a page of 100 zaken: reversing the URL of every zaak
+    vs. formatting the cached URL template.
+    """
+    request = get_api_request()
+    zaken = list(Zaak.objects.only("uuid").order_by("-pk")[:100])
+
+    def reverse_urls():
+        return [
+            reverse(
+                "zaak-detail",
+                kwargs={"version": "1", "uuid": zaak.uuid},
+                request=request,
+            )
+            for zaak in zaken
+        ]
+
+    def template_urls():
+        return [zaak.get_absolute_api_url(request=request) for zaak in zaken]
+
+    return [
+        measure("reverse per zaak (before)", reverse_urls, iterations),
+        measure("URL template", template_urls, iterations),
+    ]
+
+
+@register("spatial_search")
+def spatial_search(iterations: int) -> list[Result]:
+    """
+    ``POST /zaken/_zoek`` queries on ``zaakgeometrie``: the first page and count of
+    the zaken within or intersecting a random area of 5x5 km, with and without the
+    GiST index.
+
+    Every zaak gets a random point or small polygon in the Netherlands for the
+    benchmark (1M geometries for the 1M zaken dataset), which is rolled back
+    afterwards.
+    """
+    queryset = ZaakViewSet.queryset.only(
+        *get_only_fields(ZaakSerializer, ("hoofdzaak",))
+    )
+
+    def random_area() -> Polygon:
+        x, y = random.uniform(3.4, 7.1), random.uniform(50.8, 53.5)
+        return Polygon.from_bbox((x, y, x + 0.07, y + 0.045))
+
+    def search(lookup: str):
+        def func():
+            results = queryset.filter(**{f"zaakgeometrie__{lookup}": random_area()})
+            # the capped count and the first page, like the list pagination
+            results.values("pk")[:1001].count()
+            return list(results[:100])
+
+        return func
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                WITH point AS (
+                    SELECT id, ST_SetSRID(
+                        ST_MakePoint(3.4 + random() * 3.7, 50.8 + random() * 2.7),
+                        4326
+                    ) AS geometry
+                    FROM zaken_zaak
+                )
+                UPDATE zaken_zaak
+                SET zaakgeometrie = CASE
+                    WHEN point.id % 2 = 0 THEN point.geometry
+                    ELSE ST_Envelope(ST_Expand(point.geometry, 0.002))
+                END
+                FROM point
+                WHERE zaken_zaak.id = point.id
+                """
+            )
+            cursor.execute("ANALYZE zaken_zaak")
+
+        results = [
+            measure(
+                "within, seq scan",
+                _without_indexes(search("within")),
+                iterations,
+            ),
+            measure("within, GiST index", search("within"), iterations),
+            measure(
+                "intersects, seq scan",
+                _without_indexes(search("intersects")),
+                iterations,
+            ),
+            measure("intersects, GiST index", search("intersects"), iterations),
+        ]
+        transaction.set_rollback(True)
+
+    return results
+
+
+@register("load_zaken")
+def load_zaken(iterations: int) -> list[Result]:
+    """
+    Insert 10.000 zaken: ``bulk_create`` in batches of 10.000, like the
+    ``bulk_create`` command, vs. ``COPY FROM STDIN`` of the ``load_zaken`` command,
+    with and without dropping the indexes during the load.
+
+    Every load is rolled back afterwards. Dropping the indexes only pays off for
+    loads that are large compared to the table.
+    """
+    rows = [
+        {
+            "identificatie": f"ZAAK-{number:06}",
+            "bronorganisatie": "517439943",
+            "omschrijving": f"Zaak {number}",
+            "startdatum": "2025-01-01",
+        }
+        for number in range(10_000)
+    ]
+
+    def rolled_back(func: Callable[[], object]) -> Callable[[], object]:
+        def wrapper():
+            with transaction.atomic():
+                func()
+                transaction.set_rollback(True)
+
+        return wrapper
+
+    def bulk_create():
+        Zaak.objects.bulk_create((Zaak(**row) for row in rows), batch_size=10_000)
+
+    return [
+        measure("bulk_create (before)", rolled_back(bulk_create), iterations),
+        measure("COPY", rolled_back(lambda: copy_zaken(rows)), iterations),
+        measure(
+            "COPY, drop and rebuild indexes",
+            rolled_back(lambda: copy_zaken(rows, without_indexes=True)),
+            iterations,
+        ),
+    ]
+
+
+@contextmanager
+def _default_connection(**settings: object) -> Iterator[None]:
+    """
+    Replace the default connection of this thread by one with other ``settings``.
+    """
+    original = connections[DEFAULT_DB_ALIAS]
+    backend = load_backend(original.settings_dict["ENGINE"])
+    # an alias of its own, so it doesn't share the pool of the default connection
+    replacement = backend.DatabaseWrapper(
+        {**original.settings_dict, **settings}, "benchmark"
+    )
+    connections[DEFAULT_DB_ALIAS] = replacement
+    try:
+        yield
+    finally:
+        replacement.close()
+        if replacement.settings_dict["OPTIONS"].get("pool"):
+            replacement.close_pool()
+        connections[DEFAULT_DB_ALIAS] = original
+
+
+@register("connections")
+def connection_settings(iterations: int) -> list[Result]:
+    """
+    ``GET /zaken`` requests of 10 zaken, including the ``request_started`` and
+    ``request_finished`` signals that close the connections: a new connection per
+    request (``CONN_MAX_AGE = 0``) vs. a persistent connection, with and without
+    health checks, and a connection pool (``DB_POOL_ENABLED``).
+
+    The difference is the connection setup, so run this against the database server
+    of the deployment (with TLS, ``pgbouncer`` etc.) rather than a local one.
+    """
+    with override_settings(ZAKEN_ASYNC_VIEWS=False):
+        view = ZaakViewSet.as_view({"get": "list"})
+    factory = RequestFactory()
+
+    def get_zaken():
+        request_started.send(sender=None)
+        try:
+            request = factory.get("/zaken/api/v1/zaken", {"pageSize": 10})
+            view(request, version="1").render()
+        finally:
+            request_finished.send(sender=None)
+
+    variants = [
+        (
+            "new connection per request (before)",
+            {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False},
+        ),
+        ("persistent connection", {"CONN_MAX_AGE": 60, "CONN_HEALTH_CHECKS": False}),
+        (
+            "persistent connection, health checks",
+            {"CONN_MAX_AGE": 60, "CONN_HEALTH_CHECKS": True},
+        ),
+        (
+            "connection pool",
+            {
+                "CONN_MAX_AGE": 0,
+                "CONN_HEALTH_CHECKS": True,
+                "OPTIONS": {
+                    **connection.settings_dict["OPTIONS"],
+                    "pool": {"min_size": 1, "max_size": 1},
+                },
+            },
+        ),
+    ]
+
+    results = []
+    with override_settings(ZAKEN_RESPONSE_CACHE_ENABLED=False):
+        for label, settings in variants:
+            with _default_connection(**settings):
+                # open the persistent connection or the pool
+                get_zaken()
+                results.append(measure(label, get_zaken, iterations))
+    return results
+
+
+# outside the random seeds of ``bulk_create``, so the UUIDs don't collide with a
+# dataset in the database
+GENERATED_SEED = 2**32
+
+
+@contextmanager
+def generated_zaken(count: int) -> Iterator[QuerySet]:
+    """
+    Create ``count`` zaken like the ``bulk_create`` dataset for the microbenchmarks,
+    and roll them back afterwards.
+
+    Yields the ``ZaakViewSet`` queryset of only these zaken, so the benchmarks don't
+    depend on the size of the dataset in the database.
+    """
+    with transaction.atomic():
+        first_pk = (Zaak.objects.aggregate(last=Max("pk"))["last"] or 0) + 1
+        Zaak.objects.bulk_create(
+            generate_zaken(GENERATED_SEED, 0, count, first_pk),
+            batch_size=10_000,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE zaken_zaak")
+        yield ZaakViewSet.queryset.filter(pk__gte=first_pk)
+        transaction.set_rollback(True)
+
+
+@register("serializer")
+def serializer(iterations: int) -> list[Result]:
+    """
+    Serialize 1000 zaken that are already fetched, without any queries: the DRF
+    fields vs. the compiled representation, of model instances and ``values()``
+    rows.
+    """
+    context = {"request": get_api_request()}
+
+    with generated_zaken(1000) as zaken:
+        queryset = zaken.only(
+            *get_only_fields(ZaakSerializer, ("hoofdzaak",))
+        ).annotate(**get_lookup_arrays(ZaakSerializer))
+        instances = list(queryset)
+        rows = list(compile_values_representation(ZaakSerializer).get_queryset(zaken))
+
+        def serialize(serializer_class, objects):
+            return lambda: serializer_class(objects, many=True, context=context).data
+
+        return [
+            measure(
+                "instances, DRF serializer",
+                serialize(DRFZaakSerializer, instances),
+                iterations,
+            ),
+            measure(
+                "instances, compiled serializer",
+                serialize(ZaakSerializer, instances),
+                iterations,
+            ),
+            measure("values rows", serialize(ZaakSerializer, rows), iterations),
+        ]
+
+
+@register("queryset")
+def viewset_queryset(iterations: int) -> list[Result]:
+    """
+    The ``ZaakViewSet`` list queryset: building it and compiling its SQL, without
+    the database, vs. evaluating a page of 100 zaken.
+    """
+
+    def build():
+        queryset = (
+            ZaakViewSet.queryset.all()
+            .only(*get_only_fields(ZaakSerializer, ("hoofdzaak",)))
+            .annotate(**get_lookup_arrays(ZaakSerializer))
+        )
+        return str(queryset[:100].query)
+
+    def build_values():
+        queryset = compile_values_representation(ZaakSerializer).get_queryset(
+            ZaakViewSet.queryset
+        )
+        return str(queryset[:100].query)
+
+    with generated_zaken(1000) as zaken:
+        page = (
+            zaken.only(*get_only_fields(ZaakSerializer, ("hoofdzaak",)))
+            .annotate(**get_lookup_arrays(ZaakSerializer))
+            .order_by("-pk")
+        )
+        values_page = compile_values_representation(ZaakSerializer).get_queryset(zaken)
+
+        return [
+            measure("build instances queryset", build, iterations),
+            measure("build values queryset", build_values, iterations),
+            measure(
+                "evaluate instances page", lambda: list(page.all()[:100]), iterations
+            ),
+            measure(
+                "evaluate values page",
+                lambda: list(values_page.all()[:100]),
+                iterations,
+            ),
+        ]
+
+
+@register("paginator_count")
+def paginator_count(iterations: int) -> list[Result]:
+    """
+    ``ExactPaginator.count`` of 10.000 zaken with every count strategy, for the
+    whole list and a filtered list.
+    """
+    with generated_zaken(10_000) as zaken:
+        unfiltered = zaken.all()
+        filtered = unfiltered.filter(bronorganisatie="517439943")
+
+        def count(queryset, strategy):
+            return lambda: (
+                ExactPaginator(
+                    queryset.all(),
+                    100,
+                    count_strategy=strategy,
+                    estimate_threshold=1_000,
+                ).count
+            )
+
+        return [
+            measure(f"{strategy}, {label}", count(queryset, strategy), iterations)
+            for label, queryset in (("list", unfiltered), ("filtered", filtered))
+            for strategy in CountStrategies.values
+        ]
+
+
+@register("gegevensgroep")
+def gegevensgroep(iterations: int) -> list[Result]:
+    """
+    The ``GegevensGroepType`` descriptors of 1000 zaken: reading and writing
+    ``opschorting`` and ``verlenging``.
+    """
+    zaken = [
+        Zaak(opschorting_reden="reden", verlenging_reden="reden") for _ in range(1000)
+    ]
+
+    def read():
+        return [(zaak.opschorting, zaak.verlenging) for zaak in zaken]
+
+    def write():
+        for zaak in zaken:
+            zaak.opschorting = {"indicatie": True, "reden": "reden"}
+            zaak.verlenging = {"reden": "reden", "duur": None}
+
+    return [
+        measure("get", read, iterations),
+        measure("set", write, iterations),
+    ]
+
+
+@register("absolute_url")
+def absolute_url(iterations: int) -> list[Result]:
+    """
+    ``APIMixin.get_absolute_api_url`` of 1000 zaken, relative and with the host of
+    the request.
+    """
+    request = get_api_request()
+    zaken = [Zaak() for _ in range(1000)]
+
+    def urls(request):
+        return lambda: [zaak.get_absolute_api_url(request=request) for zaak in zaken]
+
+    return [
+        measure("without request", urls(None), iterations),
+        measure("with request", urls(request), iterations),
+    ]
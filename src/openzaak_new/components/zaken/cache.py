@@ -0,0 +1,61 @@
+"""
+Generations for the cached Zaken API responses.
+
+Cached responses are not deleted one by one, since a single resource can be cached
+under many keys (query parameters, authorisation scope, host). Instead every cache
+key includes a *generation* token, which is replaced whenever the underlying data
+changes, so all old entries are simply never read again and expire on their own.
+Generations expire as well: a missing generation is replaced by a new one, which
+only orphans the entries of the old one.
+
+* the list generation changes on every write of any zaak
+* the detail generation of a zaak changes when it is written or deleted, or when
+  one of its deelzaken is added, removed or moved to another hoofdzaak
+"""
+
+import uuid
+from typing import Iterable
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+
+LIST_GENERATION_KEY = "zaken:responses:list-generation"
+DETAIL_GENERATION_KEY = "zaken:responses:detail-generation:{uuid}"
+
+
+def get_response_cache() -> BaseCache:
+    return caches[settings.ZAKEN_RESPONSE_CACHE_ALIAS]
+
+
+def _get_generation(key: str) -> str | None:
+    """
+    Return the current generation, or ``None`` if the cache is unavailable.
+    """
+    cache = get_response_cache()
+    generation = cache.get(key)
+    if generation is None:
+        # another process may have set it concurrently, in which case theirs wins
+        cache.add(key, uuid.uuid4().hex, timeout=settings.ZAKEN_RESPONSE_CACHE_TIMEOUT)
+        generation = cache.get(key)
+    return generation
+
+
+def get_list_generation() -> str | None:
+    return _get_generation(LIST_GENERATION_KEY)
+
+
+def get_detail_generation(zaak_uuid) -> str | None:
+    return _get_generation(DETAIL_GENERATION_KEY.format(uuid=zaak_uuid))
+
+
+def invalidate_responses(zaak_uuids: Iterable) -> None:
+    """
+    Invalidate the cached lists and the cached details of ``zaak_uuids``.
+    """
+    keys = [LIST_GENERATION_KEY] + [
+        DETAIL_GENERATION_KEY.format(uuid=zaak_uuid) for zaak_uuid in zaak_uuids
+    ]
+    get_response_cache().set_many(
+        {key: uuid.uuid4().hex for key in keys},
+        timeout=settings.ZAKEN_RESPONSE_CACHE_TIMEOUT,
+    )
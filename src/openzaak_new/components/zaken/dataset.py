@@ -0,0 +1,331 @@
+"""
+Generated zaken with realistic values, for load test datasets.
+
+There are two generators with the same distributions:
+
+* :func:`generate_zaken` builds model instances for ``bulk_create``. The values of a
+  batch are drawn column by column from a random generator seeded with the seed of
+  the dataset and the number of the batch, so the dataset only depends on the seed
+  and the batch size, not on the number of workers or the order in which the
+  batches are generated.
+* :func:`insert_zaken` and :func:`insert_zaaktypen` generate the rows in the
+  database with set based ``INSERT ... SELECT`` statements. Every value is derived
+  from a hash of the seed, the number of the row and the column, so a row is the
+  same regardless of the chunks it's inserted in.
+"""
+
+import datetime
+import hashlib
+import random
+import uuid
+
+from django.contrib.gis.geos import Point
+from django.db import connection
+
+from vng_api_common.constants import Archiefnominatie, VertrouwelijkheidsAanduiding
+
+from .constants import BetalingsIndicatie
+from .models import Zaak
+
+WORDS = (
+    "aanvraag",
+    "omgevingsvergunning",
+    "bezwaar",
+    "melding",
+    "openbare",
+    "ruimte",
+    "subsidie",
+    "parkeervergunning",
+    "evenement",
+    "klacht",
+    "verhuizing",
+    "bouwwerk",
+    "kapvergunning",
+    "uitkering",
+    "paspoort",
+    "huwelijk",
+)
+# valid RSINs
+ORGANISATIONS = ("517439943", "123456782", "111222333", "002220647")
+ORGANISATION_WEIGHTS = (6, 2, 1, 1)
+ARCHIEFNOMINATIE_WEIGHTS = (1, 4)
+VERTROUWELIJKHEID_WEIGHTS = (50, 10, 20, 10, 5, 3, 1, 1)
+ENDED = 0.7
+WITH_GEOMETRY = 0.25
+FIRST_DAY = datetime.date(2015, 1, 1)
+DAYS = 10 * 365
+ARCHIVE_PERIOD = datetime.timedelta(days=10 * 365)
+# the Netherlands
+BOUNDS = (3.4, 50.8, 7.1, 53.5)
+
+
+def generate_zaken(seed: int, number: int, size: int, first_pk: int) -> list[Zaak]:
+    """
+    Generate the ``size`` zaken of batch ``number`` of the dataset, with the primary
+    keys from ``first_pk``.
+
+    ``identificatie`` is numbered by the primary key, so it's unique next to the zaken
+    of earlier runs. The rest of the values is random:
+
+    * the zaken started between 2015 and 2025, 70% of them has ended;
+    * the ended zaken have an archiefnominatie and an archiefactiedatum 10 years
+      later;
+    * 25% of the zaken has a point in the Netherlands as geometry.
+    """
+    rng = random.Random(f"{seed}:{number}")
+
+    uuids = [uuid.UUID(int=rng.getrandbits(128), version=4) for _ in range(size)]
+    words = rng.choices(WORDS, k=size * 3)
+    organisations = rng.choices(ORGANISATIONS, weights=ORGANISATION_WEIGHTS, k=size)
+    startdata = [
+        FIRST_DAY + datetime.timedelta(days=days)
+        for days in rng.choices(range(DAYS), k=size)
+    ]
+    durations = [
+        datetime.timedelta(days=days) for days in rng.choices(range(365), k=size)
+    ]
+    ended = [value < ENDED for value in (rng.random() for _ in range(size))]
+    archiefnominaties = rng.choices(
+        Archiefnominatie.values, weights=ARCHIEFNOMINATIE_WEIGHTS, k=size
+    )
+    vertrouwelijkheden = rng.choices(
+        VertrouwelijkheidsAanduiding.values, weights=VERTROUWELIJKHEID_WEIGHTS, k=size
+    )
+    betalingsindicaties = rng.choices(["", *BetalingsIndicatie.values], k=size)
+    geometries = [
+        Point(
+            round(rng.uniform(BOUNDS[0], BOUNDS[2]), 6),
+            round(rng.uniform(BOUNDS[1], BOUNDS[3]), 6),
+            srid=4326,
+        )
+        if rng.random() < WITH_GEOMETRY
+        else None
+        for _ in range(size)
+    ]
+
+    zaken = []
+    for index in range(size):
+        startdatum = startdata[index]
+        einddatum_gepland = startdatum + durations[index]
+        einddatum = einddatum_gepland if ended[index] else None
+        archiefactiedatum = einddatum + ARCHIVE_PERIOD if einddatum else None
+        zaken.append(
+            Zaak(
+                pk=first_pk + index,
+                uuid=uuids[index],
+                identificatie=f"ZAAK-{first_pk + index:010}",
+                bronorganisatie=organisations[index],
+                verantwoordelijke_organisatie=organisations[index],
+                omschrijving=" ".join(words[index * 3 : index * 3 + 3]).capitalize(),
+                betalingsindicatie=betalingsindicaties[index],
+                vertrouwelijkheidaanduiding=vertrouwelijkheden[index],
+                registratiedatum=startdatum,
+                startdatum=startdatum,
+                einddatum_gepland=einddatum_gepland,
+                uiterlijke_einddatum_afdoening=einddatum_gepland,
+                einddatum=einddatum,
+                publicatiedatum=None,
+                laatste_betaaldatum=None,
+                archiefnominatie=archiefnominaties[index] if einddatum else None,
+                archiefactiedatum=archiefactiedatum,
+                startdatum_bewaartermijn=einddatum,
+                created_on=datetime.datetime.combine(
+                    startdatum, datetime.time(), tzinfo=datetime.UTC
+                ),
+                zaakgeometrie=geometries[index],
+            )
+        )
+    return zaken
+
+
+def _weighted(values, weights) -> list:
+    # an array to pick from uniformly
+    return [value for value, weight in zip(values, weights) for _ in range(weight)]
+
+
+def _uniform(name: str) -> str:
+    """
+    SQL for a uniformly distributed value in ``[0, 1)`` for the row ``i`` of the
+    ``generate_series`` and ``name``, which only depends on the seed.
+    """
+    return (
+        f"((hashtextextended(i::text || ':{name}', %(seed)s) & {2**52 - 1})::float8"
+        f" / {2**52})"
+    )
+
+
+def _pick(name: str, array: str) -> str:
+    """
+    SQL for a uniformly distributed element of the ``array`` parameter.
+    """
+    return (
+        f"(%({array})s::text[])"
+        f"[1 + floor({_uniform(name)} * cardinality(%({array})s::text[]))::int]"
+    )
+
+
+def _skewed(name: str, size: str, skew: str) -> str:
+    """
+    SQL for an index in ``[0, size)``, uniformly distributed for a ``skew`` of 1 and
+    increasingly concentrated on the first indexes for a larger ``skew``.
+    """
+    return f"floor(%({size})s * power({_uniform(name)}, %({skew})s))::bigint"
+
+
+def get_generated_uuid(seed: int, kind: str, number: int) -> uuid.UUID:
+    """
+    The UUID of row ``number`` (from 1) of the ``zaak`` or ``zaaktype`` rows that
+    :func:`insert_zaken` and :func:`insert_zaaktypen` generate for ``seed``.
+    """
+    digest = hashlib.md5(f"{seed}:{kind}:{number}".encode(), usedforsecurity=False)
+    return uuid.UUID(digest.hexdigest())
+
+
+def insert_zaaktypen(seed: int, count: int) -> list[int]:
+    """
+    Insert ``count`` zaaktypen and return their primary keys.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO catalogi_zaaktype (uuid, identificatie)
+            SELECT
+                md5(%(seed)s::text || ':zaaktype:' || i)::uuid,
+                'ZKT-' || lpad(i::text, 4, '0')
+            FROM generate_series(1, %(count)s) AS i
+            ORDER BY i
+            RETURNING id
+            """,
+            {"seed": seed, "count": count},
+        )
+        return sorted(pk for (pk,) in cursor.fetchall())
+
+
+INSERT_ZAKEN = f"""
+INSERT INTO zaken_zaak (
+    id, uuid, identificatie, bronorganisatie, verantwoordelijke_organisatie,
+    opdrachtgevende_organisatie, omschrijving, toelichting, betalingsindicatie,
+    verlenging_reden, opschorting_reden, opschorting_indicatie,
+    opschorting_eerdere_opschorting, archiefnominatie, archiefstatus,
+    processobjectaard, processobject_datumkenmerk, processobject_identificatie,
+    processobject_objecttype, processobject_registratie, communicatiekanaal_naam,
+    registratiedatum, startdatum, einddatum, einddatum_gepland,
+    uiterlijke_einddatum_afdoening, publicatiedatum, laatste_betaaldatum,
+    archiefactiedatum, startdatum_bewaartermijn, created_on, zaakgeometrie,
+    verlenging_duur, vertrouwelijkheidaanduiding, selectielijstklasse,
+    communicatiekanaal, producten_of_diensten, hoofdzaak_id, _zaaktype_id
+)
+SELECT
+    %(first_pk)s + i - 1,
+    md5(%(seed)s::text || ':zaak:' || i)::uuid,
+    'ZAAK-' || lpad(i::text, 10, '0'),
+    organisatie,
+    organisatie,
+    organisatie,
+    initcap({_pick("word1", "words")}) || ' ' || {_pick("word2", "words")}
+        || ' ' || {_pick("word3", "words")},
+    '',
+    {_pick("betalingsindicatie", "betalingsindicaties")},
+    '',
+    '',
+    false,
+    false,
+    CASE WHEN ended THEN {_pick("archiefnominatie", "archiefnominaties")} END,
+    NULL,
+    '', '', '', '', '', '',
+    startdatum,
+    startdatum,
+    CASE WHEN ended THEN startdatum + duur END,
+    startdatum + duur,
+    startdatum + duur,
+    NULL,
+    NULL,
+    CASE WHEN ended THEN startdatum + duur + %(archive_days)s END,
+    CASE WHEN ended THEN startdatum + duur END,
+    startdatum::timestamptz,
+    CASE WHEN {_uniform("geometry")} < %(with_geometry)s THEN ST_SetSRID(
+        ST_MakePoint(
+            round((%(min_x)s + {_uniform("x")} * (%(max_x)s - %(min_x)s))::numeric, 6),
+            round((%(min_y)s + {_uniform("y")} * (%(max_y)s - %(min_y)s))::numeric, 6)
+        ),
+        4326
+    ) END,
+    NULL,
+    {_pick("vertrouwelijkheidaanduiding", "vertrouwelijkheden")},
+    '',
+    '',
+    '{{}}',
+    CASE WHEN i > %(hoofdzaken)s AND i <= %(hoofdzaken)s + %(deelzaken)s
+        THEN %(first_pk)s + {_skewed("hoofdzaak", "hoofdzaken", "tree_skew")}
+    END,
+    CASE WHEN %(zaaktypen_count)s > 0 THEN (%(zaaktypen)s::bigint[])[
+        1 + {_skewed("zaaktype", "zaaktypen_count", "zaaktype_skew")}
+    ] END
+FROM (
+    SELECT
+        i,
+        {_pick("organisatie", "organisaties")} AS organisatie,
+        %(first_day)s::date + floor({_uniform("startdatum")} * %(days)s)::int
+            AS startdatum,
+        floor({_uniform("duur")} * 365)::int AS duur,
+        {_uniform("ended")} < %(ended)s AS ended
+    FROM generate_series(%(start)s, %(end)s) AS i
+) AS zaak
+"""
+
+
+def insert_zaken(
+    seed: int,
+    start: int,
+    end: int,
+    first_pk: int,
+    zaaktypen: list[int],
+    hoofdzaken: int = 0,
+    deelzaken: int = 0,
+    zaaktype_skew: float = 1.0,
+    tree_skew: float = 1.0,
+) -> None:
+    """
+    Insert the zaken ``start`` up to and including ``end`` of the dataset, numbered
+    from 1. Zaak ``i`` gets the primary key ``first_pk + i - 1``.
+
+    The first ``hoofdzaken`` zaken are the hoofdzaken of the next ``deelzaken``
+    zaken. Every zaak gets one of the ``zaaktypen``. The hoofdzaken and zaaktypen are
+    distributed uniformly with a skew of 1, and increasingly concentrated on the
+    first ones with a larger skew.
+    """
+    minimum_x, minimum_y, maximum_x, maximum_y = BOUNDS
+    with connection.cursor() as cursor:
+        cursor.execute(
+            INSERT_ZAKEN,
+            {
+                "seed": seed,
+                "start": start,
+                "end": end,
+                "first_pk": first_pk,
+                "words": list(WORDS),
+                "organisaties": _weighted(ORGANISATIONS, ORGANISATION_WEIGHTS),
+                "betalingsindicaties": ["", *BetalingsIndicatie.values],
+                "archiefnominaties": _weighted(
+                    Archiefnominatie.values, ARCHIEFNOMINATIE_WEIGHTS
+                ),
+                "vertrouwelijkheden": _weighted(
+                    VertrouwelijkheidsAanduiding.values, VERTROUWELIJKHEID_WEIGHTS
+                ),
+                "first_day": FIRST_DAY,
+                "days": DAYS,
+                "archive_days": ARCHIVE_PERIOD.days,
+                "ended": ENDED,
+                "with_geometry": WITH_GEOMETRY,
+                "min_x": minimum_x,
+                "min_y": minimum_y,
+                "max_x": maximum_x,
+                "max_y": maximum_y,
+                "hoofdzaken": hoofdzaken,
+                "deelzaken": deelzaken,
+                "tree_skew": tree_skew,
+                "zaaktypen": zaaktypen,
+                "zaaktypen_count": len(zaaktypen),
+                "zaaktype_skew": zaaktype_skew,
+            },
+        )
@@ -0,0 +1,271 @@
+"""
+Bulk loading of zaken with ``COPY FROM STDIN``.
+
+The rows are streamed from a CSV or JSON Lines file straight into the ``COPY`` of
+``zaken_zaak``: no model instances are built and only the current row is kept in
+memory, so the memory use is constant regardless of the size of the file.
+
+The keys of the rows are the names of the model fields, or the ``attname`` of
+foreign keys (``hoofdzaak_id``, ``_zaaktype_id``, ``_zaaktype_base_url_id``).
+Missing fields get the model default, like ``Zaak()`` would, and so do empty values
+of fields that can't be ``NULL``. Geometries are GeoJSON objects, or any string
+GEOS accepts (WKT, EWKT, HEXEWKB, GeoJSON).
+"""
+
+import csv
+import json
+import re
+from itertools import chain
+from typing import IO, Any, Callable, Iterable, Iterator
+
+from django.contrib.gis.db.models import GeometryField
+from django.contrib.gis.gdal import GDALException
+from django.contrib.gis.geos import GEOSException, GEOSGeometry
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, connection, models, transaction
+from django.db.models import Max
+
+from .cache import invalidate_responses
+from .models import Zaak
+
+Row = dict[str, Any]
+
+
+class LoadError(Exception):
+    pass
+
+
+def read_csv(file: IO[str]) -> Iterator[Row]:
+    """
+    Read the rows of a CSV file with a header. Empty cells are ``None``.
+    """
+    for row in csv.DictReader(file):
+        yield {key: (value if value != "" else None) for key, value in row.items()}
+
+
+def read_jsonl(file: IO[str]) -> Iterator[Row]:
+    """
+    Read the rows of a JSON Lines file, one object per line.
+    """
+    for number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise LoadError(f"Line {number}: {exc}") from exc
+
+
+READERS: dict[str, Callable[[IO[str]], Iterator[Row]]] = {
+    "csv": read_csv,
+    "jsonl": read_jsonl,
+}
+
+
+def _to_geometry(field: GeometryField, value) -> str:
+    if isinstance(value, dict):
+        value = json.dumps(value)
+    geometry = GEOSGeometry(value)
+    if geometry.srid is None:
+        geometry.srid = field.srid
+    elif geometry.srid != field.srid:
+        geometry.transform(field.srid)
+    # the text format of ``COPY`` accepts the hex encoded EWKB
+    return geometry.hexewkb.decode()
+
+
+def _get_column_value(field: models.Field, value):
+    """
+    Convert a value of the input into the value for the column of ``field``.
+    """
+    if value is None:
+        return None if field.null else _get_default(field)
+    if isinstance(field, GeometryField):
+        return _to_geometry(field, value)
+    return field.get_db_prep_save(field.to_python(value), connection)
+
+
+def _get_default(field: models.Field):
+    return field.get_db_prep_save(field.get_default(), connection)
+
+
+def get_fields(model: type[models.Model] = Zaak) -> list[models.Field]:
+    """
+    The fields with a column in the ``COPY``, every concrete field but the
+    auto-incrementing primary key.
+    """
+    return [
+        field
+        for field in model._meta.concrete_fields
+        if not (field.primary_key and isinstance(field, models.AutoField))
+    ]
+
+
+def _get_row_converter(
+    fields: list[models.Field], keys: Iterable[str]
+) -> Callable[[Row], tuple]:
+    """
+    Build the function that turns an input row into the values of the ``COPY``.
+
+    The fields that are not in the input are filled with their default: the
+    constant defaults are prepared once, the callable ones (``uuid4``,
+    ``timezone.now``) for every row.
+    """
+    keys = set(keys)
+    known = {name for field in fields for name in (field.name, field.attname)}
+    if unknown := sorted(keys - known):
+        raise LoadError(f"Unknown fields: {', '.join(unknown)}.")
+
+    getters = []
+    for field in fields:
+        key = next((key for key in (field.name, field.attname) if key in keys), None)
+        if key is not None:
+            getters.append(
+                lambda row, field=field, key=key: _get_column_value(field, row.get(key))
+            )
+        elif field.has_default() and callable(field.default):
+            getters.append(lambda row, field=field: _get_default(field))
+        else:
+            default = _get_default(field)
+            getters.append(lambda row, default=default: default)
+
+    def convert(row: Row) -> tuple:
+        return tuple(getter(row) for getter in getters)
+
+    return convert
+
+
+def drop_indexes(table: str) -> list[str]:
+    """
+    Drop the indexes of ``table`` that don't back a constraint and return their
+    definitions, to recreate them with :func:`create_indexes`.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT indexname, indexdef FROM pg_indexes
+            WHERE schemaname = current_schema() AND tablename = %s
+            AND indexname NOT IN (
+                SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass
+            )
+            """,
+            [table, table],
+        )
+        indexes = cursor.fetchall()
+        for name, _definition in indexes:
+            cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
+    return [definition for _name, definition in indexes]
+
+
+def create_indexes(definitions: list[str]) -> None:
+    with connection.cursor() as cursor:
+        for definition in definitions:
+            cursor.execute(definition)
+
+
+def copy_zaken(
+    rows: Iterable[Row],
+    *,
+    without_indexes: bool = False,
+    progress: Callable[[int], None] | None = None,
+    progress_every: int = 10_000,
+) -> int:
+    """
+    Insert the zaken in ``rows`` with ``COPY FROM STDIN`` and return their number.
+
+    All rows are loaded in a single transaction, an invalid row rolls back the whole
+    load. Rows the database rejects (e.g. a duplicate ``uuid`` or an unknown
+    ``hoofdzaak_id``) raise a :class:`LoadError` as well.
+
+    :param without_indexes: drop the indexes during the load and rebuild them at the
+      end, which is faster than updating them for every row when loading a large
+      number of zaken. The indexes are locked during the load.
+    :param progress: called with the number of rows loaded since the previous call,
+      every ``progress_every`` rows.
+    """
+    quote_name = connection.ops.quote_name
+    table = Zaak._meta.db_table
+    fields = get_fields()
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return 0
+
+    # the rows of a JSON Lines file don't all have the same keys
+    converters: dict[frozenset[str], Callable[[Row], tuple]] = {}
+
+    def convert(row: Row) -> tuple:
+        keys = frozenset(row)
+        if keys not in converters:
+            converters[keys] = _get_row_converter(fields, keys)
+        return converters[keys](row)
+
+    statement = "COPY {} ({}) FROM STDIN".format(
+        quote_name(table), ", ".join(quote_name(field.column) for field in fields)
+    )
+
+    try:
+        with transaction.atomic():
+            last_pk = Zaak.objects.aggregate(last_pk=Max("pk"))["last_pk"] or 0
+            definitions = drop_indexes(table) if without_indexes else []
+
+            with (
+                connection.cursor() as cursor,
+                connection.wrap_database_errors,
+                cursor.cursor.copy(statement) as copy,
+            ):
+                for count, row in enumerate(chain([first], rows), start=1):
+                    copy.write_row(_convert(convert, row, count))
+                    if progress and count % progress_every == 0:
+                        progress(progress_every)
+            if progress and count % progress_every:
+                progress(count % progress_every)
+
+            # the foreign keys are deferred, check them before the indexes are built
+            connection.check_constraints()
+            create_indexes(definitions)
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {quote_name(table)}")
+
+            # the loaded zaken aren't cached yet, but they are part of the lists and
+            # of the deelzaken of their hoofdzaak
+            hoofdzaak_uuids = list(
+                Zaak.objects.filter(deelzaken__pk__gt=last_pk)
+                .values_list("uuid", flat=True)
+                .distinct()
+            )
+            transaction.on_commit(lambda: invalidate_responses(hoofdzaak_uuids))
+    except DatabaseError as exc:
+        raise _database_error(exc) from exc
+
+    return count
+
+
+def _database_error(exc: DatabaseError) -> LoadError:
+    """
+    Describe the error of the database, with the number of the row when ``COPY``
+    reports it.
+    """
+    diag = getattr(exc.__cause__, "diag", None)
+    if diag is None or diag.message_primary is None:
+        return LoadError(str(exc))
+
+    message = " ".join(filter(None, [diag.message_primary, diag.message_detail]))
+    # the rows are the lines of the COPY
+    if match := re.search(r"^COPY \S+, line (\d+)", diag.context or ""):
+        return LoadError(f"Row {match[1]}: {message}")
+    return LoadError(message)
+
+
+def _convert(convert: Callable[[Row], tuple], row: Row, number: int) -> tuple:
+    try:
+        return convert(row)
+    except (
+        LoadError,
+        ValidationError,
+        ValueError,
+        TypeError,
+        GEOSException,
+        GDALException,
+    ) as exc:
+        raise LoadError(f"Row {number}: {exc}") from exc
@@ -0,0 +1,84 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from openzaak_new.components.zaken.benchmarks import BENCHMARKS, Result
+
+
+class Command(BaseCommand):
+    help = "Run benchmarks against the zaken in the configured database."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "benchmarks",
+            nargs="+",
+            choices=sorted(BENCHMARKS),
+            help="The benchmarks to run",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20,
+            help="Number of times every variant is executed (default: 20)",
+        )
+        parser.add_argument(
+            "--history",
+            type=Path,
+            help=(
+                "JSON file the results are added to, the medians are compared with "
+                "the previous run in it"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        history = self.read_history(options["history"])
+        previous = history[-1]["results"] if history else {}
+        run = {}
+
+        for name in options["benchmarks"]:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{name}:"))
+
+            results = BENCHMARKS[name](options["iterations"])
+            run[name] = {
+                result.label: {
+                    "mean": result.mean,
+                    "median": result.median,
+                    "min": result.minimum,
+                }
+                for result in results
+            }
+            self.write_results(results, previous.get(name, {}))
+
+        if options["history"]:
+            history.append(
+                {
+                    "timestamp": timezone.now().isoformat(),
+                    "commit": getattr(settings, "GIT_SHA", None),
+                    "iterations": options["iterations"],
+                    "results": run,
+                }
+            )
+            options["history"].write_text(json.dumps(history, indent=2))
+
+    def read_history(self, path: Path | None) -> list[dict]:
+        if path is None or not path.exists():
+            return []
+        return json.loads(path.read_text())
+
+    def write_results(self, results: list[Result], previous: dict[str, dict]) -> None:
+        width = max(len(result.label) for result in results)
+        self.stdout.write(
+            f"  {'variant':<{width}}  {'mean':>10}  {'median':>10}  {'min':>10}"
+            + ("  previous" if previous else "")
+        )
+        for result in results:
+            line = (
+                f"  {result.label:<{width}}  {result.mean * 1000:>8.2f}ms"
+                f"  {result.median * 1000:>8.2f}ms  {result.minimum * 1000:>8.2f}ms"
+            )
+            if before := previous.get(result.label, {}).get("median"):
+                line += f"  {(result.median - before) / before * 100:>+7.1f}%"
+            self.stdout.write(line)
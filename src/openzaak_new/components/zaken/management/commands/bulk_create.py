@@ -1,16 +1,129 @@
-from django.core.management.base import BaseCommand
+import random
+from typing import Callable
 
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection
+from django.db.models import Max
+
+from tqdm import tqdm
+
+from openzaak_new.components.zaken.cache import invalidate_responses
+from openzaak_new.components.zaken.dataset import generate_zaken
 from openzaak_new.components.zaken.models import Zaak
 
+from ..workers import run_workers
+
+
+def create_batches(
+    seed: int,
+    count: int,
+    batch_size: int,
+    first_pk: int,
+    batches: range,
+    report: Callable[[int], None],
+) -> None:
+    """
+    Generate and insert the ``batches`` of the dataset, one ``bulk_create`` each.
+    """
+    for number in batches:
+        offset = number * batch_size
+        size = min(batch_size, count - offset)
+        Zaak.objects.bulk_create(generate_zaken(seed, number, size, first_pk + offset))
+        report(size)
+
 
 class Command(BaseCommand):
-    def handle(self, *args, **kwargs):
-        self.stdout.write("Start")
+    help = (
+        "Create zaken with random, realistic values. The primary keys are split in "
+        "ranges, which are generated and inserted by parallel workers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--count",
+            type=int,
+            default=1_000_000,
+            help="Number of zaken to create (default: 1000000)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10_000,
+            help="Number of zaken generated and inserted at once (default: 10000)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of processes, each creating a range of primary keys "
+            "(default: 1)",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            help=(
+                "Seed of the random values, the same seed and batch size create the "
+                "same zaken (default: a random seed)"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        count, batch_size = options["count"], options["batch_size"]
+        if count < 1 or batch_size < 1 or options["workers"] < 1:
+            raise CommandError("--count, --batch-size and --workers must be positive.")
 
-        products = [Zaak() for i in range(1000000)]
+        seed = options["seed"]
+        if seed is None:
+            seed = random.randrange(2**32)
+        elif self.is_created(seed):
+            # the UUIDs only depend on the seed and are unique
+            raise CommandError(
+                f"The zaken of seed {seed} are already in the database, use another "
+                "--seed."
+            )
+        self.stdout.write(f"Start creating {count} zaken with seed {seed}")
 
-        Zaak.objects.bulk_create(products, batch_size=10000)
+        # the zaken are inserted with their primary key, after the existing ones
+        first_pk = (Zaak.objects.aggregate(last=Max("pk"))["last"] or 0) + 1
+        batches = range(-(-count // batch_size))
+        per_worker = -(-len(batches) // options["workers"])
+        kwargs = {
+            "seed": seed,
+            "count": count,
+            "batch_size": batch_size,
+            "first_pk": first_pk,
+        }
+
+        with tqdm(
+            total=count, desc="Creating zaken", disable=options["verbosity"] == 0
+        ) as progress:
+            if options["workers"] == 1:
+                create_batches(**kwargs, batches=batches, report=progress.update)
+            else:
+                succeeded = run_workers(
+                    create_batches,
+                    [
+                        {**kwargs, "batches": batches[start : start + per_worker]}
+                        for start in range(0, len(batches), per_worker)
+                    ],
+                    lambda index, size: progress.update(size),
+                )
+                if not succeeded:
+                    raise CommandError("A worker failed.")
+
+        # continue the sequence of the primary key after the inserted zaken
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [Zaak]):
+                cursor.execute(sql)
+        # bulk_create doesn't send the signals that invalidate the cached lists
+        invalidate_responses([])
 
         self.stdout.write(
             self.style.SUCCESS(f"Total zaken created: {Zaak.objects.all().count()}")
         )
+
+    def is_created(self, seed: int) -> bool:
+        # the first zaak of every dataset of the seed
+        (zaak,) = generate_zaken(seed, 0, 1, 1)
+        return Zaak.objects.filter(uuid=zaak.uuid).exists()
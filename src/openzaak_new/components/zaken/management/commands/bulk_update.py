@@ -1,19 +1,115 @@
+import json
+import os
 import random
 import string
+from functools import partial
+from typing import Callable
 
+from django.core.exceptions import FieldDoesNotExist
 from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models, transaction
+from django.db.models import Max, Min
 
 from tqdm import tqdm
 
+from openzaak_new.components.zaken.cache import invalidate_responses
 from openzaak_new.components.zaken.models import Zaak
 
+from ..workers import run_workers
+
+# the parameters of a query are limited to 65535, ``VALUES`` takes two per zaak
+MAX_VALUES_BATCH_SIZE = 30_000
+
 
 def random_string(length=30):
     return "".join(random.choices(string.ascii_letters + string.digits, k=length))
 
 
+def update_values(field: models.Field, values: list[tuple[int, str]]) -> None:
+    """
+    Update the zaken with a single ``UPDATE ... FROM (VALUES ...)``.
+    """
+    quote_name = connection.ops.quote_name
+    table = quote_name(Zaak._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {table} SET {quote_name(field.column)} = v.value "
+            f"FROM (VALUES {', '.join(['(%s, %s)'] * len(values))}) AS v (id, value) "
+            f"WHERE {table}.id = v.id",
+            [param for row in values for param in row],
+        )
+
+
+def update_copy(field: models.Field, values: list[tuple[int, str]]) -> None:
+    """
+    ``COPY`` the values into a temporary table and update the zaken with a join on
+    it, which has no limit on the number of values.
+    """
+    quote_name = connection.ops.quote_name
+    table = quote_name(Zaak._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "CREATE TEMPORARY TABLE IF NOT EXISTS bulk_update_values "
+            "(id bigint PRIMARY KEY, value text)"
+        )
+        cursor.execute("TRUNCATE bulk_update_values")
+        with cursor.cursor.copy(
+            "COPY bulk_update_values (id, value) FROM STDIN"
+        ) as copy:
+            for row in values:
+                copy.write_row(row)
+        cursor.execute(
+            f"UPDATE {table} SET {quote_name(field.column)} = v.value "
+            f"FROM bulk_update_values v WHERE {table}.id = v.id"
+        )
+
+
+UPDATERS: dict[str, Callable[[models.Field, list[tuple[int, str]]], None]] = {
+    "values": update_values,
+    "copy": update_copy,
+}
+
+
+def update_range(
+    field: models.Field,
+    method: str,
+    batch_size: int,
+    after: int,
+    end: int,
+    report: Callable[[int, int], None],
+) -> None:
+    """
+    Update the zaken with ``after < pk <= end`` in chunks of ``batch_size``, walking
+    the primary key.
+
+    Every chunk is committed on its own and reported with its last pk and size, from
+    where the update can be resumed. The updates don't send signals, so the cached
+    responses of the chunk are invalidated when it commits.
+    """
+    length = min(30, field.max_length or 30)
+    while True:
+        rows = list(
+            Zaak.objects.filter(pk__gt=after, pk__lte=end)
+            .order_by("pk")
+            .values_list("pk", "uuid")[:batch_size]
+        )
+        if not rows:
+            return
+
+        pks, uuids = zip(*rows)
+        with transaction.atomic():
+            UPDATERS[method](field, [(pk, random_string(length)) for pk in pks])
+            transaction.on_commit(partial(invalidate_responses, uuids))
+
+        after = pks[-1]
+        report(after, len(pks))
+
+
 class Command(BaseCommand):
-    help = "Bulk update Zaak instances by setting a random string on a specified field."
+    help = (
+        "Bulk update Zaak instances by setting a random string on a specified field, "
+        "in chunks along the primary key."
+    )
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -22,33 +118,139 @@ class Command(BaseCommand):
             required=True,
             help="The name of the field to update (e.g. 'name')",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10_000,
+            help="Number of zaken updated per statement (default: 10000)",
+        )
+        parser.add_argument(
+            "--method",
+            choices=sorted(UPDATERS),
+            default="values",
+            help=(
+                "'values' updates from a VALUES list in the statement, 'copy' from a "
+                "temporary table filled with COPY (default: values)"
+            ),
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of processes, each updating a range of primary keys "
+            "(default: 1)",
+        )
+        parser.add_argument(
+            "--state-file",
+            help="Where the progress is kept (default: bulk_update_<field>.json)",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue an interrupted update from its state file",
+        )
 
     def handle(self, *args, **options):
         field_name = options["field"]
-
-        if not hasattr(Zaak, field_name):
+        try:
+            field = Zaak._meta.get_field(field_name)
+        except FieldDoesNotExist:
             raise CommandError(f"Field '{field_name}' does not exist on Zaak model.")
+        if not isinstance(field, (models.CharField, models.TextField)):
+            raise CommandError(
+                f"Field '{field_name}' can't be updated with a random string."
+            )
 
-        self.stdout.write(f"Start bulk updating field '{field_name}' with progress...")
-
-        zaken = list(Zaak.objects.all())
-        total = len(zaken)
-        self.stdout.write(f"Total zaken to update: {total}")
+        batch_size = options["batch_size"]
+        if options["method"] == "values" and batch_size > MAX_VALUES_BATCH_SIZE:
+            raise CommandError(
+                f"The batch size of the 'values' method is at most "
+                f"{MAX_VALUES_BATCH_SIZE}, use --method copy for larger batches."
+            )
 
-        # Modifica dei dati con barra di avanzamento
-        for zaak in tqdm(zaken, desc="Generating random values"):
-            setattr(zaak, field_name, random_string())
+        self.state_file = options["state_file"] or f"bulk_update_{field.name}.json"
+        if options["resume"]:
+            self.ranges = self.read_state(field)
+        else:
+            self.ranges = self.split_ranges(options["workers"])
+        self.write_state(field)
 
-        # Bulk update in batch
-        batch_size = 10000
-        self.stdout.write("Starting bulk_update in batches...")
+        total = sum(
+            Zaak.objects.filter(pk__gt=after, pk__lte=end).count()
+            for after, end in self.ranges
+        )
+        self.stdout.write(
+            f"Start bulk updating field '{field_name}' of {total} zaken "
+            f"with {len(self.ranges)} worker(s)..."
+        )
 
-        for i in tqdm(range(0, total, batch_size), desc="Bulk updating"):
-            batch = zaken[i : i + batch_size]
-            Zaak.objects.bulk_update(batch, [field_name], batch_size=batch_size)
+        kwargs = {"field": field, "method": options["method"], "batch_size": batch_size}
+        with tqdm(
+            total=total, desc="Bulk updating", disable=options["verbosity"] == 0
+        ) as self.progress:
+            if len(self.ranges) == 1:
+                after, end = self.ranges[0]
+                update_range(
+                    **kwargs,
+                    after=after,
+                    end=end,
+                    report=lambda after, count: self.report(field, 0, after, count),
+                )
+            else:
+                self.run_workers(field, kwargs)
 
+        os.remove(self.state_file)
         self.stdout.write(
             self.style.SUCCESS(
                 f"All zaken updated on field '{field_name}' with random values."
             )
         )
+
+    def split_ranges(self, workers: int) -> list[list[int]]:
+        """
+        Split the primary keys in ``workers`` ranges of ``[after, end]``.
+        """
+        bounds = Zaak.objects.aggregate(first=Min("pk"), last=Max("pk"))
+        if bounds["first"] is None:
+            return [[0, 0]]
+
+        first, last = bounds["first"] - 1, bounds["last"]
+        size = -(-(last - first) // max(workers, 1))
+        return [[after, min(after + size, last)] for after in range(first, last, size)]
+
+    def run_workers(self, field: models.Field, kwargs: dict) -> None:
+        succeeded = run_workers(
+            update_range,
+            [{**kwargs, "after": after, "end": end} for after, end in self.ranges],
+            lambda index, after, count: self.report(field, index, after, count),
+        )
+        if not succeeded:
+            raise CommandError(
+                f"A worker failed, continue the update with --resume "
+                f"--state-file {self.state_file}"
+            )
+
+    def report(self, field: models.Field, index: int, after: int, count: int) -> None:
+        self.ranges[index][0] = after
+        self.write_state(field)
+        self.progress.update(count)
+
+    def read_state(self, field: models.Field) -> list[list[int]]:
+        try:
+            with open(self.state_file) as file:
+                state = json.load(file)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Can't resume from {self.state_file}: {exc}")
+
+        if state["field"] != field.name:
+            raise CommandError(
+                f"{self.state_file} is the state of updating '{state['field']}'."
+            )
+        return state["ranges"]
+
+    def write_state(self, field: models.Field) -> None:
+        # replace the file at once, so it's never left half written
+        temporary = f"{self.state_file}.tmp"
+        with open(temporary, "w") as file:
+            json.dump({"field": field.name, "ranges": self.ranges}, file)
+        os.replace(temporary, self.state_file)
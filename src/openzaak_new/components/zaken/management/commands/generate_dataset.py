@@ -0,0 +1,177 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+
+from tqdm import tqdm
+
+from openzaak_new.components.catalogi.models import ZaakType
+from openzaak_new.components.zaken.cache import invalidate_responses
+from openzaak_new.components.zaken.dataset import (
+    get_generated_uuid,
+    insert_zaaktypen,
+    insert_zaken,
+)
+from openzaak_new.components.zaken.loading import create_indexes, drop_indexes
+from openzaak_new.components.zaken.models import Zaak
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a dataset of zaken, zaaktypen and hoofd- and deelzaken in the "
+        "database with set based SQL. The same seed generates the same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--zaken",
+            type=int,
+            default=1_000_000,
+            help="Number of zaken (default: 1000000)",
+        )
+        parser.add_argument(
+            "--zaaktypen",
+            type=int,
+            default=100,
+            help="Number of zaaktypen the zaken are divided over (default: 100)",
+        )
+        parser.add_argument(
+            "--hoofdzaken",
+            type=int,
+            default=50,
+            help="Number of zaken with deelzaken (default: 50)",
+        )
+        parser.add_argument(
+            "--deelzaken",
+            type=int,
+            default=50,
+            help="Number of zaken that are a deelzaak of a hoofdzaak (default: 50)",
+        )
+        parser.add_argument(
+            "--zaaktype-skew",
+            type=float,
+            default=1.0,
+            help=(
+                "Distribution of the zaken over the zaaktypen, 1 is uniform and a "
+                "larger skew gives the first zaaktypen more zaken (default: 1)"
+            ),
+        )
+        parser.add_argument(
+            "--tree-skew",
+            type=float,
+            default=1.0,
+            help=(
+                "Distribution of the deelzaken over the hoofdzaken, like "
+                "--zaaktype-skew (default: 1)"
+            ),
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Seed of the generated values (default: 0)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1_000_000,
+            help="Number of zaken inserted per transaction (default: 1000000)",
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help=(
+                "Delete all zaken and zaaktypen first, so the primary keys are the "
+                "same for the same seed as well"
+            ),
+        )
+        parser.add_argument(
+            "--drop-indexes",
+            action="store_true",
+            help="Drop the indexes of the zaken during the generation and rebuild "
+            "them afterwards",
+        )
+
+    def handle(self, *args, **options):
+        count, batch_size = options["zaken"], options["batch_size"]
+        hoofdzaken, deelzaken = options["hoofdzaken"], options["deelzaken"]
+        if count < 0 or options["zaaktypen"] < 0 or batch_size < 1:
+            raise CommandError("The numbers of zaken and zaaktypen can't be negative.")
+        if hoofdzaken < 0 or deelzaken < 0 or hoofdzaken + deelzaken > count:
+            raise CommandError(
+                "The hoofdzaken and deelzaken must fit in the number of zaken."
+            )
+        if deelzaken and not hoofdzaken:
+            raise CommandError("Deelzaken need at least one hoofdzaak.")
+        if options["zaaktype_skew"] <= 0 or options["tree_skew"] <= 0:
+            raise CommandError("The skews must be positive.")
+
+        if options["clear"]:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "TRUNCATE {}, {} RESTART IDENTITY CASCADE".format(
+                        connection.ops.quote_name(Zaak._meta.db_table),
+                        connection.ops.quote_name(ZaakType._meta.db_table),
+                    )
+                )
+        elif self.is_generated(options["seed"]):
+            # the UUIDs only depend on the seed and are unique
+            raise CommandError(
+                f"The dataset of seed {options['seed']} is already in the database, "
+                "regenerate it with --clear or use another --seed."
+            )
+
+        self.stdout.write(
+            f"Generating {count} zaken and {options['zaaktypen']} zaaktypen "
+            f"with seed {options['seed']}"
+        )
+        zaaktypen = insert_zaaktypen(options["seed"], options["zaaktypen"])
+        first_pk = (Zaak.objects.aggregate(last=Max("pk"))["last"] or 0) + 1
+        definitions = (
+            drop_indexes(Zaak._meta.db_table) if options["drop_indexes"] else []
+        )
+
+        try:
+            with tqdm(
+                total=count, desc="Generating zaken", disable=options["verbosity"] == 0
+            ) as progress:
+                for start in range(1, count + 1, batch_size):
+                    end = min(start + batch_size - 1, count)
+                    with transaction.atomic():
+                        insert_zaken(
+                            options["seed"],
+                            start,
+                            end,
+                            first_pk,
+                            zaaktypen,
+                            hoofdzaken=hoofdzaken,
+                            deelzaken=deelzaken,
+                            zaaktype_skew=options["zaaktype_skew"],
+                            tree_skew=options["tree_skew"],
+                        )
+                    progress.update(end - start + 1)
+        finally:
+            # also when interrupted, the committed batches are kept
+            create_indexes(definitions)
+
+        with connection.cursor() as cursor:
+            # continue the sequence of the primary key after the generated zaken
+            for sql in connection.ops.sequence_reset_sql(no_style(), [Zaak]):
+                cursor.execute(sql)
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(Zaak._meta.db_table)}")
+        invalidate_responses([])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Total zaken: {Zaak.objects.count()}, "
+                f"zaaktypen: {ZaakType.objects.count()}"
+            )
+        )
+
+    def is_generated(self, seed: int) -> bool:
+        return (
+            ZaakType.objects.filter(
+                uuid=get_generated_uuid(seed, "zaaktype", 1)
+            ).exists()
+            or Zaak.objects.filter(uuid=get_generated_uuid(seed, "zaak", 1)).exists()
+        )
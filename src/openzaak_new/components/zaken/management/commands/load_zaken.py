@@ -0,0 +1,64 @@
+import sys
+from contextlib import nullcontext
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tqdm import tqdm
+
+from openzaak_new.components.zaken.loading import READERS, LoadError, copy_zaken
+
+
+class Command(BaseCommand):
+    help = (
+        "Load zaken from a CSV or JSON Lines file with COPY FROM STDIN. The file is "
+        "streamed, so it can be of any size."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            help="The file to load, or '-' to read from stdin",
+        )
+        parser.add_argument(
+            "--format",
+            choices=sorted(READERS),
+            help="The format of the file (default: derived from the file extension)",
+        )
+        parser.add_argument(
+            "--drop-indexes",
+            action="store_true",
+            help=(
+                "Drop the indexes during the load and rebuild them afterwards, "
+                "which is faster when loading many zaken"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or Path(path).suffix.lstrip(".").lower()
+        if file_format not in READERS:
+            raise CommandError(
+                "Specify the --format of the file, one of: " + ", ".join(READERS)
+            )
+
+        progress = tqdm(
+            desc="Loading zaken", unit=" zaken", disable=options["verbosity"] == 0
+        )
+        try:
+            with (
+                open(path, newline="", encoding="utf-8")
+                if path != "-"
+                else nullcontext(sys.stdin)
+            ) as file:
+                count = copy_zaken(
+                    READERS[file_format](file),
+                    without_indexes=options["drop_indexes"],
+                    progress=progress.update,
+                )
+        except (LoadError, OSError) as exc:
+            raise CommandError(str(exc)) from exc
+        finally:
+            progress.close()
+
+        self.stdout.write(self.style.SUCCESS(f"Total zaken loaded: {count}"))
@@ -0,0 +1,56 @@
+"""
+Run the work of a management command in parallel processes.
+"""
+
+import queue
+from multiprocessing import get_context
+from typing import Callable
+
+from django.db import connections
+
+
+def _run(target: Callable, index: int, messages: queue.Queue, kwargs: dict) -> None:
+    try:
+        target(**kwargs, report=lambda *args: messages.put((index, *args)))
+    finally:
+        connections.close_all()
+
+
+def run_workers(
+    target: Callable, jobs: list[dict], report: Callable[..., None]
+) -> bool:
+    """
+    Call ``target(**job, report=...)`` for every job in its own forked process, with
+    its own database connection.
+
+    The arguments the workers pass to their ``report`` are passed on to ``report`` in
+    this process, after the index of the job. Return whether all workers succeeded.
+    """
+    # the forked processes can't share the connections of this one
+    connections.close_all()
+
+    context = get_context("fork")
+    messages = context.Queue()
+    workers = [
+        context.Process(target=_run, args=(target, index, messages, job))
+        for index, job in enumerate(jobs)
+    ]
+    for worker in workers:
+        worker.start()
+
+    while any(worker.is_alive() for worker in workers):
+        try:
+            report(*messages.get(timeout=1))
+        except queue.Empty:
+            continue
+
+    for worker in workers:
+        worker.join()
+    # the messages sent just before the workers exited
+    while True:
+        try:
+            report(*messages.get_nowait())
+        except queue.Empty:
+            break
+
+    return not any(worker.exitcode for worker in workers)
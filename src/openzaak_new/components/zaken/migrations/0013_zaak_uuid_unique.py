@@ -0,0 +1,46 @@
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction, this allows building
+    # the index on a live table without blocking writes
+    atomic = False
+
+    dependencies = [
+        ("zaken", "0012_zaak_bronorganisatie_zaak_identificatie"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    sql=[
+                        # a failed concurrent build leaves an INVALID index behind
+                        'DROP INDEX CONCURRENTLY IF EXISTS "zaken_zaak_uuid_key";',
+                        'CREATE UNIQUE INDEX CONCURRENTLY "zaken_zaak_uuid_key" '
+                        'ON "zaken_zaak" ("uuid");',
+                        # only takes a brief lock, the index is already built
+                        'ALTER TABLE "zaken_zaak" ADD CONSTRAINT "zaken_zaak_uuid_key" '
+                        'UNIQUE USING INDEX "zaken_zaak_uuid_key";',
+                    ],
+                    reverse_sql=[
+                        'ALTER TABLE "zaken_zaak" DROP CONSTRAINT IF EXISTS '
+                        '"zaken_zaak_uuid_key";',
+                    ],
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name="zaak",
+                    name="uuid",
+                    field=models.UUIDField(
+                        default=uuid.uuid4,
+                        help_text="Unieke resource identifier (UUID4)",
+                        unique=True,
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction, this allows building
+    # the indexes on a live table without blocking writes
+    atomic = False
+
+    dependencies = [
+        ("zaken", "0013_zaak_uuid_unique"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="zaak",
+            index=models.Index(
+                fields=["bronorganisatie", "identificatie"],
+                name="zaken_zaak_bronorg_ident_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="zaak",
+            index=models.Index(
+                fields=["archiefnominatie", "archiefactiedatum"],
+                name="zaken_zaak_archief_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="zaak",
+            index=models.Index(
+                condition=models.Q(("_zaaktype_base_url__isnull", False)),
+                fields=["_zaaktype_base_url", "_zaaktype_relative_url"],
+                name="zaken_zaak_ext_zaaktype_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,51 @@
+import django.contrib.gis.db.models.fields
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+# the name of the spatial index created with the field in 0007, see
+# PostGISSchemaEditor._create_spatial_index_name()
+SPATIAL_INDEX_NAME = "zaken_zaak_zaakgeometrie_7e06de73_id"
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction, this allows building
+    # the index on a live table without blocking writes
+    atomic = False
+
+    dependencies = [
+        ("zaken", "0014_zaak_filter_indexes"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="zaak",
+            index=django.contrib.postgres.indexes.GistIndex(
+                condition=models.Q(("zaakgeometrie__isnull", False)),
+                fields=["zaakgeometrie"],
+                name="zaken_zaak_geometrie_gist",
+            ),
+        ),
+        # replace the implicit spatial index of the field, which also indexes all
+        # the zaken without a geometry
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    sql=f'DROP INDEX CONCURRENTLY IF EXISTS "{SPATIAL_INDEX_NAME}";',
+                    reverse_sql=(
+                        f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{SPATIAL_INDEX_NAME}" '
+                        'ON "zaken_zaak" USING GIST ("zaakgeometrie");'
+                    ),
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name="zaak",
+                    name="zaakgeometrie",
+                    field=django.contrib.gis.db.models.fields.GeometryField(
+                        blank=True, null=True, spatial_index=False, srid=4326
+                    ),
+                ),
+            ],
+        ),
+    ]
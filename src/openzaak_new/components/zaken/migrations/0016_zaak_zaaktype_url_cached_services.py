@@ -0,0 +1,27 @@
+from django.db import migrations
+
+import openzaak_new.components.zaken.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("zaken", "0015_zaak_geometrie_gist"),
+    ]
+
+    operations = [
+        # the field has no column, only its class changes
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="zaak",
+                    name="_zaaktype_url",
+                    field=openzaak_new.components.zaken.models.CachedServiceUrlField(
+                        base_field="_zaaktype_base_url",
+                        blank=True,
+                        null=True,
+                        relative_field="_zaaktype_relative_url",
+                    ),
+                ),
+            ],
+        ),
+    ]
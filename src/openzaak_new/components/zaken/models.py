@@ -1,21 +1,30 @@
 import datetime
 import uuid
 from typing import List, Optional
+from urllib.parse import urljoin
 
 from django.contrib.gis.db.models import GeometryField
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GistIndex
 from django.core import checks, exceptions
 from django.db import models
+from django.urls import NoReverseMatch
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from django_loose_fk.fields import FkOrURLField
 from relativedeltafield import RelativeDeltaField
+from rest_framework.reverse import reverse
 from vng_api_common.constants import Archiefnominatie
 from vng_api_common.descriptors import GegevensGroepType
 from vng_api_common.fields import RSINField, VertrouwelijkheidsAanduidingField
 from vng_api_common.models import APIMixin as _APIMixin
 from zgw_consumers.models import ServiceUrlField
+from zgw_consumers.models.fields import ServiceUrlDescriptor
+from zgw_consumers.models.lookups import Exact, In
+
+from openzaak_new.utils.services import service_cache
+from openzaak_new.utils.url_templates import get_url_template
 
 from .constants import BetalingsIndicatie
 
@@ -150,19 +159,113 @@ class ServiceFkField(models.ForeignKey):
         super().__init__(**kwargs)
 
 
+class CachedServiceUrlDescriptor(ServiceUrlDescriptor):
+    """
+    Compose and decompose the URL with the services from the
+    :data:`~openzaak_new.utils.services.service_cache`, instead of a query for the
+    service of every object or URL.
+    """
+
+    def get_base_val(self, detail_url: str):
+        return service_cache.get_for_url(detail_url)
+
+    def __get__(self, instance: models.Model, cls=None) -> Optional[str]:
+        if instance is None:
+            return None
+
+        base_field = instance._meta.get_field(self.field.base_field)
+        if base_field.is_cached(instance):
+            base_val = base_field.get_cached_value(instance)
+        elif (pk := getattr(instance, base_field.attname)) is not None:
+            base_val = service_cache.get(pk)
+            if base_val is None:
+                # not in the database either, let the FK raise DoesNotExist
+                base_val = getattr(instance, base_field.name)
+            base_field.set_cached_value(instance, base_val)
+        else:
+            base_val = None
+
+        relative_val = getattr(instance, self.field.relative_field)
+        return urljoin(self.get_base_url(base_val), relative_val)
+
+
+class CachedServiceUrlField(ServiceUrlField):
+    """
+    :class:`zgw_consumers.models.ServiceUrlField` that looks up the services in the
+    :data:`~openzaak_new.utils.services.service_cache`.
+    """
+
+    descriptor_class = CachedServiceUrlDescriptor
+
+
+class CachedServiceUrlLookupMixin:
+    def get_prep_lookup(self) -> list:
+        if not self.rhs_is_direct_value():
+            return super().get_prep_lookup()
+
+        target = self.lhs.target
+        values = self.rhs if self.get_db_prep_lookup_value_is_iterable else [self.rhs]
+
+        prepared_values = []
+        for value in values:
+            service = service_cache.get_for_url(value)
+            relative_value = value[len(service.api_root) :] if service else None
+            prepared_values.append(
+                [
+                    target._base_field.get_prep_value(service and service.pk),
+                    target._relative_field.get_prep_value(relative_value),
+                ]
+            )
+
+        return (
+            prepared_values
+            if self.get_db_prep_lookup_value_is_iterable
+            else prepared_values[0]
+        )
+
+
+@CachedServiceUrlField.register_lookup
+class CachedServiceUrlExact(CachedServiceUrlLookupMixin, Exact):
+    pass
+
+
+@CachedServiceUrlField.register_lookup
+class CachedServiceUrlIn(CachedServiceUrlLookupMixin, In):
+    pass
+
+
 class DurationField(RelativeDeltaField):
     def formfield(self, form_class=None, **kwargs):
         return super().formfield(form_class=form_class, **kwargs)
 
 
 class APIMixin(_APIMixin):
+    # the field that identifies the object in the URL of its detail view
+    lookup_field = "uuid"
+
     def get_absolute_api_url(self, request=None, **kwargs) -> str:
         kwargs["version"] = "1"
-        return super().get_absolute_api_url(request=request, **kwargs)
+        view_name = f"{self._meta.model_name}-detail"
+        identifier = getattr(self, self.lookup_field)
+        # the same URL as from ``reverse()``, without resolving it for every object
+        try:
+            template = get_url_template(
+                view_name, self.lookup_field, request=request, **kwargs
+            )
+        except NoReverseMatch:
+            # the URL pattern doesn't accept the placeholder, e.g. an ``int`` path
+            # converter
+            return reverse(
+                view_name,
+                kwargs={**kwargs, self.lookup_field: identifier},
+                request=request,
+            )
+        return template.format(identifier)
 
 
 class Zaak(APIMixin, models.Model):
     uuid = models.UUIDField(
+        unique=True,
         default=uuid.uuid4,
         help_text="Unieke resource identifier (UUID4)",
     )
@@ -305,6 +408,8 @@ class Zaak(APIMixin, models.Model):
     zaakgeometrie = GeometryField(
         blank=True,
         null=True,
+        # indexed by the partial GiST index in ``Meta.indexes``
+        spatial_index=False,
     )
 
     verlenging_duur = DurationField(
@@ -366,7 +471,7 @@ class Zaak(APIMixin, models.Model):
         null=True,
         help_text="Relatief deel van URL-referentie naar het extern ZAAKTYPE (in een andere Catalogi API).",
     )
-    _zaaktype_url = ServiceUrlField(
+    _zaaktype_url = CachedServiceUrlField(
         base_field="_zaaktype_base_url",
         relative_field="_zaaktype_relative_url",
         verbose_name="extern zaaktype",
@@ -400,3 +505,36 @@ class Zaak(APIMixin, models.Model):
         db_index=True,
     )
     bronorganisatie = RSINField(default="")
+
+    class Meta:
+        indexes = [
+            # ⚡ the filters of the Zaak list, see ``api.filters.ZaakFilter``. The
+            # single column filters use the ``db_index`` of their field
+            models.Index(
+                fields=["bronorganisatie", "identificatie"],
+                name="zaken_zaak_bronorg_ident_idx",
+            ),
+            models.Index(
+                fields=["archiefnominatie", "archiefactiedatum"],
+                name="zaken_zaak_archief_idx",
+            ),
+            # most zaken refer to a local zaaktype, only index the external ones
+            models.Index(
+                fields=["_zaaktype_base_url", "_zaaktype_relative_url"],
+                condition=models.Q(_zaaktype_base_url__isnull=False),
+                name="zaken_zaak_ext_zaaktype_idx",
+            ),
+            # ⚡ spatial searches, most zaken have no geometry
+            GistIndex(
+                fields=["zaakgeometrie"],
+                condition=models.Q(zaakgeometrie__isnull=False),
+                name="zaken_zaak_geometrie_gist",
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # remember the loaded hoofdzaak, since its deelzaken change when it changes
+        instance._loaded_hoofdzaak_id = instance.__dict__.get("hoofdzaak_id")
+        return instance
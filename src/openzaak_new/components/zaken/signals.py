@@ -0,0 +1,48 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_responses
+from .models import Zaak
+
+
+def _get_affected_uuids(zaak: Zaak) -> set:
+    """
+    Collect the zaak itself and its (current and previous) hoofdzaak, whose list of
+    deelzaken changes along with it.
+    """
+    uuids = {zaak.uuid}
+    hoofdzaak_ids = {zaak.hoofdzaak_id, getattr(zaak, "_loaded_hoofdzaak_id", None)}
+    hoofdzaak_ids.discard(None)
+    if not hoofdzaak_ids:
+        return uuids
+
+    if Zaak.hoofdzaak.is_cached(zaak) and zaak.hoofdzaak is not None:
+        uuids.add(zaak.hoofdzaak.uuid)
+        hoofdzaak_ids.discard(zaak.hoofdzaak_id)
+    if hoofdzaak_ids:
+        uuids.update(
+            Zaak.objects.filter(pk__in=hoofdzaak_ids).values_list("uuid", flat=True)
+        )
+    return uuids
+
+
+def _invalidate(uuids: set, using: str) -> None:
+    invalidate_responses(uuids)
+    # a request may have cached the old data under the new generation before the write
+    # committed
+    if transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(lambda: invalidate_responses(uuids), using=using)
+
+
+@receiver(post_save, sender=Zaak, dispatch_uid="zaken.invalidate_responses_on_save")
+def invalidate_responses_on_save(
+    sender, instance: Zaak, raw: bool, using: str, **kwargs
+):
+    _invalidate(_get_affected_uuids(instance), using)
+    instance._loaded_hoofdzaak_id = instance.hoofdzaak_id
+
+
+@receiver(post_delete, sender=Zaak, dispatch_uid="zaken.invalidate_responses_on_delete")
+def invalidate_responses_on_delete(sender, instance: Zaak, using: str, **kwargs):
+    _invalidate(_get_affected_uuids(instance), using)
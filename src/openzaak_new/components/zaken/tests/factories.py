@@ -0,0 +1,13 @@
+import factory
+from factory.django import DjangoModelFactory
+
+from ..models import Zaak
+
+
+class ZaakFactory(DjangoModelFactory):
+    omschrijving = factory.Faker("sentence", nb_words=4)
+    identificatie = factory.Sequence(lambda n: f"ZAAK-{n:06d}")
+    bronorganisatie = "517439943"
+
+    class Meta:
+        model = Zaak
@@ -0,0 +1,143 @@
+import json
+
+from django.test import override_settings
+from django.urls import include, path, re_path, resolve, reverse, reverse_lazy
+
+from asgiref.sync import iscoroutinefunction
+from rest_framework import status
+from rest_framework.test import APITestCase
+from vng_api_common import routers
+
+from ..api.viewsets import ZaakViewSet
+from .factories import ZaakFactory
+from .test_response_cache import LOCMEM_CACHES
+
+# the test URLconf, with the async views ``asgi.py`` enables
+with override_settings(ZAKEN_ASYNC_VIEWS=True):
+    router = routers.DefaultRouter()
+    router.register("zaken", ZaakViewSet)
+    async_urls = router.urls
+
+urlpatterns = [
+    re_path(r"^zaken/api/v(?P<version>\d+)/", include(async_urls)),
+    path("", include("openzaak_new.urls")),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncZaakViewSetTests(APITestCase):
+    list_url = reverse_lazy("zaak-list", kwargs={"version": "1"})
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.hoofdzaak = ZaakFactory.create()
+        cls.deelzaken = ZaakFactory.create_batch(3, hoofdzaak=cls.hoofdzaak)
+
+    def get_detail_url(self, zaak) -> str:
+        return reverse("zaak-detail", kwargs={"version": "1", "uuid": zaak.uuid})
+
+    def assertSameAsSync(self, url: str, params: dict):
+        response = self.client.get(url, params)
+        with override_settings(ROOT_URLCONF="openzaak_new.urls"):
+            expected = self.client.get(url, params)
+
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.json(), expected.json())
+        self.assertEqual(response.get("ETag"), expected.get("ETag"))
+
+    def test_views(self):
+        list_view = resolve(str(self.list_url)).func
+        detail_view = resolve(self.get_detail_url(self.hoofdzaak)).func
+
+        self.assertTrue(iscoroutinefunction(list_view))
+        self.assertTrue(iscoroutinefunction(detail_view))
+        self.assertEqual(list_view.actions, {"get": "list", "post": "create"})
+        self.assertIs(detail_view.cls, ZaakViewSet)
+        # the sync view is kept, unless the async views are enabled
+        self.assertFalse(iscoroutinefunction(ZaakViewSet.as_view({"get": "list"})))
+
+    def test_list_is_the_same_as_sync(self):
+        for params in (
+            {},
+            {"pageSize": 2, "page": 2},
+            {"cursor": "", "pageSize": 2},
+            {"countStrategy": "exact"},
+            {"expand": "zaakgeometrie"},
+            {"fields": "url,identificatie"},
+            {"bronorganisatie": self.hoofdzaak.bronorganisatie},
+            {"page": 10},
+        ):
+            for values_list in (True, False):
+                with (
+                    self.subTest(params=params, values_list=values_list),
+                    override_settings(ZAKEN_VALUES_LIST_ENABLED=values_list),
+                ):
+                    self.assertSameAsSync(self.list_url, params)
+
+    def test_retrieve_is_the_same_as_sync(self):
+        for zaak in (self.hoofdzaak, self.deelzaken[0]):
+            with self.subTest(zaak=zaak):
+                self.assertSameAsSync(self.get_detail_url(zaak), {})
+
+    def test_retrieve_unknown_zaak(self):
+        url = reverse(
+            "zaak-detail",
+            kwargs={"version": "1", "uuid": "00000000-0000-0000-0000-000000000000"},
+        )
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_invalid_query_parameter(self):
+        response = self.client.get(self.list_url, {"fields": "onbekend"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_head(self):
+        response = self.client.head(self.get_detail_url(self.hoofdzaak))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_writes_use_the_sync_view(self):
+        zaak = ZaakFactory.create()
+
+        response = self.client.delete(self.get_detail_url(zaak))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        response = self.client.get(self.get_detail_url(zaak))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_streamed_list(self):
+        params = {"pageSize": 3, "cursor": ""}
+
+        response = await self.async_client.get(
+            self.list_url, {**params, "stream": "true"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # an async iterator, which the ASGI handler streams chunk by chunk
+        self.assertTrue(response.is_async)
+        data = json.loads(
+            b"".join([chunk async for chunk in response.streaming_content])
+        )
+
+        regular = await self.async_client.get(self.list_url, params)
+        self.assertEqual(data, regular.json())
+        self.assertEqual(response["X-Count-Exact"], regular["X-Count-Exact"])
+
+    @override_settings(CACHES=LOCMEM_CACHES, ZAKEN_RESPONSE_CACHE_ENABLED=True)
+    async def test_response_cache(self):
+        url = self.get_detail_url(self.hoofdzaak)
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            cached = await self.async_client.get(url)
+            not_modified = await self.async_client.get(
+                url, headers={"If-None-Match": response["ETag"]}
+            )
+
+        self.assertEqual(cached.json(), response.json())
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
@@ -0,0 +1,56 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..benchmarks import generated_zaken
+from ..models import Zaak
+from .factories import ZaakFactory
+
+MICROBENCHMARKS = (
+    "serializer",
+    "queryset",
+    "paginator_count",
+    "gegevensgroep",
+    "absolute_url",
+)
+
+
+class MicrobenchmarkTests(TestCase):
+    def test_run_with_history(self):
+        with tempfile.TemporaryDirectory() as directory:
+            history = Path(directory) / "history.json"
+
+            for _ in range(2):
+                stdout = StringIO()
+                call_command(
+                    "benchmark",
+                    *MICROBENCHMARKS,
+                    "--iterations",
+                    "1",
+                    "--history",
+                    str(history),
+                    stdout=stdout,
+                )
+
+            runs = json.loads(history.read_text())
+
+        self.assertEqual(len(runs), 2)
+        self.assertEqual(set(runs[-1]["results"]), set(MICROBENCHMARKS))
+        self.assertIn("median", runs[-1]["results"]["serializer"]["values rows"])
+        # the second run is compared with the first
+        self.assertIn("previous", stdout.getvalue())
+        # the generated zaken are rolled back
+        self.assertFalse(Zaak.objects.exists())
+
+    def test_generated_zaken_only(self):
+        existing = ZaakFactory.create()
+
+        with generated_zaken(10) as zaken:
+            self.assertEqual(zaken.count(), 10)
+            self.assertNotIn(existing, zaken)
+
+        self.assertEqual(list(Zaak.objects.all()), [existing])
@@ -0,0 +1,97 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from ..dataset import generate_zaken
+from ..models import Zaak
+from .factories import ZaakFactory
+from .test_response_cache import LOCMEM_CACHES
+
+FIELDS = ("uuid", "identificatie", "omschrijving", "startdatum", "zaakgeometrie")
+
+
+def bulk_create(*args):
+    call_command("bulk_create", *args, stdout=StringIO(), verbosity=0)
+
+
+def get_dataset() -> list[tuple]:
+    return list(Zaak.objects.order_by("identificatie").values_list(*FIELDS))
+
+
+class BulkCreateTests(TestCase):
+    def test_create(self):
+        existing = ZaakFactory.create()
+
+        bulk_create("--count", "25", "--batch-size", "10", "--seed", "1")
+
+        self.assertEqual(Zaak.objects.count(), 26)
+        self.assertEqual(
+            list(
+                Zaak.objects.exclude(pk=existing.pk)
+                .order_by("pk")
+                .values_list("identificatie", flat=True)
+            ),
+            # numbered by the primary key, after the existing zaken
+            [f"ZAAK-{existing.pk + index:010}" for index in range(1, 26)],
+        )
+        # the sequence continues after the created zaken
+        self.assertGreater(ZaakFactory.create().pk, existing.pk + 25)
+
+    def test_seed_is_reproducible(self):
+        bulk_create("--count", "25", "--batch-size", "10", "--seed", "1")
+        first = get_dataset()
+        Zaak.objects.all().delete()
+
+        bulk_create("--count", "25", "--batch-size", "10", "--seed", "1")
+        self.assertEqual(get_dataset(), first)
+        Zaak.objects.all().delete()
+
+        bulk_create("--count", "25", "--batch-size", "10", "--seed", "2")
+        self.assertNotEqual(get_dataset(), first)
+
+    def test_same_seed_again(self):
+        bulk_create("--count", "5", "--seed", "1")
+
+        with self.assertRaisesMessage(CommandError, "--seed"):
+            bulk_create("--count", "5", "--seed", "1")
+        self.assertEqual(Zaak.objects.count(), 5)
+
+        bulk_create("--count", "5", "--seed", "2")
+        self.assertEqual(Zaak.objects.values("identificatie").distinct().count(), 10)
+
+    @override_settings(CACHES=LOCMEM_CACHES, ZAKEN_RESPONSE_CACHE_ENABLED=True)
+    def test_invalidates_cached_lists(self):
+        list_url = reverse("zaak-list", kwargs={"version": "1"})
+        self.client.get(list_url)
+
+        bulk_create("--count", "5", "--seed", "1")
+
+        self.assertEqual(self.client.get(list_url).json()["count"], 5)
+
+    def test_realistic_values(self):
+        zaken = generate_zaken(seed=1, number=0, size=100, first_pk=1)
+
+        for zaak in zaken:
+            with self.subTest(zaak=zaak.identificatie):
+                zaak.full_clean(exclude=["hoofdzaak", "_zaaktype", "uuid"])
+                self.assertLessEqual(zaak.startdatum, zaak.einddatum_gepland)
+                self.assertEqual(zaak.einddatum is None, zaak.archiefnominatie is None)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(CommandError):
+            bulk_create("--count", "0")
+
+
+class BulkCreateWorkersTests(TransactionTestCase):
+    def test_workers_create_the_same_dataset(self):
+        bulk_create("--count", "25", "--batch-size", "4", "--seed", "1")
+        single = get_dataset()
+        Zaak.objects.all().delete()
+
+        bulk_create(
+            "--count", "25", "--batch-size", "4", "--seed", "1", "--workers", "3"
+        )
+
+        self.assertEqual(get_dataset(), single)
@@ -0,0 +1,114 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from ..models import Zaak
+from .factories import ZaakFactory
+from .test_response_cache import LOCMEM_CACHES
+
+
+class BulkUpdateMixin:
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.state_file = os.path.join(directory.name, "state.json")
+
+    def bulk_update(self, *args):
+        call_command(
+            "bulk_update",
+            "--field",
+            "toelichting",
+            "--state-file",
+            self.state_file,
+            *args,
+            stdout=StringIO(),
+            verbosity=0,
+        )
+
+
+class BulkUpdateTests(BulkUpdateMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        ZaakFactory.create_batch(25, toelichting="")
+
+    def test_update_in_chunks(self):
+        for method in ("values", "copy"):
+            with self.subTest(method=method):
+                Zaak.objects.update(toelichting="")
+
+                self.bulk_update("--method", method, "--batch-size", "10")
+
+                self.assertFalse(Zaak.objects.filter(toelichting="").exists())
+                self.assertEqual(
+                    Zaak.objects.values("toelichting").distinct().count(), 25
+                )
+                self.assertFalse(os.path.exists(self.state_file))
+
+    def test_resume(self):
+        pks = list(Zaak.objects.order_by("pk").values_list("pk", flat=True))
+        # interrupted after the first 10 zaken
+        with open(self.state_file, "w") as file:
+            json.dump({"field": "toelichting", "ranges": [[pks[9], pks[-1]]]}, file)
+
+        self.bulk_update("--resume")
+
+        self.assertEqual(
+            list(
+                Zaak.objects.filter(toelichting="")
+                .order_by("pk")
+                .values_list("pk", flat=True)
+            ),
+            pks[:10],
+        )
+
+    @override_settings(CACHES=LOCMEM_CACHES, ZAKEN_RESPONSE_CACHE_ENABLED=True)
+    def test_invalidates_cached_responses(self):
+        zaak = Zaak.objects.order_by("pk").first()
+        list_url = reverse("zaak-list", kwargs={"version": "1"})
+        detail_url = reverse("zaak-detail", kwargs={"version": "1", "uuid": zaak.uuid})
+        self.client.get(list_url)
+        self.client.get(detail_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bulk_update("--batch-size", "10")
+
+        zaak.refresh_from_db()
+        self.assertEqual(
+            self.client.get(detail_url).json()["toelichting"], zaak.toelichting
+        )
+        self.assertNotIn(
+            "",
+            [
+                result["toelichting"]
+                for result in self.client.get(list_url).json()["results"]
+            ],
+        )
+
+    def test_resume_other_field(self):
+        with open(self.state_file, "w") as file:
+            json.dump({"field": "omschrijving", "ranges": [[0, 1]]}, file)
+
+        with self.assertRaises(CommandError):
+            self.bulk_update("--resume")
+
+    def test_invalid_field(self):
+        for field in ("onbekend", "startdatum"):
+            with self.subTest(field=field), self.assertRaises(CommandError):
+                call_command("bulk_update", "--field", field, stdout=StringIO())
+
+
+class BulkUpdateWorkersTests(BulkUpdateMixin, TransactionTestCase):
+    def test_workers(self):
+        ZaakFactory.create_batch(25, toelichting="")
+
+        self.bulk_update("--workers", "3", "--batch-size", "4")
+
+        self.assertFalse(Zaak.objects.filter(toelichting="").exists())
+        self.assertFalse(os.path.exists(self.state_file))
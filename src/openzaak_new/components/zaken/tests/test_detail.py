@@ -0,0 +1,102 @@
+from django.db import IntegrityError, connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..models import Zaak
+from .factories import ZaakFactory
+
+
+class ZaakUUIDTests(TestCase):
+    def test_uuid_has_unique_index(self):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, Zaak._meta.db_table
+            )
+
+        self.assertTrue(
+            any(
+                constraint["columns"] == ["uuid"] and constraint["unique"]
+                for constraint in constraints.values()
+            )
+        )
+
+    def test_uuid_is_unique(self):
+        zaak = ZaakFactory.create()
+
+        with self.assertRaises(IntegrityError):
+            ZaakFactory.create(uuid=zaak.uuid)
+
+
+class ZaakRetrieveTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.hoofdzaak = ZaakFactory.create(toelichting="lange toelichting")
+        cls.deelzaak = ZaakFactory.create(hoofdzaak=cls.hoofdzaak)
+
+    def test_retrieve(self):
+        url = reverse(
+            "zaak-detail", kwargs={"version": "1", "uuid": self.deelzaak.uuid}
+        )
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data["omschrijving"], self.deelzaak.omschrijving)
+        hoofdzaak_path = reverse(
+            "zaak-detail", kwargs={"version": "1", "uuid": self.hoofdzaak.uuid}
+        )
+        self.assertEqual(data["hoofdzaak"], f"http://testserver{hoofdzaak_path}")
+        self.assertEqual(data["deelzaken"], [])
+
+    def test_retrieve_fetches_only_hoofdzaak_uuid(self):
+        url = reverse(
+            "zaak-detail", kwargs={"version": "1", "uuid": self.deelzaak.uuid}
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        zaak_query = next(
+            query["sql"]
+            for query in context.captured_queries
+            if "LEFT OUTER JOIN" in query["sql"]
+        )
+        self.assertIn('T2."uuid"', zaak_query)
+        self.assertNotIn('T2."toelichting"', zaak_query)
+        self.assertNotIn('"zaken_zaak"."_zaaktype_relative_url"', zaak_query)
+
+    def test_retrieve_aggregates_deelzaken(self):
+        deelzaken = [
+            self.deelzaak,
+            *ZaakFactory.create_batch(3, hoofdzaak=self.hoofdzaak),
+        ]
+        url = reverse(
+            "zaak-detail", kwargs={"version": "1", "uuid": self.hoofdzaak.uuid}
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["deelzaken"],
+            [
+                "http://testserver"
+                + reverse("zaak-detail", kwargs={"version": "1", "uuid": deelzaak.uuid})
+                for deelzaak in deelzaken
+            ],
+        )
+        # the UUIDs are selected in the zaak query, the deelzaken aren't prefetched
+        self.assertFalse(
+            any(
+                '"zaken_zaak"."hoofdzaak_id" IN' in query["sql"]
+                for query in context.captured_queries
+            )
+        )
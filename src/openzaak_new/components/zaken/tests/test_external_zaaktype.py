@@ -0,0 +1,210 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse_lazy
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+from zgw_consumers.constants import APITypes
+from zgw_consumers.models import Service
+from zgw_consumers.test.factories import ServiceFactory
+
+from openzaak_new.utils.services import service_cache
+
+from ..models import Zaak
+from .factories import ZaakFactory
+from .test_filters import CATALOGI_ROOT
+
+OTHER_CATALOGI_ROOT = f"{CATALOGI_ROOT}andere/"
+
+
+def has_service_queries(context: CaptureQueriesContext) -> bool:
+    return any(
+        '"zgw_consumers_service"' in query["sql"] for query in context.captured_queries
+    )
+
+
+class ServiceCacheTestMixin:
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.service = ServiceFactory.create(
+            api_root=CATALOGI_ROOT, api_type=APITypes.ztc
+        )
+        cls.other_service = ServiceFactory.create(
+            api_root=OTHER_CATALOGI_ROOT, api_type=APITypes.ztc
+        )
+
+    def setUp(self):
+        super().setUp()
+        service_cache.clear()
+        self.addCleanup(service_cache.clear)
+
+
+class ZaaktypeUrlTests(ServiceCacheTestMixin, TestCase):
+    def test_compose_without_queries(self):
+        ZaakFactory.create(
+            _zaaktype_base_url=self.service, _zaaktype_relative_url="zaaktypen/1"
+        )
+        ZaakFactory.create(
+            _zaaktype_base_url=self.other_service, _zaaktype_relative_url="zaaktypen/2"
+        )
+        ZaakFactory.create()
+        zaken = list(Zaak.objects.order_by("pk"))
+        service_cache.get(self.service.pk)
+
+        with self.assertNumQueries(0):
+            urls = [zaak._zaaktype_url for zaak in zaken]
+
+        self.assertEqual(
+            urls,
+            [
+                f"{CATALOGI_ROOT}zaaktypen/1",
+                f"{OTHER_CATALOGI_ROOT}zaaktypen/2",
+                None,
+            ],
+        )
+        # the service is set on the FK as well
+        with self.assertNumQueries(0):
+            self.assertEqual(zaken[0]._zaaktype_base_url, self.service)
+
+    def test_decompose_without_queries(self):
+        zaak = Zaak()
+        service_cache.get(self.service.pk)
+
+        with self.assertNumQueries(0):
+            zaak._zaaktype_url = f"{OTHER_CATALOGI_ROOT}zaaktypen/1"
+
+        # the most specific API root
+        self.assertEqual(zaak._zaaktype_base_url, self.other_service)
+        self.assertEqual(zaak._zaaktype_relative_url, "zaaktypen/1")
+
+    def test_decompose_unknown_service(self):
+        zaak = Zaak()
+
+        with self.assertRaises(ValueError):
+            zaak._zaaktype_url = "https://unknown.example.com/zaaktypen/1"
+
+    def test_lookups(self):
+        zaak_1 = ZaakFactory.create(
+            _zaaktype_base_url=self.service, _zaaktype_relative_url="zaaktypen/1"
+        )
+        zaak_2 = ZaakFactory.create(
+            _zaaktype_base_url=self.other_service, _zaaktype_relative_url="zaaktypen/2"
+        )
+        service_cache.get(self.service.pk)
+
+        with CaptureQueriesContext(connection) as context:
+            exact = list(
+                Zaak.objects.filter(_zaaktype_url=f"{CATALOGI_ROOT}zaaktypen/1")
+            )
+            in_ = list(
+                Zaak.objects.filter(
+                    _zaaktype_url__in=[
+                        f"{CATALOGI_ROOT}zaaktypen/1",
+                        f"{OTHER_CATALOGI_ROOT}zaaktypen/2",
+                    ]
+                ).order_by("pk")
+            )
+
+        self.assertEqual(exact, [zaak_1])
+        self.assertEqual(in_, [zaak_1, zaak_2])
+        self.assertFalse(has_service_queries(context))
+
+    def test_lookup_unknown_service(self):
+        zaak = ZaakFactory.create(
+            _zaaktype_base_url=self.service, _zaaktype_relative_url="zaaktypen/1"
+        )
+        service_cache.get(self.service.pk)
+
+        with CaptureQueriesContext(connection) as context:
+            in_ = list(
+                Zaak.objects.filter(
+                    _zaaktype_url__in=[
+                        f"{CATALOGI_ROOT}zaaktypen/1",
+                        "https://unknown.example.com/zaaktypen/2",
+                    ]
+                )
+            )
+
+        self.assertEqual(in_, [zaak])
+        # the services are read again, it may have been created by another process
+        self.assertTrue(has_service_queries(context))
+
+    def create_service_elsewhere(self, api_root: str) -> Service:
+        service_cache.get(self.service.pk)
+        # without the signals that clear the cache of this process
+        (service,) = Service.objects.bulk_create(
+            [ServiceFactory.build(api_root=api_root, api_type=APITypes.ztc)]
+        )
+        return service
+
+    def test_service_created_by_another_process(self):
+        with self.subTest("get"):
+            service = self.create_service_elsewhere("https://get.example.org/")
+
+            self.assertEqual(service_cache.get(service.pk), service)
+
+        with self.subTest("compose"):
+            service = self.create_service_elsewhere("https://compose.example.org/")
+            zaak = ZaakFactory.create(
+                _zaaktype_base_url=service, _zaaktype_relative_url="zaaktypen/1"
+            )
+
+            zaak = Zaak.objects.get(pk=zaak.pk)
+
+            self.assertEqual(
+                zaak._zaaktype_url, "https://compose.example.org/zaaktypen/1"
+            )
+
+        with self.subTest("decompose"):
+            service = self.create_service_elsewhere("https://decompose.example.org/")
+            zaak = Zaak()
+
+            zaak._zaaktype_url = "https://decompose.example.org/zaaktypen/1"
+
+            self.assertEqual(zaak._zaaktype_base_url, service)
+
+        with self.subTest("lookup"):
+            service = self.create_service_elsewhere("https://lookup.example.org/")
+            zaak = ZaakFactory.create(
+                _zaaktype_base_url=service, _zaaktype_relative_url="zaaktypen/1"
+            )
+
+            zaken = Zaak.objects.filter(
+                _zaaktype_url="https://lookup.example.org/zaaktypen/1"
+            )
+
+            self.assertEqual(list(zaken), [zaak])
+
+
+class ZaakListServiceQueriesTests(ServiceCacheTestMixin, APITestCase):
+    list_url = reverse_lazy("zaak-list", kwargs={"version": "1"})
+
+    def test_warm_list_filtered_on_external_zaaktype(self):
+        zaak = ZaakFactory.create(
+            _zaaktype_base_url=self.service, _zaaktype_relative_url="zaaktypen/1"
+        )
+        ZaakFactory.create(
+            _zaaktype_base_url=self.other_service, _zaaktype_relative_url="zaaktypen/1"
+        )
+        params = {"zaaktype": f"{CATALOGI_ROOT}zaaktypen/1"}
+        self.client.get(self.list_url, params)
+
+        for values_list in (True, False):
+            with self.subTest(values_list=values_list):
+                with (
+                    override_settings(ZAKEN_VALUES_LIST_ENABLED=values_list),
+                    CaptureQueriesContext(connection) as context,
+                ):
+                    response = self.client.get(self.list_url, params)
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(
+                    [
+                        result["url"].rsplit("/", 1)[-1]
+                        for result in response.json()["results"]
+                    ],
+                    [str(zaak.uuid)],
+                )
+                self.assertFalse(has_service_queries(context))
@@ -0,0 +1,326 @@
+import datetime
+import json
+from io import StringIO
+from itertools import combinations, product
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse, reverse_lazy
+
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, APITestCase
+from vng_api_common.constants import Archiefnominatie
+from zgw_consumers.constants import APITypes
+from zgw_consumers.test.factories import ServiceFactory
+
+from openzaak_new.components.catalogi.models import ZaakType
+
+from ..api.viewsets import ZaakViewSet
+from ..models import Zaak
+from .factories import ZaakFactory
+
+CATALOGI_ROOT = "https://catalogi.example.com/api/v1/"
+
+
+def get_zaaktype_url(zaaktype: ZaakType) -> str:
+    path = reverse("zaaktype-detail", kwargs={"version": "1", "uuid": zaaktype.uuid})
+    return f"http://testserver{path}"
+
+
+class ZaakFilterTests(APITestCase):
+    url = reverse_lazy("zaak-list", kwargs={"version": "1"})
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.zaaktype = ZaakType.objects.create()
+        service = ServiceFactory.create(api_root=CATALOGI_ROOT, api_type=APITypes.ztc)
+
+        cls.zaak_1 = ZaakFactory.create(
+            identificatie="ZAAK-1",
+            bronorganisatie="517439943",
+            startdatum=datetime.date(2024, 1, 1),
+            archiefnominatie=Archiefnominatie.blijvend_bewaren,
+            archiefactiedatum=datetime.date(2030, 1, 1),
+            _zaaktype=cls.zaaktype,
+        )
+        cls.zaak_2 = ZaakFactory.create(
+            identificatie="ZAAK-2",
+            bronorganisatie="111222333",
+            startdatum=datetime.date(2025, 1, 1),
+            archiefnominatie=Archiefnominatie.vernietigen,
+            archiefactiedatum=None,
+            _zaaktype_base_url=service,
+            _zaaktype_relative_url="zaaktypen/extern",
+        )
+
+    def assertFiltered(self, params: dict, expected: list[Zaak]):
+        response = self.client.get(self.url, params)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.json())
+        self.assertEqual(
+            {zaak["url"].rsplit("/", 1)[-1] for zaak in response.json()["results"]},
+            {str(zaak.uuid) for zaak in expected},
+        )
+
+    def test_filters(self):
+        for params, expected in (
+            ({"identificatie": "ZAAK-1"}, [self.zaak_1]),
+            ({"bronorganisatie": "111222333"}, [self.zaak_2]),
+            (
+                {"bronorganisatie__in": "517439943,111222333"},
+                [self.zaak_1, self.zaak_2],
+            ),
+            ({"startdatum__gte": "2024-06-01"}, [self.zaak_2]),
+            (
+                {"startdatum__gt": "2023-12-31", "startdatum__lt": "2024-06-01"},
+                [self.zaak_1],
+            ),
+            ({"archiefnominatie": Archiefnominatie.vernietigen}, [self.zaak_2]),
+            ({"archiefactiedatum__lte": "2030-01-01"}, [self.zaak_1]),
+            ({"archiefactiedatum__isnull": "true"}, [self.zaak_2]),
+            ({"zaaktype": get_zaaktype_url(self.zaaktype)}, [self.zaak_1]),
+            ({"zaaktype": f"{CATALOGI_ROOT}zaaktypen/extern"}, [self.zaak_2]),
+            ({"zaaktype": f"{CATALOGI_ROOT}zaaktypen/other"}, []),
+            (
+                {"bronorganisatie": "517439943", "identificatie": "ZAAK-2"},
+                [],
+            ),
+        ):
+            with self.subTest(params=params):
+                self.assertFiltered(params, expected)
+
+    def test_filters_with_values_rows_and_streaming(self):
+        params = {"bronorganisatie": "111222333"}
+
+        with override_settings(ZAKEN_VALUES_LIST_ENABLED=False):
+            self.assertFiltered(params, [self.zaak_2])
+
+        response = self.client.get(self.url, {**params, "stream": "true"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(
+            str(self.zaak_2.uuid).encode(), b"".join(response.streaming_content)
+        )
+
+    def test_invalid_filter_value(self):
+        response = self.client.get(self.url, {"bronorganisatie": "123456789"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+# the columns of the indexes
+IDENTIFICATIE = ("identificatie",)
+BRONORGANISATIE_IDENTIFICATIE = ("bronorganisatie", "identificatie")
+STARTDATUM = ("startdatum",)
+ARCHIEFNOMINATIE = ("archiefnominatie",)
+ARCHIEFACTIEDATUM = ("archiefactiedatum",)
+ARCHIEFNOMINATIE_ARCHIEFACTIEDATUM = ("archiefnominatie", "archiefactiedatum")
+ZAAKTYPE = ("_zaaktype_id",)
+EXTERNAL_ZAAKTYPE_SERVICE = ("_zaaktype_base_url_id",)
+EXTERNAL_ZAAKTYPE = ("_zaaktype_base_url_id", "_zaaktype_relative_url")
+
+# valid RSINs that the generated zaken don't have
+RSIN = "100000009"
+OTHER_RSIN = "100000022"
+
+
+def get_list_indexes(plan: dict) -> set[str]:
+    """
+    Return the indexes the zaken of the list are read with in the ``plan``, or
+    ``Seq Scan``. The joined zaken (hoofdzaak, deelzaken) have an alias and are
+    left out.
+    """
+    if plan.get("Relation Name") == plan.get("Alias") == Zaak._meta.db_table:
+        if plan["Node Type"] == "Seq Scan":
+            return {"Seq Scan"}
+        # a bitmap heap scan reads the bitmaps of one or more index scans, the
+        # subqueries of the selected columns (deelzaken) are left out
+        nodes, names = [plan], set()
+        while nodes:
+            node = nodes.pop()
+            if "Index Name" in node:
+                names.add(node["Index Name"])
+            nodes.extend(
+                child
+                for child in node.get("Plans", [])
+                if child.get("Parent Relationship") not in ("SubPlan", "InitPlan")
+            )
+        return names
+
+    return set().union(*(get_list_indexes(child) for child in plan.get("Plans", [])))
+
+
+class ZaakFilterIndexTests(TestCase):
+    """
+    The first page of the Zaak list, for every filter and every combination of
+    them, must be read with the indexes of the filters, instead of a sequential
+    scan or a walk over the primary key in the order of the list.
+    """
+
+    url = reverse_lazy("zaak-list", kwargs={"version": "1"})
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.zaaktype = ZaakType.objects.create()
+        ServiceFactory.create(api_root=CATALOGI_ROOT, api_type=APITypes.ztc)
+
+        # enough zaken for the planner to prefer the indexes over the primary key,
+        # none of them match the filters below
+        call_command(
+            "generate_dataset", "--zaken", "10000", "--zaaktypen", "10",
+            "--hoofdzaken", "0", "--deelzaken", "0",
+            stdout=StringIO(), verbosity=0,
+        )  # fmt: skip
+        Zaak.objects.update(
+            archiefnominatie=None, archiefactiedatum=datetime.date(2026, 1, 1)
+        )
+        cls.analyze()
+
+    @staticmethod
+    def analyze() -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Zaak._meta.db_table}")
+
+    @classmethod
+    def get_index_names(cls, *columns: tuple[str, ...]) -> set[str]:
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, Zaak._meta.db_table
+            )
+        return {
+            name
+            for name, constraint in constraints.items()
+            if constraint["index"] and tuple(constraint["columns"]) in columns
+        }
+
+    def get_filter_groups(self) -> list[list[tuple[dict, set[tuple[str, ...]]]]]:
+        """
+        The variants of every filter, with the indexes that answer them. The
+        variants of one filter are never combined.
+        """
+        archiefnominatie = {ARCHIEFNOMINATIE, ARCHIEFNOMINATIE_ARCHIEFACTIEDATUM}
+        archiefactiedatum = {ARCHIEFACTIEDATUM, ARCHIEFNOMINATIE_ARCHIEFACTIEDATUM}
+        return [
+            [
+                (
+                    {"identificatie": "ZAAK-TEST"},
+                    {IDENTIFICATIE, BRONORGANISATIE_IDENTIFICATIE},
+                )
+            ],
+            [
+                ({"bronorganisatie": RSIN}, {BRONORGANISATIE_IDENTIFICATIE}),
+                (
+                    {"bronorganisatie__in": f"{RSIN},{OTHER_RSIN}"},
+                    {BRONORGANISATIE_IDENTIFICATIE},
+                ),
+            ],
+            [
+                ({"startdatum": "2030-01-01"}, {STARTDATUM}),
+                (
+                    {"startdatum__gte": "2030-01-01", "startdatum__lt": "2031-01-01"},
+                    {STARTDATUM},
+                ),
+            ],
+            [
+                ({"archiefnominatie": Archiefnominatie.vernietigen}, archiefnominatie),
+                (
+                    {"archiefnominatie__in": "vernietigen,blijvend_bewaren"},
+                    archiefnominatie,
+                ),
+            ],
+            [
+                ({"archiefactiedatum__gt": "2040-01-01"}, archiefactiedatum),
+                (
+                    {
+                        "archiefactiedatum__gte": "2040-01-01",
+                        "archiefactiedatum__lte": "2041-01-01",
+                    },
+                    archiefactiedatum,
+                ),
+                ({"archiefactiedatum__isnull": "true"}, archiefactiedatum),
+            ],
+            [
+                ({"zaaktype": get_zaaktype_url(self.zaaktype)}, {ZAAKTYPE}),
+                (
+                    {"zaaktype": f"{CATALOGI_ROOT}zaaktypen/extern"},
+                    # the partial index, or the index of the FK to the service
+                    {EXTERNAL_ZAAKTYPE, EXTERNAL_ZAAKTYPE_SERVICE},
+                ),
+            ],
+        ]
+
+    def get_filter_combinations(self):
+        groups = self.get_filter_groups()
+        for size in range(1, len(groups) + 1):
+            for selected in combinations(groups, size):
+                for variants in product(*selected):
+                    yield (
+                        {
+                            key: value
+                            for params, _ in variants
+                            for key, value in params.items()
+                        },
+                        set().union(*(indexes for _, indexes in variants)),
+                    )
+
+    def get_plan(self, params: dict) -> dict:
+        """
+        EXPLAIN the query of the first page of the list, built by ``ZaakViewSet``
+        with its ordering.
+        """
+        view = ZaakViewSet(
+            action_map={"get": "list"},
+            args=(),
+            kwargs={"version": "1"},
+            format_kwarg=None,
+        )
+        view.request = view.initialize_request(
+            APIRequestFactory().get(self.url, params)
+        )
+        view.initial(view.request, version="1")
+        queryset = view.filter_queryset(view.get_queryset())
+        page = queryset[: view.paginator.get_page_size(view.request)]
+        return json.loads(page.explain(format="json"))["Plan"]
+
+    def test_filters_use_their_indexes(self):
+        for params, columns in self.get_filter_combinations():
+            with self.subTest(params=params):
+                indexes = get_list_indexes(self.get_plan(params))
+
+                self.assertTrue(indexes)
+                self.assertLessEqual(indexes, self.get_index_names(*columns))
+
+    def test_combined_filters_use_the_composite_indexes(self):
+        zaken = Zaak.objects.order_by("pk")
+        # the values are common, only their combination is selective
+        zaken.filter(pk__in=zaken.values("pk")[:1000]).update(
+            identificatie="ZAAK-GEDEELD"
+        )
+        zaken.filter(pk__in=zaken.values("pk")[1000:1500]).update(
+            archiefnominatie=Archiefnominatie.vernietigen
+        )
+        zaken.filter(pk__in=zaken.values("pk")[1500:2000]).update(
+            archiefactiedatum=datetime.date(2027, 1, 1)
+        )
+        self.analyze()
+
+        for params, columns in (
+            (
+                {"bronorganisatie": RSIN, "identificatie": "ZAAK-GEDEELD"},
+                BRONORGANISATIE_IDENTIFICATIE,
+            ),
+            (
+                {
+                    "archiefnominatie": Archiefnominatie.vernietigen,
+                    "archiefactiedatum__gte": "2027-01-01",
+                    "archiefactiedatum__lte": "2027-12-31",
+                },
+                ARCHIEFNOMINATIE_ARCHIEFACTIEDATUM,
+            ),
+        ):
+            with self.subTest(params=params):
+                indexes = get_list_indexes(self.get_plan(params))
+
+                self.assertEqual(indexes, self.get_index_names(columns))
@@ -0,0 +1,147 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db.models import Count
+from django.test import TestCase
+
+from openzaak_new.components.catalogi.models import ZaakType
+
+from ..dataset import get_generated_uuid
+from ..models import Zaak
+from .factories import ZaakFactory
+from .test_load_zaken import get_index_names
+
+
+def generate_dataset(*args):
+    call_command("generate_dataset", *args, stdout=StringIO(), verbosity=0)
+
+
+def get_dataset() -> list[tuple]:
+    return list(
+        Zaak.objects.order_by("pk").values_list(
+            "pk",
+            "uuid",
+            "identificatie",
+            "omschrijving",
+            "startdatum",
+            "einddatum",
+            "zaakgeometrie",
+            "hoofdzaak__identificatie",
+            "_zaaktype__identificatie",
+        )
+    )
+
+
+class GenerateDatasetTests(TestCase):
+    def test_sizes(self):
+        generate_dataset(
+            "--zaken", "200", "--zaaktypen", "5", "--hoofdzaken", "10",
+            "--deelzaken", "40", "--batch-size", "64",
+        )  # fmt: skip
+
+        self.assertEqual(Zaak.objects.count(), 200)
+        self.assertEqual(ZaakType.objects.count(), 5)
+        self.assertFalse(Zaak.objects.filter(_zaaktype__isnull=True).exists())
+
+        deelzaken = Zaak.objects.filter(hoofdzaak__isnull=False)
+        self.assertEqual(deelzaken.count(), 40)
+        self.assertTrue(
+            set(deelzaken.values_list("hoofdzaak__identificatie", flat=True))
+            <= {f"ZAAK-{i:010}" for i in range(1, 11)}
+        )
+        # deelzaken aren't hoofdzaken themselves
+        self.assertFalse(deelzaken.filter(deelzaken__isnull=False).exists())
+
+    def test_seed_is_reproducible(self):
+        args = (
+            "--zaken", "50", "--zaaktypen", "3", "--hoofdzaken", "5",
+            "--deelzaken", "10", "--clear",
+        )  # fmt: skip
+
+        generate_dataset(*args, "--seed", "1")
+        first = get_dataset()
+        # the chunks don't change the data
+        generate_dataset(*args, "--seed", "1", "--batch-size", "7")
+        self.assertEqual(get_dataset(), first)
+
+        generate_dataset(*args, "--seed", "2")
+        self.assertNotEqual(get_dataset(), first)
+
+    def test_skew(self):
+        generate_dataset(
+            "--zaken", "1000", "--zaaktypen", "10", "--hoofdzaken", "0",
+            "--deelzaken", "0", "--zaaktype-skew", "3",
+        )  # fmt: skip
+
+        counts = dict(
+            ZaakType.objects.annotate(zaken=Count("zaak")).values_list(
+                "identificatie", "zaken"
+            )
+        )
+        self.assertGreater(counts["ZKT-0001"], counts["ZKT-0010"] * 3)
+
+    def test_after_existing_zaken(self):
+        existing = ZaakFactory.create()
+
+        generate_dataset("--zaken", "10", "--hoofdzaken", "0", "--deelzaken", "0")
+
+        self.assertEqual(Zaak.objects.count(), 11)
+        self.assertGreater(ZaakFactory.create().pk, existing.pk + 10)
+
+    def test_same_seed_again(self):
+        args = (
+            "--zaken", "10", "--zaaktypen", "2", "--hoofdzaken", "0",
+            "--deelzaken", "0",
+        )  # fmt: skip
+        generate_dataset(*args)
+        dataset = get_dataset()
+
+        with self.assertRaisesMessage(CommandError, "--clear"):
+            generate_dataset(*args)
+        self.assertEqual(get_dataset(), dataset)
+
+        generate_dataset(*args, "--seed", "1")
+        self.assertEqual(Zaak.objects.count(), 20)
+
+    def test_generated_uuids(self):
+        generate_dataset(
+            "--zaken", "2", "--zaaktypen", "2", "--hoofdzaken", "0",
+            "--deelzaken", "0",
+        )  # fmt: skip
+
+        self.assertEqual(
+            list(Zaak.objects.order_by("pk").values_list("uuid", flat=True)),
+            [get_generated_uuid(0, "zaak", 1), get_generated_uuid(0, "zaak", 2)],
+        )
+        self.assertTrue(
+            ZaakType.objects.filter(uuid=get_generated_uuid(0, "zaaktype", 2)).exists()
+        )
+
+    def test_drop_indexes(self):
+        indexes = get_index_names()
+
+        generate_dataset(
+            "--zaken", "10", "--hoofdzaken", "2", "--deelzaken", "3",
+            "--drop-indexes",
+        )  # fmt: skip
+
+        self.assertEqual(Zaak.objects.count(), 10)
+        self.assertEqual(get_index_names(), indexes)
+
+    def test_invalid_sizes(self):
+        for args in (
+            ("--zaken", "10", "--hoofdzaken", "5", "--deelzaken", "6"),
+            ("--zaken", "10", "--hoofdzaken", "0", "--deelzaken", "5"),
+            (
+                "--zaken",
+                "10",
+                "--hoofdzaken",
+                "0",
+                "--deelzaken",
+                "0",
+                "--zaaktype-skew",
+                "0",
+            ),  # fmt: skip
+        ):
+            with self.subTest(args=args), self.assertRaises(CommandError):
+                generate_dataset(*args)
@@ -0,0 +1,140 @@
+from django.contrib.gis.geos import Point, Polygon
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse, reverse_lazy
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .factories import ZaakFactory
+
+# a circle with many vertices
+CIRCLE = Point(5.12, 52.09).buffer(0.01, quadsegs=64)
+
+
+class LazyGeometryTests(APITestCase):
+    url = reverse_lazy("zaak-list", kwargs={"version": "1"})
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.zaak = ZaakFactory.create(zaakgeometrie=Point(4.123456789, 52.987654321))
+
+    def test_list_leaves_out_geometry(self):
+        for values_list in (True, False):
+            with (
+                self.subTest(values_list=values_list),
+                override_settings(ZAKEN_VALUES_LIST_ENABLED=values_list),
+                CaptureQueriesContext(connection) as context,
+            ):
+                response = self.client.get(self.url)
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertNotIn("zaakgeometrie", response.json()["results"][0])
+                self.assertFalse(
+                    any("zaakgeometrie" in query["sql"] for query in context)
+                )
+
+    def test_list_expand_geometry(self):
+        for values_list in (True, False):
+            with (
+                self.subTest(values_list=values_list),
+                override_settings(ZAKEN_VALUES_LIST_ENABLED=values_list),
+            ):
+                response = self.client.get(
+                    self.url, {"expand": "zaakgeometrie", "stream": "true"}
+                )
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertIn(
+                    b'"zaakgeometrie":{"type":"Point","coordinates":'
+                    b"[4.123456789,52.987654321]}",
+                    b"".join(response.streaming_content),
+                )
+
+    @override_settings(ZAKEN_LIST_LAZY_GEOMETRY=False)
+    def test_list_with_lazy_geometry_disabled(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(
+            response.json()["results"][0]["zaakgeometrie"],
+            {"type": "Point", "coordinates": [4.123456789, 52.987654321]},
+        )
+
+    def test_detail_includes_geometry(self):
+        response = self.client.get(
+            reverse("zaak-detail", kwargs={"version": "1", "uuid": self.zaak.uuid})
+        )
+
+        self.assertEqual(
+            response.json()["zaakgeometrie"],
+            {"type": "Point", "coordinates": [4.123456789, 52.987654321]},
+        )
+
+    def test_write_geojson(self):
+        url = reverse("zaak-detail", kwargs={"version": "1", "uuid": self.zaak.uuid})
+
+        response = self.client.patch(
+            url, {"zaakgeometrie": {"type": "Point", "coordinates": [5.0, 52.0]}}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.json())
+        self.zaak.refresh_from_db()
+        self.assertEqual(self.zaak.zaakgeometrie, Point(5.0, 52.0, srid=4326))
+
+
+class GeometryParametersTests(APITestCase):
+    url = reverse_lazy("zaak-list", kwargs={"version": "1"})
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.zaak = ZaakFactory.create(zaakgeometrie=Polygon(CIRCLE.exterior_ring))
+        cls.detail_url = reverse(
+            "zaak-detail", kwargs={"version": "1", "uuid": cls.zaak.uuid}
+        )
+
+    def get_geometries(self, params: dict) -> list[dict]:
+        geometries = []
+        for values_list in (True, False):
+            with override_settings(ZAKEN_VALUES_LIST_ENABLED=values_list):
+                response = self.client.get(
+                    self.url, {"expand": "zaakgeometrie", **params}
+                )
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                geometries.append(response.json()["results"][0]["zaakgeometrie"])
+
+        response = self.client.get(self.detail_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        geometries.append(response.json()["zaakgeometrie"])
+        return geometries
+
+    def test_precision(self):
+        for geometry in self.get_geometries({"geometryPrecision": 2}):
+            with self.subTest(geometry=geometry):
+                self.assertEqual(geometry["type"], "Polygon")
+                for x, y in geometry["coordinates"][0]:
+                    self.assertEqual(x, round(x, 2))
+                    self.assertEqual(y, round(y, 2))
+
+    def test_simplify(self):
+        vertices = len(CIRCLE.exterior_ring)
+
+        for geometry in self.get_geometries({"geometrySimplify": 0.001}):
+            with self.subTest(geometry=geometry):
+                self.assertEqual(geometry["type"], "Polygon")
+                self.assertLess(len(geometry["coordinates"][0]), vertices / 4)
+
+    def test_invalid_parameters(self):
+        for params in (
+            {"geometryPrecision": -1},
+            {"geometryPrecision": 16},
+            {"geometrySimplify": "a lot"},
+        ):
+            with self.subTest(params=params):
+                response = self.client.get(
+                    self.url, {"expand": "zaakgeometrie", **params}
+                )
+
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,139 @@
+import datetime
+import json
+import tempfile
+from io import StringIO
+
+from django.contrib.gis.geos import Point
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+
+from dateutil.relativedelta import relativedelta
+
+from ..models import Zaak
+from .factories import ZaakFactory
+
+
+def get_index_names() -> set[str]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT indexname FROM pg_indexes WHERE tablename = %s",
+            [Zaak._meta.db_table],
+        )
+        return {name for (name,) in cursor.fetchall()}
+
+
+class LoadZakenTests(TestCase):
+    def load(self, content: str, suffix: str, *args):
+        with tempfile.NamedTemporaryFile("w", suffix=suffix) as file:
+            file.write(content)
+            file.flush()
+            call_command("load_zaken", file.name, *args, stdout=StringIO(), verbosity=0)
+
+    def test_load_csv(self):
+        self.load(
+            "identificatie,omschrijving,startdatum,einddatum,producten_of_diensten\n"
+            'ZAAK-1,Eerste zaak,2025-01-01,,"[""https://example.com/p/1""]"\n'
+            "ZAAK-2,Tweede zaak,2025-02-01,2025-03-01,\n",
+            ".csv",
+        )
+
+        first, second = Zaak.objects.order_by("identificatie")
+        self.assertEqual(first.omschrijving, "Eerste zaak")
+        self.assertEqual(first.startdatum, datetime.date(2025, 1, 1))
+        self.assertIsNone(first.einddatum)
+        self.assertEqual(first.producten_of_diensten, ["https://example.com/p/1"])
+        self.assertEqual(second.einddatum, datetime.date(2025, 3, 1))
+        self.assertEqual(second.producten_of_diensten, [])
+
+    def test_load_jsonl(self):
+        hoofdzaak = ZaakFactory.create()
+        rows = [
+            {
+                "identificatie": "ZAAK-1",
+                "hoofdzaak_id": hoofdzaak.pk,
+                "zaakgeometrie": {"type": "Point", "coordinates": [4.9, 52.37]},
+                "opschorting_indicatie": True,
+                "verlenging_duur": "P1M",
+            },
+            {"identificatie": "ZAAK-2", "zaakgeometrie": "POINT (5.1 52.1)"},
+        ]
+        self.load("\n".join(json.dumps(row) for row in rows), ".jsonl")
+
+        first = Zaak.objects.get(identificatie="ZAAK-1")
+        self.assertEqual(first.hoofdzaak, hoofdzaak)
+        self.assertEqual(first.zaakgeometrie, Point(4.9, 52.37, srid=4326))
+        self.assertTrue(first.opschorting_indicatie)
+        self.assertEqual(first.verlenging_duur, relativedelta(months=1))
+        second = Zaak.objects.get(identificatie="ZAAK-2")
+        self.assertEqual(second.zaakgeometrie, Point(5.1, 52.1, srid=4326))
+
+    def test_model_defaults(self):
+        self.load('{"omschrijving": "a"}\n{"omschrijving": "b"}\n', ".jsonl")
+
+        zaken = list(Zaak.objects.all())
+        self.assertEqual(len(zaken), 2)
+        self.assertNotEqual(zaken[0].uuid, zaken[1].uuid)
+        for zaak in zaken:
+            with self.subTest(zaak=zaak):
+                self.assertEqual(zaak.registratiedatum, datetime.date.today())
+                self.assertEqual(zaak.vertrouwelijkheidaanduiding, "openbaar")
+                self.assertEqual(zaak.verantwoordelijke_organisatie, "123456782")
+                self.assertEqual(zaak.toelichting, "")
+                self.assertIsNone(zaak.hoofdzaak_id)
+
+    def test_drop_indexes(self):
+        indexes = get_index_names()
+
+        self.load('{"omschrijving": "a"}\n', ".jsonl", "--drop-indexes")
+
+        self.assertEqual(Zaak.objects.count(), 1)
+        self.assertEqual(get_index_names(), indexes)
+
+    def test_unknown_fields(self):
+        with self.assertRaisesMessage(CommandError, "Unknown fields: onbekend."):
+            self.load('{"onbekend": "a"}\n', ".jsonl")
+
+    def test_rows_with_other_keys(self):
+        self.load(
+            '{"omschrijving": "a"}\n{"omschrijving": "b", "toelichting": "c"}\n',
+            ".jsonl",
+        )
+
+        first, second = Zaak.objects.order_by("omschrijving")
+        self.assertEqual(first.toelichting, "")
+        self.assertEqual(second.toelichting, "c")
+
+    def test_unknown_fields_in_later_row(self):
+        with self.assertRaisesMessage(CommandError, "Row 2: Unknown fields: onbekend."):
+            self.load('{"omschrijving": "a"}\n{"onbekend": "b"}\n', ".jsonl")
+
+        self.assertFalse(Zaak.objects.exists())
+
+    def test_invalid_row_rolls_back(self):
+        with self.assertRaisesMessage(CommandError, "Row 2:"):
+            self.load(
+                '{"startdatum": "2025-01-01"}\n{"startdatum": "morgen"}\n', ".jsonl"
+            )
+
+        self.assertFalse(Zaak.objects.exists())
+
+    def test_duplicate_uuid(self):
+        zaak = ZaakFactory.create()
+
+        with self.assertRaisesMessage(
+            CommandError, "Row 2: duplicate key value violates unique constraint"
+        ):
+            self.load(f'{{"omschrijving": "a"}}\n{{"uuid": "{zaak.uuid}"}}\n', ".jsonl")
+
+        self.assertEqual(Zaak.objects.count(), 1)
+
+    def test_unknown_hoofdzaak(self):
+        with self.assertRaisesMessage(CommandError, "Key (hoofdzaak_id)=(0)"):
+            self.load('{"omschrijving": "a"}\n{"hoofdzaak_id": 0}\n', ".jsonl")
+
+        self.assertFalse(Zaak.objects.exists())
+
+    def test_unknown_format(self):
+        with self.assertRaises(CommandError):
+            self.load("", ".txt")
@@ -0,0 +1,187 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse_lazy
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..api.pagination import CountStrategies, ExactPaginator
+from ..models import Zaak
+from .factories import ZaakFactory
+
+
+class KeysetPaginationTests(APITestCase):
+    url = reverse_lazy("zaak-list", kwargs={"version": "1"})
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # newest first, matching the `-pk` ordering of the endpoint
+        cls.zaken = ZaakFactory.create_batch(5)[::-1]
+
+    def _uuids(self, response) -> list[str]:
+        return [item["url"].rsplit("/", 1)[-1] for item in response.json()["results"]]
+
+    def test_page_number_pagination_is_the_default(self):
+        response = self.client.get(self.url, {"pageSize": 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data["count"], 5)
+        self.assertIn("page=2", data["next"])
+        self.assertNotIn("cursor", data["next"])
+
+    def test_walk_forward_and_back_with_cursor(self):
+        expected = [str(zaak.uuid) for zaak in self.zaken]
+
+        first = self.client.get(self.url, {"cursor": "", "pageSize": 2})
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        data = first.json()
+        self.assertEqual(list(data), ["count", "next", "previous", "results"])
+        self.assertEqual(data["count"], 5)
+        self.assertIsNone(data["previous"])
+        self.assertEqual(self._uuids(first), expected[:2])
+
+        second = self.client.get(data["next"])
+        self.assertEqual(self._uuids(second), expected[2:4])
+
+        third = self.client.get(second.json()["next"])
+        self.assertEqual(self._uuids(third), expected[4:])
+        self.assertIsNone(third.json()["next"])
+
+        back = self.client.get(third.json()["previous"])
+        self.assertEqual(self._uuids(back), expected[2:4])
+
+        start = self.client.get(back.json()["previous"])
+        self.assertEqual(self._uuids(start), expected[:2])
+        self.assertIsNone(start.json()["previous"])
+
+    def test_cursor_replaces_page_param(self):
+        response = self.client.get(self.url, {"cursor": "", "page": 2, "pageSize": 2})
+
+        next_link = response.json()["next"]
+        self.assertIn("cursor=", next_link)
+        self.assertIn("pageSize=2", next_link)
+        self.assertNotIn("page=", next_link.replace("pageSize=", ""))
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_seeks_instead_of_offset(self):
+        first = self.client.get(self.url, {"cursor": "", "pageSize": 2})
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(first.json()["next"])
+
+        page_query = next(
+            query["sql"]
+            for query in context.captured_queries
+            if "ORDER BY" in query["sql"] and '"zaken_zaak"."id" <' in query["sql"]
+        )
+        self.assertNotIn("OFFSET", page_query)
+
+
+class CountStrategyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        ZaakFactory.create_batch(5)
+
+    def test_exact(self):
+        paginator = ExactPaginator(Zaak.objects.order_by("-pk"), 2)
+
+        self.assertEqual(paginator.count_result, (5, CountStrategies.exact, True))
+
+    def test_capped_below_cap(self):
+        paginator = ExactPaginator(
+            Zaak.objects.order_by("-pk"), 2, count_strategy=CountStrategies.capped
+        )
+
+        self.assertEqual(paginator.count_result, (5, CountStrategies.capped, True))
+
+    def test_capped_above_cap(self):
+        paginator = ExactPaginator(
+            Zaak.objects.order_by("-pk"),
+            2,
+            count_strategy=CountStrategies.capped,
+            count_cap=3,
+        )
+
+        self.assertEqual(paginator.count_result, (3, CountStrategies.capped, False))
+
+        # pages beyond the cap are still reachable
+        page = paginator.page(3)
+        self.assertEqual(len(page), 1)
+        self.assertFalse(page.has_next())
+        self.assertTrue(paginator.page(2).has_next())
+
+    def test_estimated_uses_planner_statistics(self):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE zaken_zaak")
+
+        paginator = ExactPaginator(
+            Zaak.objects.order_by("-pk"),
+            2,
+            count_strategy=CountStrategies.estimated,
+            estimate_threshold=0,
+        )
+
+        with self.assertNumQueries(1):
+            count_result = paginator.count_result
+
+        self.assertEqual(count_result, (5, CountStrategies.estimated, False))
+
+    def test_estimated_small_table_counts_exactly(self):
+        paginator = ExactPaginator(
+            Zaak.objects.order_by("-pk"), 2, count_strategy=CountStrategies.estimated
+        )
+
+        self.assertEqual(paginator.count_result, (5, CountStrategies.exact, True))
+
+    def test_estimated_filtered_falls_back_to_capped(self):
+        paginator = ExactPaginator(
+            Zaak.objects.filter(pk__gt=0).order_by("-pk"),
+            2,
+            count_strategy=CountStrategies.estimated,
+            count_cap=3,
+        )
+
+        self.assertEqual(paginator.count_result, (3, CountStrategies.capped, False))
+
+
+class CountStrategyAPITests(APITestCase):
+    url = reverse_lazy("zaak-list", kwargs={"version": "1"})
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        ZaakFactory.create_batch(3)
+
+    def test_strategy_headers(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.json()["count"], 3)
+        # the table is too small for estimates to be worth it
+        self.assertEqual(response["X-Count-Strategy"], "exact")
+        self.assertEqual(response["X-Count-Exact"], "true")
+
+    def test_strategy_per_request(self):
+        response = self.client.get(self.url, {"countStrategy": "capped"})
+
+        self.assertEqual(response["X-Count-Strategy"], "capped")
+        self.assertEqual(response["X-Count-Exact"], "true")
+
+    def test_strategy_in_cursor_mode(self):
+        response = self.client.get(self.url, {"cursor": "", "countStrategy": "capped"})
+
+        self.assertEqual(response["X-Count-Strategy"], "capped")
+
+    def test_unknown_strategy_is_ignored(self):
+        response = self.client.get(self.url, {"countStrategy": "bogus"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Count-Strategy"], "exact")
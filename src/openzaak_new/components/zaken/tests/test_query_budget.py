@@ -0,0 +1,160 @@
+from django.urls import reverse, reverse_lazy
+
+from rest_framework.test import APITestCase
+from zgw_consumers.constants import APITypes
+from zgw_consumers.test.factories import ServiceFactory
+
+from openzaak_new.components.catalogi.models import ZaakType
+from openzaak_new.utils.tests.query_budget import QueryBudgetMixin
+
+from ..models import Zaak
+from .factories import ZaakFactory
+from .test_filters import CATALOGI_ROOT, get_zaaktype_url
+
+# the count and the page
+LIST_BUDGET = 2
+# the zaak, with the UUIDs of the hoofdzaak and deelzaken, and the zaaktype
+DETAIL_BUDGET = 2
+CREATE_BUDGET = 8
+UPDATE_BUDGET = 8
+DELETE_BUDGET = 6
+
+
+def get_zaak_url(zaak: Zaak) -> str:
+    return reverse("zaak-detail", kwargs={"version": "1", "uuid": zaak.uuid})
+
+
+class ZaakQueryBudgetTests(QueryBudgetMixin, APITestCase):
+    """
+    The number of queries of the Zaak endpoints doesn't depend on the number of
+    zaken, deelzaken or zaaktypen involved.
+    """
+
+    list_url = reverse_lazy("zaak-list", kwargs={"version": "1"})
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.zaaktype = ZaakType.objects.create()
+        cls.service = ServiceFactory.create(
+            api_root=CATALOGI_ROOT, api_type=APITypes.ztc
+        )
+
+    def create_zaken(self, zaaktype: str, count: int, deelzaken: int) -> list[Zaak]:
+        if zaaktype == "local":
+            kwargs = {"_zaaktype": ZaakType.objects.create()}
+        else:
+            kwargs = {
+                "_zaaktype_base_url": self.service,
+                "_zaaktype_relative_url": f"zaaktypen/{count}",
+            }
+
+        zaken = ZaakFactory.create_batch(count, **kwargs)
+        for zaak in zaken:
+            ZaakFactory.create_batch(deelzaken, hoofdzaak=zaak, **kwargs)
+        return zaken
+
+    def assertSameQueries(self, budget: int, request, variants: list) -> None:
+        counts = []
+        for variant in variants:
+            with self.subTest(variant=variant):
+                with self.assertQueryBudget(budget) as recorder:
+                    response = request(variant)
+                self.assertLess(response.status_code, 300, response.content)
+                counts.append(recorder.count)
+        self.assertEqual(len(set(counts)), 1, f"{variants}: {counts} queries")
+
+    def test_list(self):
+        for zaaktype in ("local", "external"):
+            with self.subTest(zaaktype=zaaktype):
+                self.create_zaken(zaaktype, count=10, deelzaken=3)
+
+                self.assertSameQueries(
+                    LIST_BUDGET,
+                    lambda page_size: self.client.get(
+                        self.list_url,
+                        {"pageSize": page_size, "countStrategy": "exact"},
+                    ),
+                    [1, 10, 100],
+                )
+
+    def test_detail(self):
+        for zaaktype in ("local", "external"):
+            with self.subTest(zaaktype=zaaktype):
+                zaken = [
+                    self.create_zaken(zaaktype, count=1, deelzaken=deelzaken)[0]
+                    for deelzaken in (0, 1, 10)
+                ]
+
+                self.assertSameQueries(
+                    DETAIL_BUDGET,
+                    lambda zaak: self.client.get(get_zaak_url(zaak)),
+                    zaken,
+                )
+
+    def test_create(self):
+        hoofdzaken = [
+            self.create_zaken("local", count=1, deelzaken=deelzaken)[0]
+            for deelzaken in (0, 10)
+        ]
+
+        self.assertSameQueries(
+            CREATE_BUDGET,
+            lambda hoofdzaak: self.client.post(
+                self.list_url,
+                {
+                    "omschrijving": "Nieuw",
+                    "bronorganisatie": "517439943",
+                    "startdatum": "2025-01-01",
+                    "Zaaktype": get_zaaktype_url(self.zaaktype),
+                    "hoofdzaak": f"http://testserver{get_zaak_url(hoofdzaak)}",
+                },
+            ),
+            hoofdzaken,
+        )
+
+    def test_update(self):
+        for zaaktype in ("local", "external"):
+            with self.subTest(zaaktype=zaaktype):
+                zaken = [
+                    self.create_zaken(zaaktype, count=1, deelzaken=deelzaken)[0]
+                    for deelzaken in (0, 10)
+                ]
+
+                self.assertSameQueries(
+                    UPDATE_BUDGET,
+                    lambda zaak: self.client.patch(
+                        get_zaak_url(zaak), {"omschrijving": "gewijzigd"}
+                    ),
+                    zaken,
+                )
+
+    def test_delete(self):
+        for zaaktype in ("local", "external"):
+            with self.subTest(zaaktype=zaaktype):
+                zaken = [
+                    self.create_zaken(zaaktype, count=1, deelzaken=deelzaken)[0]
+                    for deelzaken in (1, 10)
+                ]
+
+                self.assertSameQueries(
+                    DELETE_BUDGET,
+                    lambda zaak: self.client.delete(get_zaak_url(zaak)),
+                    zaken,
+                )
+                self.assertFalse(
+                    Zaak.objects.filter(pk__in=[zaak.pk for zaak in zaken]).exists()
+                )
+
+    def test_exceeded_budget_reports_queries(self):
+        zaak = self.create_zaken("local", count=1, deelzaken=0)[0]
+
+        with self.assertRaises(AssertionError) as context:
+            with self.assertQueryBudget(0):
+                self.client.get(get_zaak_url(zaak))
+
+        message = str(context.exception)
+        self.assertIn('FROM "zaken_zaak"', message)
+        # the frames of the project that executed the query
+        self.assertIn("mixins.py", message)
+        self.assertIn("test_query_budget.py", message)
@@ -0,0 +1,188 @@
+import json
+from time import time
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.conf import settings
+from django.test import override_settings
+from django.urls import reverse, reverse_lazy
+
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+
+from ..cache import get_response_cache
+from ..models import Zaak
+from .factories import ZaakFactory
+from .test_response_cache import LOCMEM_CACHES
+
+
+def replicate(*zaken: Zaak) -> None:
+    """
+    Copy the zaken to the replica, like the replication would.
+    """
+    for zaak in zaken:
+        zaak.save(using="replica", force_insert=True)
+
+
+@skipUnless(
+    "replica" in settings.DATABASES,
+    "requires the replica database of the CI settings",
+)
+@override_settings(
+    DB_REPLICAS=["replica"],
+    DB_REPLICA_STICKY_TTL=10,
+)
+class ReadReplicaTests(APITransactionTestCase):
+    databases = {"default", "replica"}
+    list_url = reverse_lazy("zaak-list", kwargs={"version": "1"})
+
+    def get_detail_url(self, zaak: Zaak) -> str:
+        return reverse("zaak-detail", kwargs={"version": "1", "uuid": zaak.uuid})
+
+    def test_list_reads_from_replica(self):
+        replicated = ZaakFactory.create()
+        replicate(replicated)
+        ZaakFactory.create()
+
+        response = self.client.get(self.list_url, {"countStrategy": "exact"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(
+            [result["url"] for result in data["results"]],
+            [f"http://testserver{self.get_detail_url(replicated)}"],
+        )
+        self.assertEqual(data["count"], 1)
+
+    def test_retrieve_reads_from_replica(self):
+        zaak = ZaakFactory.create()
+
+        response = self.client.get(self.get_detail_url(zaak))
+
+        # not replicated yet
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_prefetch_reads_from_replica(self):
+        hoofdzaak = ZaakFactory.create()
+        deelzaak = ZaakFactory.create(hoofdzaak=hoofdzaak)
+        replicate(hoofdzaak, deelzaak)
+        ZaakFactory.create(hoofdzaak=hoofdzaak)
+
+        response = self.client.get(self.get_detail_url(hoofdzaak))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["deelzaken"],
+            [f"http://testserver{self.get_detail_url(deelzaak)}"],
+        )
+
+    def test_streamed_list_reads_from_replica(self):
+        zaken = ZaakFactory.create_batch(3, omschrijving="primary")
+        replicate(*zaken[:2])
+        Zaak.objects.using("replica").update(omschrijving="replica")
+
+        response = self.client.get(self.list_url, {"stream": "true", "pageSize": 10})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # the rows are streamed after the middleware returned
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(
+            [result["omschrijving"] for result in data["results"]],
+            ["replica", "replica"],
+        )
+
+    def test_read_your_writes(self):
+        zaak = ZaakFactory.create(omschrijving="oud")
+        replicate(zaak)
+        url = self.get_detail_url(zaak)
+
+        response = self.client.patch(url, {"omschrijving": "nieuw"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        until = float(response["Primary-Until"])
+        self.assertAlmostEqual(until, time() + 10, delta=2)
+        self.assertEqual(response.cookies["primary_until"]["max-age"], 10)
+
+        with self.subTest("cookie"):
+            response = self.client.get(url)
+            self.assertEqual(response.json()["omschrijving"], "nieuw")
+
+        self.client.cookies.clear()
+        with self.subTest("header"):
+            response = self.client.get(url, headers={"Primary-Until": str(until)})
+            self.assertEqual(response.json()["omschrijving"], "nieuw")
+
+        with self.subTest("other clients"):
+            response = self.client.get(url)
+            self.assertEqual(response.json()["omschrijving"], "oud")
+
+    @override_settings(CACHES=LOCMEM_CACHES, ZAKEN_RESPONSE_CACHE_ENABLED=True)
+    def test_read_your_writes_with_response_cache(self):
+        zaak = ZaakFactory.create(omschrijving="oud")
+        replicate(zaak)
+        url = self.get_detail_url(zaak)
+        other_client = self.client_class()
+
+        response = self.client.patch(url, {"omschrijving": "nieuw"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # cached from the lagging replica, under the generation of the write
+        response = other_client.get(url)
+        self.assertEqual(response.json()["omschrijving"], "oud")
+
+        response = self.client.get(url)
+        self.assertEqual(response.json()["omschrijving"], "nieuw")
+        # both are cached
+        with (
+            self.assertNumQueries(0, using="default"),
+            self.assertNumQueries(0, using="replica"),
+        ):
+            self.assertEqual(self.client.get(url).json()["omschrijving"], "nieuw")
+            self.assertEqual(other_client.get(url).json()["omschrijving"], "oud")
+
+    def test_stickiness_expires(self):
+        zaak = ZaakFactory.create(omschrijving="nieuw")
+        replicate(zaak)
+        Zaak.objects.using("replica").update(omschrijving="oud")
+        url = self.get_detail_url(zaak)
+
+        for until in (time() - 1, time() + 3600, "onbekend"):
+            with self.subTest(until=until):
+                response = self.client.get(url, headers={"Primary-Until": str(until)})
+
+                self.assertEqual(response.json()["omschrijving"], "oud")
+
+    def test_failed_write_is_not_sticky(self):
+        zaak = ZaakFactory.create()
+
+        response = self.client.patch(self.get_detail_url(zaak), {"startdatum": "x"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertNotIn("Primary-Until", response)
+        self.assertNotIn("primary_until", response.cookies)
+
+    @override_settings(DB_REPLICAS=[])
+    def test_without_replicas(self):
+        zaak = ZaakFactory.create()
+
+        response = self.client.get(self.get_detail_url(zaak))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.patch(self.get_detail_url(zaak), {"omschrijving": "x"})
+        self.assertNotIn("Primary-Until", response)
+
+    @override_settings(
+        CACHES=LOCMEM_CACHES,
+        ZAKEN_RESPONSE_CACHE_ENABLED=True,
+        ZAKEN_RESPONSE_CACHE_TIMEOUT=300,
+    )
+    def test_response_cache_timeout(self):
+        zaak = ZaakFactory.create()
+        replicate(zaak)
+        cache = get_response_cache()
+
+        with patch.object(cache, "set", wraps=cache.set) as cache_set:
+            response = self.client.get(self.get_detail_url(zaak))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # no longer than the replica may lag behind
+        self.assertEqual(cache_set.call_args.kwargs["timeout"], 10)
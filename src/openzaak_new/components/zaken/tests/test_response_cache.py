@@ -0,0 +1,154 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .factories import ZaakFactory
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "axes": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES, ZAKEN_RESPONSE_CACHE_ENABLED=True)
+class ResponseCacheTests(APITestCase):
+    list_url = reverse("zaak-list", kwargs={"version": "1"})
+
+    def setUp(self):
+        super().setUp()
+        self.hoofdzaak = ZaakFactory.create()
+        self.zaak = ZaakFactory.create(hoofdzaak=self.hoofdzaak)
+
+    def _detail_url(self, zaak) -> str:
+        return reverse("zaak-detail", kwargs={"version": "1", "uuid": zaak.uuid})
+
+    def test_list_is_served_from_cache(self):
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(self.list_url)
+
+        self.assertEqual(cached.json(), response.json())
+        self.assertEqual(cached["ETag"], response["ETag"])
+        self.assertEqual(cached["X-Count-Strategy"], response["X-Count-Strategy"])
+
+    def test_detail_is_served_from_cache(self):
+        response = self.client.get(self._detail_url(self.zaak))
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(self._detail_url(self.zaak))
+
+        self.assertEqual(cached.json(), response.json())
+
+    def test_query_parameters_and_scope_are_part_of_the_key(self):
+        self.client.get(self.list_url, {"pageSize": 1, "page": 1})
+
+        with self.assertNumQueries(0):
+            # parameter order is normalized
+            self.client.get(f"{self.list_url}?page=1&pageSize=1")
+
+        with self.subTest("other query"):
+            with CaptureQueriesContext(connection) as context:
+                self.client.get(self.list_url, {"pageSize": 1, "page": 2})
+            self.assertGreater(len(context.captured_queries), 0)
+
+        with self.subTest("other scope"):
+            self.client.credentials(HTTP_AUTHORIZATION="Bearer other")
+            with CaptureQueriesContext(connection) as context:
+                self.client.get(self.list_url, {"pageSize": 1, "page": 1})
+            self.assertGreater(len(context.captured_queries), 0)
+
+    def test_create_invalidates_list(self):
+        self.client.get(self.list_url)
+
+        ZaakFactory.create()
+
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.json()["count"], 3)
+
+    def test_update_invalidates_detail(self):
+        self.client.get(self._detail_url(self.zaak))
+
+        response = self.client.patch(
+            self._detail_url(self.zaak), {"omschrijving": "gewijzigd"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(self._detail_url(self.zaak))
+        self.assertEqual(response.json()["omschrijving"], "gewijzigd")
+
+    def test_moving_deelzaak_invalidates_both_hoofdzaken(self):
+        other_hoofdzaak = ZaakFactory.create()
+        zaak_url = f"http://testserver{self._detail_url(self.zaak)}"
+        self.client.get(self._detail_url(self.hoofdzaak))
+        self.client.get(self._detail_url(other_hoofdzaak))
+
+        response = self.client.patch(
+            self._detail_url(self.zaak),
+            {"hoofdzaak": f"http://testserver{self._detail_url(other_hoofdzaak)}"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        old = self.client.get(self._detail_url(self.hoofdzaak))
+        self.assertEqual(old.json()["deelzaken"], [])
+        new = self.client.get(self._detail_url(other_hoofdzaak))
+        self.assertEqual(new.json()["deelzaken"], [zaak_url])
+
+    def test_delete_invalidates_hoofdzaak(self):
+        self.client.get(self._detail_url(self.hoofdzaak))
+
+        response = self.client.delete(self._detail_url(self.zaak))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        response = self.client.get(self._detail_url(self.hoofdzaak))
+        self.assertEqual(response.json()["deelzaken"], [])
+
+    def test_write_invalidates_again_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.zaak.omschrijving = "gewijzigd"
+            self.zaak.save()
+            # cached by a concurrent request, before the write committed
+            self.client.get(self._detail_url(self.zaak))
+
+            with self.assertNumQueries(0):
+                self.client.get(self._detail_url(self.zaak))
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self._detail_url(self.zaak))
+        self.assertGreater(len(context.captured_queries), 0)
+
+    def test_if_none_match(self):
+        response = self.client.get(self._detail_url(self.zaak))
+        etag = response["ETag"]
+
+        with self.assertNumQueries(0):
+            not_modified = self.client.get(
+                self._detail_url(self.zaak), HTTP_IF_NONE_MATCH=etag
+            )
+
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified["ETag"], etag)
+        self.assertEqual(not_modified.content, b"")
+
+    def test_if_none_match_after_change(self):
+        etag = self.client.get(self._detail_url(self.zaak))["ETag"]
+
+        self.zaak.omschrijving = "gewijzigd"
+        self.zaak.save()
+
+        response = self.client.get(self._detail_url(self.zaak), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    @override_settings(ZAKEN_RESPONSE_CACHE_ENABLED=False)
+    def test_etag_without_cache(self):
+        etag = self.client.get(self._detail_url(self.zaak))["ETag"]
+
+        response = self.client.get(self._detail_url(self.zaak), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
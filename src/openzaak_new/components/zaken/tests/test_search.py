@@ -0,0 +1,132 @@
+from django.contrib.gis.geos import Point, Polygon
+from django.db import connection
+from django.urls import reverse_lazy
+from django.utils.http import urlencode
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..models import Zaak
+from .factories import ZaakFactory
+
+AMSTERDAM = {
+    "type": "Polygon",
+    "coordinates": [
+        [[4.7, 52.3], [5.1, 52.3], [5.1, 52.45], [4.7, 52.45], [4.7, 52.3]]
+    ],
+}
+
+
+class ZaakSearchTests(APITestCase):
+    url = reverse_lazy("zaak--zoek", kwargs={"version": "1"})
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.inside = ZaakFactory.create(
+            zaakgeometrie=Point(4.9, 52.37), bronorganisatie="517439943"
+        )
+        cls.inside_other_organisation = ZaakFactory.create(
+            zaakgeometrie=Point(4.95, 52.4), bronorganisatie="111222333"
+        )
+        # partly in Amsterdam
+        cls.crossing = ZaakFactory.create(
+            zaakgeometrie=Polygon(
+                ((5.0, 52.0), (5.0, 52.35), (5.5, 52.35), (5.5, 52.0), (5.0, 52.0))
+            )
+        )
+        cls.outside = ZaakFactory.create(zaakgeometrie=Point(6.56, 53.22))
+        cls.without_geometry = ZaakFactory.create(zaakgeometrie=None)
+
+    def search(self, data: dict, **params):
+        return self.client.post(f"{self.url}?{urlencode(params)}", data)
+
+    def assertFound(self, response, expected: list[Zaak]):
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.json())
+        self.assertEqual(
+            {zaak["url"].rsplit("/", 1)[-1] for zaak in response.json()["results"]},
+            {str(zaak.uuid) for zaak in expected},
+        )
+
+    def test_within(self):
+        response = self.search({"zaakgeometrie": {"within": AMSTERDAM}})
+
+        self.assertFound(response, [self.inside, self.inside_other_organisation])
+
+    def test_intersects(self):
+        response = self.search({"zaakgeometrie": {"intersects": AMSTERDAM}})
+
+        self.assertFound(
+            response, [self.inside, self.inside_other_organisation, self.crossing]
+        )
+
+    def test_combined_with_list_filters(self):
+        response = self.search(
+            {"zaakgeometrie": {"within": AMSTERDAM}, "bronorganisatie": "111222333"}
+        )
+
+        self.assertFound(response, [self.inside_other_organisation])
+
+    def test_without_zaakgeometrie_only_filters(self):
+        response = self.search({"bronorganisatie": "111222333"})
+
+        self.assertFound(response, [self.inside_other_organisation])
+
+    def test_paginated_like_the_list(self):
+        first = self.search(
+            {"zaakgeometrie": {"intersects": AMSTERDAM}}, pageSize=2, cursor=""
+        )
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        data = first.json()
+        self.assertEqual(data["count"], 3)
+        self.assertEqual(len(data["results"]), 2)
+        self.assertIn("cursor=", data["next"])
+
+        second = self.client.post(
+            data["next"], {"zaakgeometrie": {"intersects": AMSTERDAM}}
+        )
+        self.assertFound(second, [self.inside])
+
+    def test_invalid_geometry(self):
+        for zaakgeometrie in (
+            {},
+            {"within": "POINT (4.9 52.37)"},
+            {"within": {"type": "Polygon", "coordinates": [[[4.7, 52.3]]]}},
+            {"intersects": {"type": "Unknown", "coordinates": []}},
+        ):
+            with self.subTest(zaakgeometrie=zaakgeometrie):
+                response = self.search({"zaakgeometrie": zaakgeometrie})
+
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_uses_the_gist_index(self):
+        with connection.cursor() as cursor:
+            # the test table is tiny, don't let the planner prefer reading all of it
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+        geometry = Polygon(AMSTERDAM["coordinates"][0], srid=4326)
+        for lookup in ("within", "intersects"):
+            with self.subTest(lookup=lookup):
+                plan = (
+                    Zaak.objects.filter(**{f"zaakgeometrie__{lookup}": geometry})
+                    .values("pk")
+                    .explain()
+                )
+
+                self.assertIn("zaken_zaak_geometrie_gist", plan)
+
+    def test_gist_index_is_the_only_index_on_zaakgeometrie(self):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, Zaak._meta.db_table
+            )
+
+        self.assertEqual(
+            [
+                name
+                for name, constraint in constraints.items()
+                if constraint["columns"] == ["zaakgeometrie"]
+            ],
+            ["zaken_zaak_geometrie_gist"],
+        )
@@ -0,0 +1,221 @@
+import datetime
+import os
+import random
+from unittest.mock import patch
+
+from django.contrib.gis.geos import Point, Polygon
+from django.test import override_settings
+from django.urls import reverse, reverse_lazy
+from django.utils import timezone
+
+from dateutil.relativedelta import relativedelta
+from rest_framework import serializers, status
+from rest_framework.test import APITestCase
+from vng_api_common.constants import (
+    Archiefnominatie,
+    Archiefstatus,
+    VertrouwelijkheidsAanduiding,
+)
+
+from openzaak_new.components.catalogi.models import ZaakType
+
+from ..api.serializers import ZaakSerializer
+from ..constants import BetalingsIndicatie
+from .factories import ZaakFactory
+
+# the serializer without the compiled representation
+drf_representation = patch.object(
+    ZaakSerializer,
+    "to_representation",
+    serializers.HyperlinkedModelSerializer.to_representation,
+)
+
+
+# fixed, so failures reproduce; set ``TEST_SERIALIZERS_SEED`` to explore other data
+SEED = int(os.getenv("TEST_SERIALIZERS_SEED", "20250101"))
+
+
+def get_content(response) -> bytes:
+    if response.streaming:
+        return b"".join(response.streaming_content)
+    return response.content
+
+
+def random_text(rng: random.Random, max_length: int) -> str:
+    alphabet = "abcdefghij KLMNOP ëé€ \"'<>&\\/\n\t"
+    length = rng.choice([0, 1, rng.randint(0, max_length)])
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+
+def random_date(rng: random.Random, null=True) -> datetime.date | None:
+    if null and rng.random() < 0.2:
+        return None
+    return datetime.date(2000, 1, 1) + datetime.timedelta(days=rng.randint(0, 10_000))
+
+
+def random_zaak_kwargs(rng: random.Random, zaaktypen, hoofdzaken) -> dict:
+    def maybe(value):
+        return value if rng.random() < 0.7 else None
+
+    def url():
+        return f"https://example.com/{random_text(rng, 20).replace(' ', '-')}"
+
+    return {
+        "omschrijving": random_text(rng, 80),
+        "toelichting": random_text(rng, 1000),
+        "betalingsindicatie": rng.choice(["", *BetalingsIndicatie.values]),
+        "opschorting_indicatie": rng.random() < 0.5,
+        "opschorting_eerdere_opschorting": rng.random() < 0.5,
+        "opschorting_reden": random_text(rng, 200),
+        "archiefnominatie": maybe(rng.choice(Archiefnominatie.values)),
+        "archiefstatus": maybe(rng.choice(Archiefstatus.values)),
+        "processobjectaard": random_text(rng, 200),
+        "processobject_datumkenmerk": random_text(rng, 250),
+        "processobject_identificatie": random_text(rng, 250),
+        "processobject_objecttype": random_text(rng, 250),
+        "processobject_registratie": random_text(rng, 250),
+        "communicatiekanaal_naam": random_text(rng, 250),
+        "registratiedatum": random_date(rng, null=False),
+        "startdatum": random_date(rng, null=False),
+        "einddatum": random_date(rng),
+        "einddatum_gepland": random_date(rng),
+        "uiterlijke_einddatum_afdoening": random_date(rng),
+        "publicatiedatum": random_date(rng),
+        "laatste_betaaldatum": maybe(
+            timezone.now()
+            - datetime.timedelta(
+                seconds=rng.randint(0, 10**9), microseconds=rng.randint(0, 10**6)
+            )
+        ),
+        "archiefactiedatum": random_date(rng),
+        "startdatum_bewaartermijn": random_date(rng),
+        "created_on": timezone.now()
+        - datetime.timedelta(seconds=rng.randint(0, 10**9)),
+        "verantwoordelijke_organisatie": f"{rng.randint(0, 10**9 - 1):09d}",
+        "opdrachtgevende_organisatie": f"{rng.randint(0, 10**9 - 1):09d}",
+        "zaakgeometrie": rng.choice(
+            [
+                None,
+                Point(rng.uniform(-180, 180), rng.uniform(-90, 90)),
+                Polygon(((0, 0), (0, 1), (rng.random(), 1), (1, 0), (0, 0))),
+            ]
+        ),
+        "verlenging_reden": random_text(rng, 200),
+        "verlenging_duur": rng.choice(
+            [
+                None,
+                relativedelta(days=rng.randint(1, 400)),
+                relativedelta(years=1, months=rng.randint(0, 11)),
+            ]
+        ),
+        "vertrouwelijkheidaanduiding": rng.choice(VertrouwelijkheidsAanduiding.values),
+        "selectielijstklasse": rng.choice(["", url()]),
+        "communicatiekanaal": rng.choice(["", url()]),
+        "producten_of_diensten": [url() for _ in range(rng.randint(0, 3))],
+        "hoofdzaak": rng.choice([None, *hoofdzaken]),
+        "_zaaktype": rng.choice([None, *zaaktypen]),
+        "identificatie": random_text(rng, 40),
+        "bronorganisatie": f"{rng.randint(0, 10**9 - 1):09d}",
+    }
+
+
+@override_settings(ZAKEN_VALUES_LIST_ENABLED=False)
+class CompiledRepresentationConformanceTests(APITestCase):
+    """
+    The compiled representation of ``ZaakSerializer`` must render exactly the same
+    bytes as the DRF serializer.
+    """
+
+    list_url = reverse_lazy("zaak-list", kwargs={"version": "1"})
+    seed = SEED
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        rng = random.Random(cls.seed)
+
+        zaaktypen = [ZaakType.objects.create(identificatie=str(i)) for i in range(3)]
+        hoofdzaken = ZaakFactory.create_batch(3)
+        cls.zaken = [
+            ZaakFactory.create(**random_zaak_kwargs(rng, zaaktypen, hoofdzaken))
+            for _ in range(50)
+        ]
+
+    def assertSameContent(self, url: str, params=None):
+        fast = self.client.get(url, params)
+        with drf_representation:
+            reference = self.client.get(url, params)
+
+        self.assertEqual(fast.status_code, status.HTTP_200_OK)
+        self.assertEqual(reference.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            get_content(fast), get_content(reference), f"Random seed: {self.seed}"
+        )
+
+    def test_list(self):
+        self.assertSameContent(self.list_url, {"pageSize": 100})
+
+    def test_list_streamed(self):
+        self.assertSameContent(self.list_url, {"pageSize": 100, "stream": "true"})
+
+    def test_detail(self):
+        for zaak in self.zaken[:10]:
+            with self.subTest(zaak=zaak.uuid):
+                self.assertSameContent(
+                    reverse("zaak-detail", kwargs={"version": "1", "uuid": zaak.uuid})
+                )
+
+    def test_write_response(self):
+        zaak = self.zaken[0]
+        url = reverse("zaak-detail", kwargs={"version": "1", "uuid": zaak.uuid})
+
+        fast = self.client.patch(url, {"omschrijving": "gewijzigd"})
+        with drf_representation:
+            reference = self.client.patch(url, {"omschrijving": "gewijzigd"})
+
+        self.assertEqual(fast.status_code, status.HTTP_200_OK)
+        self.assertEqual(fast.content, reference.content)
+
+
+class ValuesListTests(APITestCase):
+    list_url = reverse_lazy("zaak-list", kwargs={"version": "1"})
+    seed = SEED
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        rng = random.Random(cls.seed)
+
+        zaaktypen = [ZaakType.objects.create(identificatie=str(i)) for i in range(3)]
+        hoofdzaken = ZaakFactory.create_batch(3)
+        for _ in range(30):
+            ZaakFactory.create(**random_zaak_kwargs(rng, zaaktypen, hoofdzaken))
+
+    def test_same_content_as_from_instances(self):
+        for params in (
+            {"pageSize": 100},
+            {"pageSize": 10, "page": 2},
+            {"pageSize": 10, "cursor": ""},
+            {"pageSize": 100, "stream": "true"},
+        ):
+            with self.subTest(params=params):
+                values = self.client.get(self.list_url, params)
+                with override_settings(ZAKEN_VALUES_LIST_ENABLED=False):
+                    instances = self.client.get(self.list_url, params)
+
+                self.assertEqual(values.status_code, status.HTTP_200_OK)
+                self.assertEqual(
+                    get_content(values),
+                    get_content(instances),
+                    f"Random seed: {self.seed}",
+                )
+
+    def test_single_query_for_the_page(self):
+        # the count and the page, without prefetching deelzaken and zaaktypen
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                self.list_url, {"pageSize": 100, "countStrategy": "exact"}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["results"]), 33)
@@ -0,0 +1,100 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse, reverse_lazy
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .factories import ZaakFactory
+
+
+def get_select_columns(sql: str) -> str:
+    return sql.split(" FROM ", 1)[0]
+
+
+class SparseFieldsTests(APITestCase):
+    url = reverse_lazy("zaak-list", kwargs={"version": "1"})
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.hoofdzaak = ZaakFactory.create()
+        cls.zaak = ZaakFactory.create(hoofdzaak=cls.hoofdzaak)
+        cls.detail_url = reverse(
+            "zaak-detail", kwargs={"version": "1", "uuid": cls.zaak.uuid}
+        )
+
+    def get_zaak_query(self, context) -> str:
+        return next(
+            query["sql"]
+            for query in context
+            if '"zaken_zaak"."uuid"' in get_select_columns(query["sql"])
+        )
+
+    def test_list_only_the_fields(self):
+        for values_list in (True, False):
+            with (
+                self.subTest(values_list=values_list),
+                override_settings(ZAKEN_VALUES_LIST_ENABLED=values_list),
+            ):
+                response = self.client.get(self.url, {"fields": "url,omschrijving"})
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                for zaak in response.json()["results"]:
+                    self.assertEqual(set(zaak), {"url", "omschrijving"})
+
+    def test_detail_only_the_fields(self):
+        response = self.client.get(
+            self.detail_url, {"fields": "url,hoofdzaak,zaakgeometrie"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.json()), {"url", "hoofdzaak", "zaakgeometrie"})
+        self.assertIn(str(self.hoofdzaak.uuid), response.json()["hoofdzaak"])
+
+    def test_list_selects_fewer_columns(self):
+        for values_list in (True, False):
+            with (
+                self.subTest(values_list=values_list),
+                override_settings(ZAKEN_VALUES_LIST_ENABLED=values_list),
+            ):
+                with CaptureQueriesContext(connection) as context:
+                    self.client.get(self.url)
+                all_columns = get_select_columns(self.get_zaak_query(context))
+
+                with CaptureQueriesContext(connection) as context:
+                    self.client.get(self.url, {"fields": "url,omschrijving"})
+                sql = self.get_zaak_query(context)
+                columns = get_select_columns(sql)
+
+                self.assertLess(columns.count(","), all_columns.count(","))
+                self.assertIn('"omschrijving"', columns)
+                self.assertNotIn('"toelichting"', columns)
+                self.assertNotIn("JOIN", sql)
+                # the zaaktypen aren't prefetched
+                self.assertFalse(
+                    any("catalogi_zaaktype" in query["sql"] for query in context)
+                )
+
+    def test_detail_selects_fewer_columns(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.detail_url, {"fields": "url,omschrijving"})
+
+        sql = self.get_zaak_query(context)
+        self.assertNotIn('"toelichting"', get_select_columns(sql))
+        self.assertNotIn("JOIN", sql)
+        self.assertFalse(any("catalogi_zaaktype" in query["sql"] for query in context))
+
+    def test_fields_include_geometry_in_list(self):
+        response = self.client.get(self.url, {"fields": "url,zaakgeometrie"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for zaak in response.json()["results"]:
+            self.assertEqual(set(zaak), {"url", "zaakgeometrie"})
+
+    def test_unknown_fields(self):
+        response = self.client.get(self.url, {"fields": "url,onbekend"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["invalidParams"][0]["name"], "fields")
@@ -0,0 +1,108 @@
+import json
+import tracemalloc
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlsplit
+
+from django.urls import reverse_lazy
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework.utils.urls import remove_query_param
+
+from ..api.viewsets import ZaakViewSet
+from ..models import Zaak
+from .factories import ZaakFactory
+
+
+def _consume(response) -> dict:
+    return json.loads(b"".join(response.streaming_content))
+
+
+class StreamingListTests(APITestCase):
+    url = reverse_lazy("zaak-list", kwargs={"version": "1"})
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        hoofdzaak = ZaakFactory.create()
+        ZaakFactory.create_batch(4, hoofdzaak=hoofdzaak)
+
+    def _assert_same_as_regular(self, params: dict) -> dict:
+        streamed = self.client.get(self.url, {**params, "stream": "true"})
+        self.assertEqual(streamed.status_code, status.HTTP_200_OK)
+        self.assertTrue(streamed.streaming)
+        data = _consume(streamed)
+
+        regular = self.client.get(self.url, params).json()
+
+        self.assertEqual(list(data), ["count", "next", "previous", "results"])
+        for link in ("next", "previous"):
+            if data[link] is not None:
+                data[link] = remove_query_param(data[link], "stream")
+        self.assertEqual(data, regular)
+        return data
+
+    def test_same_output_as_regular_list(self):
+        with patch.object(ZaakViewSet, "stream_chunk_size", 2):
+            for params in (
+                {},
+                {"pageSize": 2},
+                {"pageSize": 2, "page": 3},
+                {"pageSize": 4, "page": 2},
+            ):
+                with self.subTest(params=params):
+                    self._assert_same_as_regular(params)
+
+    def test_same_output_in_cursor_mode(self):
+        first = self._assert_same_as_regular({"cursor": "", "pageSize": 2})
+
+        (cursor,) = parse_qs(urlsplit(first["next"]).query)["cursor"]
+        self._assert_same_as_regular({"cursor": cursor, "pageSize": 2})
+
+    def test_count_headers(self):
+        response = self.client.get(self.url, {"stream": "true"})
+
+        self.assertEqual(response["X-Count-Strategy"], "exact")
+        self.assertEqual(response["X-Accel-Buffering"], "no")
+
+    def test_invalid_page(self):
+        response = self.client.get(self.url, {"stream": "true", "page": 10})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class StreamingMemoryTests(APITestCase):
+    url = reverse_lazy("zaak-list", kwargs={"version": "1"})
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Zaak.objects.bulk_create(
+            Zaak(toelichting="x" * 1000, omschrijving=f"zaak {i}") for i in range(400)
+        )
+
+    def _peak_memory(self, page_size: int) -> int:
+        tracemalloc.start()
+        try:
+            response = self.client.get(
+                self.url, {"stream": "true", "pageSize": page_size}
+            )
+            size = 0
+            for chunk in response.streaming_content:
+                size += len(chunk)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertGreater(size, page_size * 1000)
+        return peak
+
+    @patch.object(ZaakViewSet, "stream_chunk_size", 25)
+    def test_memory_is_flat_when_page_size_grows(self):
+        self._peak_memory(25)  # warm up caches, e.g. URL resolving
+
+        small = self._peak_memory(50)
+        large = self._peak_memory(400)
+
+        # 8x the objects; the page of primary keys grows, but nothing else does
+        self.assertLess(large, small * 1.5)
@@ -64,6 +64,42 @@ DATABASES = {
     }
 }
 
+# A pool of database connections per process, shared by its threads, instead of a
+# (persistent) connection per thread. Requires psycopg 3 and excludes persistent
+# connections, see ``docs/install/production.rst``.
+DB_POOL_ENABLED = config("DB_POOL_ENABLED", default=False)
+if DB_POOL_ENABLED:
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": config("DB_POOL_MIN_SIZE", default=2),
+            "max_size": config("DB_POOL_MAX_SIZE", default=10),
+            # seconds a request waits for a free connection, before it fails
+            "timeout": config("DB_POOL_TIMEOUT", default=10),
+            # seconds after which connections above ``min_size`` are closed
+            "max_idle": config("DB_POOL_MAX_IDLE", default=60 * 10),
+        }
+    }
+
+# Read replicas of the default database, as comma separated ``host`` or ``host:port``
+# with the credentials of the default database. The safe requests to the API read
+# from a random replica, see ``docs/install/production.rst``.
+DB_REPLICA_HOSTS = config("DB_REPLICA_HOSTS", default=[], split=True)
+for number, replica_host in enumerate(DB_REPLICA_HOSTS):
+    host, _, port = replica_host.partition(":")
+    DATABASES[f"replica_{number}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": int(port) if port else DATABASES["default"]["PORT"],
+        # the tests don't have replication
+        "TEST": {"MIRROR": "default"},
+    }
+DB_REPLICAS = [f"replica_{number}" for number in range(len(DB_REPLICA_HOSTS))]
+# seconds a client reads from the default database after a write, so it reads its
+# own writes before they are replicated
+DB_REPLICA_STICKY_TTL = config("DB_REPLICA_STICKY_TTL", default=10)
+
+DATABASE_ROUTERS = ["openzaak_new.utils.db.ReplicaRouter"]
+
 DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
 
 CACHES = {
@@ -98,6 +134,8 @@ INSTALLED_APPS = INSTALLED_APPS + [
 ]
 
 MIDDLEWARE = [
+    # first, so the other middleware is measured as well
+    "openzaak_new.utils.middleware.PerformanceMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     # 'django.middleware.locale.LocaleMiddleware',
@@ -109,6 +147,7 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "hijack.middleware.HijackUserMiddleware",
     "openzaak_new.utils.middleware.APIVersionHeaderMiddleware",
+    "openzaak_new.utils.middleware.ReadReplicaMiddleware",
     # should be last according to docs
     "axes.middleware.AxesMiddleware",
 ]
@@ -264,6 +303,11 @@ LOGGING = {
             "level": "INFO",
             "propagate": True,
         },
+        "performance": {
+            "handlers": ["performance"] if not LOG_STDOUT else ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
 
@@ -477,3 +521,40 @@ REST_FRAMEWORK = BASE_REST_FRAMEWORK.copy()
 APPEND_SLASH = False
 
 ZAKEN_API_VERSION = "1.5.1"
+
+# Caching of the Zaken API list and detail responses
+ZAKEN_RESPONSE_CACHE_ENABLED = config("ZAKEN_RESPONSE_CACHE_ENABLED", default=True)
+ZAKEN_RESPONSE_CACHE_ALIAS = "default"
+ZAKEN_RESPONSE_CACHE_TIMEOUT = config(
+    "ZAKEN_RESPONSE_CACHE_TIMEOUT", default=60 * 5
+)  # in seconds
+
+# Serialize the Zaken list from ``QuerySet.values()`` rows instead of model instances
+ZAKEN_VALUES_LIST_ENABLED = config("ZAKEN_VALUES_LIST_ENABLED", default=True)
+
+# Serve the Zaken list and detail as coroutines, enabled by default by ``asgi.py``
+ZAKEN_ASYNC_VIEWS = config("ZAKEN_ASYNC_VIEWS", default=False)
+
+# Leave ``zaakgeometrie`` out of the Zaken list, unless ``?expand=zaakgeometrie`` is given
+ZAKEN_LIST_LAZY_GEOMETRY = config("ZAKEN_LIST_LAZY_GEOMETRY", default=True)
+
+# Remote objects of loose FKs (e.g. external zaaktypen) are cached in the process and
+# in the cache, see ``openzaak_new.utils.loaders``
+DEFAULT_LOOSE_FK_LOADER = "openzaak_new.utils.loaders.CachedServiceLoader"
+LOOSE_FK_CACHE_ALIAS = "default"
+LOOSE_FK_CACHE_TIMEOUT = config("LOOSE_FK_CACHE_TIMEOUT", default=60 * 15)  # in seconds
+LOOSE_FK_LOCAL_CACHE_SIZE = config("LOOSE_FK_LOCAL_CACHE_SIZE", default=1000)
+LOOSE_FK_LOCAL_CACHE_TIMEOUT = config(
+    "LOOSE_FK_LOCAL_CACHE_TIMEOUT", default=60
+)  # in seconds
+LOOSE_FK_PREFETCH_WORKERS = config("LOOSE_FK_PREFETCH_WORKERS", default=8)
+
+# The zgw-consumers services are cached in every process, see
+# ``openzaak_new.utils.services``. Changes are picked up by the other processes after
+# this many seconds
+SERVICE_CACHE_TIMEOUT = config("SERVICE_CACHE_TIMEOUT", default=60)  # in seconds
+
+# Fraction of the requests the ``PerformanceMiddleware`` logs metrics of, 0 disables it
+PERFORMANCE_SAMPLE_RATE = config("PERFORMANCE_SAMPLE_RATE", default=0.1)
+# Add the metrics as ``Server-Timing`` header to the measured responses
+PERFORMANCE_SERVER_TIMING = config("PERFORMANCE_SERVER_TIMING", default=False)
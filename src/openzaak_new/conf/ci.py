@@ -1,8 +1,19 @@
+# ruff: noqa: F403,F405
 import os
 
 os.environ.setdefault("IS_HTTPS", "no")
 os.environ.setdefault("SECRET_KEY", "dummy")
 os.environ.setdefault("ENVIRONMENT", "CI")
 os.environ.setdefault("SENDFILE_BACKEND", "django_sendfile.backends.simple")
+# the cache isn't reset between the tests, the tests of the cached responses enable
+# it with a local memory cache
+os.environ.setdefault("ZAKEN_RESPONSE_CACHE_ENABLED", "no")
 
 from .base import *  # noqa isort:skip
+
+# a second database standing in for a read replica, in the tests of the routing to the
+# replicas (``DB_REPLICAS``)
+DATABASES["replica"] = {
+    **DATABASES["default"],
+    "TEST": {"NAME": f"test_{DATABASES['default']['NAME']}_replica"},
+}
@@ -16,6 +16,8 @@ os.environ.setdefault("DB_USER", "openzaak_new")
 os.environ.setdefault("DB_PASSWORD", "openzaak_new")
 
 os.environ.setdefault("ENVIRONMENT", "development")
+os.environ.setdefault("PERFORMANCE_SAMPLE_RATE", "1")
+os.environ.setdefault("PERFORMANCE_SERVER_TIMING", "yes")
 
 from .base import *  # noqa isort:skip
 
@@ -13,6 +13,9 @@ os.environ.setdefault("DB_PASSWORD", "jenkins")
 os.environ.setdefault("DB_PORT", "5432")
 
 os.environ.setdefault("ENVIRONMENT", "jenkins")
+# the cache isn't reset between the tests, the tests of the cached responses enable
+# it with a local memory cache
+os.environ.setdefault("ZAKEN_RESPONSE_CACHE_ENABLED", "no")
 
 from .base import *  # noqa isort:skip
 
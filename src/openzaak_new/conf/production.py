@@ -13,12 +13,16 @@ os.environ.setdefault("CACHE_DEFAULT", "127.0.0.1:6379/2")
 
 from .base import *  # noqa isort:skip
 
-# Make use of persistent connections for better database performance
-# If not specified database connections are closed at the end of each request
+# Make use of persistent connections for better database performance, instead of
+# opening a new connection (with its PostGIS type lookups) for every request. A
+# connection is checked before a request reuses it, so a connection that was closed by
+# the database server in the meantime is replaced instead of failing the request.
+# Connections are not persistent with a connection pool (DB_POOL_ENABLED).
 for db_config in DATABASES.values():
-    db_config["CONN_MAX_AGE"] = config(
-        "DB_CONN_MAX_AGE", default=0
+    db_config["CONN_MAX_AGE"] = (
+        0 if DB_POOL_ENABLED else config("DB_CONN_MAX_AGE", default=60)
     )  # Lifetime of a database connection in seconds
+    db_config["CONN_HEALTH_CHECKS"] = config("DB_CONN_HEALTH_CHECKS", default=True)
 
 # Caching sessions.
 SESSION_ENGINE = "django.contrib.sessions.backends.cache"
@@ -9,6 +9,7 @@ import os
 os.environ.setdefault("ENVIRONMENT", "test")
 # NOTE: watch out for multiple projects using the same cache!
 os.environ.setdefault("CACHE_DEFAULT", "127.0.0.1:6379/0")
+os.environ.setdefault("ZAKEN_RESPONSE_CACHE_ENABLED", "no")
 
 from .production import *  # noqa isort:skip
 
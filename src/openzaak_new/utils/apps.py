@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class UtilsConfig(AppConfig):
     name = "openzaak_new.utils"
+
+    def ready(self):
+        from . import services  # noqa
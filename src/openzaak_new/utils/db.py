@@ -0,0 +1,104 @@
+import logging
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+_replica: ContextVar[str | None] = ContextVar("replica", default=None)
+
+
+@contextmanager
+def replica_reads(alias: str | None = None) -> Iterator[str | None]:
+    """
+    Route the reads in this context to the read replica ``alias``, a random one of
+    ``DB_REPLICAS`` by default, see :class:`ReplicaRouter`. Yields the replica, or
+    ``None`` without replicas.
+
+    A single replica serves all reads of the context, since every replica lags
+    behind by its own amount. The context is copied to the threads of
+    ``sync_to_async``, so this covers the queries of async views as well.
+    """
+    if alias is None and settings.DB_REPLICAS:
+        alias = random.choice(settings.DB_REPLICAS)
+    token = _replica.set(alias)
+    try:
+        yield alias
+    finally:
+        _replica.reset(token)
+
+
+def get_replica() -> str | None:
+    """
+    Return the replica the reads of this context are routed to.
+    """
+    alias = _replica.get()
+    return alias if alias in settings.DB_REPLICAS else None
+
+
+def reads_from_replica() -> bool:
+    return get_replica() is not None
+
+
+class ReplicaRouter:
+    """
+    Route the reads inside :func:`replica_reads` to its replica of ``DB_REPLICAS``,
+    and everything else to the default database.
+
+    Reads in a transaction stay on the default database, so they see the writes of
+    that transaction. The replicas are copies of the default database, relations
+    between their objects are allowed and their schema is migrated by the
+    replication.
+    """
+
+    def db_for_read(self, model, **hints) -> str | None:
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return get_replica()
+
+    def db_for_write(self, model, **hints) -> str:
+        # also for objects that were read from a replica
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool | None:
+        databases = {DEFAULT_DB_ALIAS, *settings.DB_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+def warm_up_connections() -> None:
+    """
+    Open the database connections of a worker process before it handles its first
+    request, so that request doesn't wait on the connection setup.
+
+    Only persistent connections (``CONN_MAX_AGE``) and connection pools are warmed up,
+    others would be closed again when the first request starts. The connection is
+    local to the thread this is called in, e.g. the main thread of a single threaded
+    uwsgi worker, while a pool is shared by all threads of the process.
+
+    Call this after the worker process is forked, connections can't be shared
+    between processes.
+    """
+    for connection in connections.all():
+        pooled = bool(connection.settings_dict["OPTIONS"].get("pool"))
+        if not pooled and not connection.settings_dict["CONN_MAX_AGE"]:
+            continue
+
+        try:
+            connection.ensure_connection()
+        except DatabaseError:
+            logger.warning(
+                "Could not warm up the connection to database '%s'",
+                connection.alias,
+                exc_info=True,
+            )
+            continue
+
+        if pooled:
+            # the pool keeps its ``min_size`` connections open
+            connection.close()
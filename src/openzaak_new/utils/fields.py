@@ -0,0 +1,82 @@
+import json
+
+from django.contrib.gis.db.models import GeometryField
+from django.contrib.gis.db.models.functions import AsGeoJSON
+from django.contrib.gis.gdal import GDALException
+from django.contrib.gis.geos import GEOSException, GEOSGeometry
+from django.db.models import Expression, F, Func, JSONField, Value
+from django.db.models.functions import Cast
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import serializers
+
+# the maximum number of decimal digits of ``ST_AsGeoJSON``
+MAX_GEOJSON_PRECISION = 15
+
+
+def get_geojson_key(source: str) -> str:
+    """
+    The name of the annotation with the GeoJSON of the geometry in ``source``.
+    """
+    return f"{source}_geojson"
+
+
+def as_geojson(
+    source: str, simplify: float | None = None, precision: int | None = None
+) -> Expression:
+    """
+    Select the geometry in ``source`` as GeoJSON, encoded by PostGIS.
+
+    :param simplify: the tolerance of ``ST_SimplifyPreserveTopology``, in the units of
+      the coordinates.
+    :param precision: the number of decimal digits of the coordinates.
+    """
+    geometry = F(source)
+    if simplify:
+        geometry = Func(
+            geometry,
+            Value(simplify),
+            function="ST_SimplifyPreserveTopology",
+            output_field=GeometryField(),
+        )
+    if precision is None:
+        precision = MAX_GEOJSON_PRECISION
+    # as jsonb, so the GeoJSON is decoded by the database driver
+    return Cast(AsGeoJSON(geometry, precision=precision), output_field=JSONField())
+
+
+class GeoJSONGeometryField(serializers.Field):
+    """
+    A geometry as GeoJSON.
+
+    The geometry is encoded in Python, unless the GeoJSON was selected from the
+    database with :func:`as_geojson` as the annotation named by
+    :func:`get_geojson_key`.
+    """
+
+    default_error_messages = {
+        "invalid": _("Enter a valid GeoJSON geometry."),
+    }
+
+    def get_attribute(self, instance):
+        key = get_geojson_key(self.source)
+        if key in instance.__dict__:
+            return instance.__dict__[key]
+        return super().get_attribute(instance)
+
+    def to_internal_value(self, data) -> GEOSGeometry:
+        if not isinstance(data, dict):
+            self.fail("invalid")
+        try:
+            geometry = GEOSGeometry(json.dumps(data))
+        except (ValueError, TypeError, GEOSException, GDALException):
+            self.fail("invalid")
+        if not geometry.valid:
+            self.fail("invalid")
+        return geometry
+
+    def to_representation(self, value) -> dict:
+        if isinstance(value, GEOSGeometry):
+            return json.loads(value.json)
+        # already GeoJSON
+        return value
@@ -0,0 +1,200 @@
+"""
+Loader for the remote objects of loose foreign keys, e.g. the external zaaktype of
+a zaak (:class:`~openzaak_new.components.zaken.models.FkOrServiceUrlField`).
+
+``django-loose-fk`` fetches the remote object every time the field is read.
+:class:`CachedServiceLoader` keeps the fetched documents in two tiers instead:
+
+* a small LRU cache in the process, whose entries expire after
+  ``LOOSE_FK_LOCAL_CACHE_TIMEOUT`` seconds
+* the ``LOOSE_FK_CACHE_ALIAS`` cache (Redis), shared between the processes, whose
+  entries expire after ``LOOSE_FK_CACHE_TIMEOUT`` seconds
+
+Concurrent reads of the same URL in a process share a single fetch, and
+:meth:`CachedServiceLoader.prefetch` fetches all distinct URLs of e.g. a page in
+parallel, so reading them afterwards doesn't wait on the network.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from time import monotonic
+from typing import Iterable
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.db import models
+
+from django_loose_fk.loaders import BaseLoader, FetchError, FetchJsonError
+from requests import RequestException
+from zgw_consumers.client import build_client
+from zgw_consumers.concurrent import parallel
+from zgw_consumers.models import Service
+
+from .services import service_cache
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    Thread safe LRU cache of at most ``maxsize`` entries, which expire ``timeout``
+    seconds after they were set.
+    """
+
+    def __init__(self, maxsize: int, timeout: float):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._entries: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires <= monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value) -> None:
+        with self._lock:
+            self._entries[key] = (monotonic() + self.timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class CachedServiceLoader(BaseLoader):
+    """
+    Fetch remote objects with the client of their configured
+    :class:`~zgw_consumers.models.Service`, through the local and the shared cache.
+    """
+
+    def __init__(self):
+        self.local_cache = TTLCache(
+            settings.LOOSE_FK_LOCAL_CACHE_SIZE, settings.LOOSE_FK_LOCAL_CACHE_TIMEOUT
+        )
+        self._pending: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self) -> BaseCache:
+        return caches[settings.LOOSE_FK_CACHE_ALIAS]
+
+    def get_cache_key(self, url: str) -> str:
+        return f"loose-fk:{hashlib.sha256(url.encode('utf-8')).hexdigest()}"
+
+    def fetch_object(self, url: str, service: Service | None = None) -> dict:
+        if (data := self.local_cache.get(url)) is not None:
+            return data
+
+        with self._lock:
+            future = self._pending.get(url)
+            if fetching := future is None:
+                future = self._pending[url] = Future()
+
+        # another thread is fetching the same URL already
+        if not fetching:
+            return future.result()
+
+        try:
+            data = self.cache.get(self.get_cache_key(url))
+            if data is None:
+                data = self.fetch_remote_object(url, service)
+                self.cache.set(
+                    self.get_cache_key(url),
+                    data,
+                    timeout=settings.LOOSE_FK_CACHE_TIMEOUT,
+                )
+            self.local_cache.set(url, data)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(data)
+            return data
+        finally:
+            with self._lock:
+                del self._pending[url]
+
+    def fetch_remote_object(self, url: str, service: Service | None = None) -> dict:
+        service = service or service_cache.get_for_url(url)
+        if service is None:
+            raise FetchError(f"No service is configured for {url}")
+
+        try:
+            with build_client(service) as client:
+                response = client.get(url)
+                response.raise_for_status()
+        except RequestException as exc:
+            raise FetchError(str(exc)) from exc
+
+        try:
+            return response.json()
+        except ValueError as exc:
+            raise FetchJsonError(str(exc)) from exc
+
+    def prefetch(self, urls: Iterable[str]) -> None:
+        """
+        Fetch the distinct remote URLs that aren't cached in the process yet, in
+        parallel.
+
+        Failing fetches are only logged, reading the object raises the error.
+        """
+        urls = {
+            url
+            for url in urls
+            if url and not self.is_local_url(url) and self.local_cache.get(url) is None
+        }
+        if not urls:
+            return
+
+        keys = {self.get_cache_key(url): url for url in urls}
+        for key, data in self.cache.get_many(keys).items():
+            self.local_cache.set(keys[key], data)
+            urls.discard(keys[key])
+        if not urls:
+            return
+
+        # the services are looked up here, the threads don't use the database
+        services = {url: service_cache.get_for_url(url) for url in urls}
+
+        def fetch(url: str) -> None:
+            try:
+                self.fetch_object(url, services[url])
+            except (FetchError, FetchJsonError):
+                logger.warning("Prefetching %s failed", url, exc_info=True)
+
+        workers = min(len(urls), settings.LOOSE_FK_PREFETCH_WORKERS)
+        with parallel(max_workers=workers) as executor:
+            list(executor.map(fetch, sorted(urls)))
+
+
+def prefetch_loose_fk(objects: Iterable[models.Model], field_name: str) -> None:
+    """
+    Prefetch the remote objects of the loose FK ``field_name`` of ``objects``, e.g.
+    the external zaaktypen of a page of zaken.
+    """
+    objects = list(objects)
+    if not objects:
+        return
+
+    field = objects[0]._meta.get_field(field_name)
+    if not isinstance(field.loader, CachedServiceLoader):
+        return
+
+    field.loader.prefetch(
+        getattr(obj, field.url_field)
+        for obj in objects
+        if getattr(obj, field._fk_field.attname) is None
+    )
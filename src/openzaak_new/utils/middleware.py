@@ -1,11 +1,17 @@
 # SPDX-License-Identifier: EUPL-1.2
 # Copyright (C) 2019 - 2020 Dimpact
+import logging
 import os
+import random
+from time import perf_counter, time
 from typing import Dict, Optional
 
 from django.conf import settings
-from django.http import HttpResponse
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse, StreamingHttpResponse
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
 from vng_api_common.middleware import (
@@ -13,6 +19,11 @@ from vng_api_common.middleware import (
     APIVersionHeaderMiddleware as _APIVersionHeaderMiddleware,
 )
 
+from .db import replica_reads
+from .performance import RequestMetrics, ameasure, measure
+
+performance_logger = logging.getLogger("performance")
+
 
 def reverse_with_version(api: str, version: Optional[str] = None) -> str:
     """Helper to reverse API root with version injected."""
@@ -32,17 +43,28 @@ def get_version_mapping() -> Dict[str, str]:
 
 
 class APIVersionHeaderMiddleware(_APIVersionHeaderMiddleware):
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.version_mapping = get_version_mapping()
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
         if self.get_response is None:
             return None
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
 
-        response = self.get_response(request)
+        return self.process_response(request, self.get_response(request))
 
-        if not isinstance(response, Response):
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        if not isinstance(response, (Response, StreamingHttpResponse)):
             return response
 
         version = self._get_version(request.path)
@@ -58,6 +80,215 @@ class APIVersionHeaderMiddleware(_APIVersionHeaderMiddleware):
         return None
 
 
+class PerformanceMiddleware:
+    """
+    Log the number of queries, the database and serializer time, the response size
+    and the view of requests to the ``performance`` logger, as one line of
+    ``key=value`` pairs per request. The values are also passed in the ``extra`` of
+    the log record.
+
+    Only a ``PERFORMANCE_SAMPLE_RATE`` fraction of the requests is measured, the
+    others pass through untouched. With ``PERFORMANCE_SERVER_TIMING``, measured
+    responses get a ``Server-Timing`` header with the same timings.
+
+    The body of streaming responses is produced after the middleware returns, so
+    their size and the time spent streaming are left out.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if settings.PERFORMANCE_SAMPLE_RATE <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if random.random() >= settings.PERFORMANCE_SAMPLE_RATE:
+            return self.get_response(request)
+
+        start = perf_counter()
+        with measure() as metrics:
+            response = self.get_response(request)
+        return self.log_metrics(request, response, metrics, perf_counter() - start)
+
+    async def __acall__(self, request):
+        if random.random() >= settings.PERFORMANCE_SAMPLE_RATE:
+            return await self.get_response(request)
+
+        start = perf_counter()
+        async with ameasure() as metrics:
+            response = await self.get_response(request)
+        return self.log_metrics(request, response, metrics, perf_counter() - start)
+
+    def log_metrics(self, request, response, metrics: RequestMetrics, duration: float):
+        values = self.get_values(request, response, metrics, duration)
+        performance_logger.info(
+            " ".join(f"{key}={value}" for key, value in values.items()),
+            extra={"performance": values},
+        )
+        if settings.PERFORMANCE_SERVER_TIMING:
+            response["Server-Timing"] = self.get_server_timing(metrics, duration)
+        return response
+
+    def get_values(
+        self, request, response, metrics: RequestMetrics, duration: float
+    ) -> dict:
+        resolver_match = request.resolver_match
+        return {
+            "method": request.method,
+            "path": request.path,
+            "view": resolver_match.view_name if resolver_match else "-",
+            "status": response.status_code,
+            "duration": round(duration * 1000, 2),
+            "queries": metrics.queries.count,
+            "db": round(metrics.queries.duration * 1000, 2),
+            **{
+                name: round(timing * 1000, 2)
+                for name, timing in metrics.timings.items()
+            },
+            "size": "-" if response.streaming else len(response.content),
+        }
+
+    def get_server_timing(self, metrics: RequestMetrics, duration: float) -> str:
+        timings = [
+            f"db;dur={metrics.queries.duration * 1000:.2f};"
+            f'desc="{metrics.queries.count} queries"',
+            *(
+                f"{name};dur={timing * 1000:.2f}"
+                for name, timing in metrics.timings.items()
+            ),
+            f"total;dur={duration * 1000:.2f}",
+        ]
+        return ", ".join(timings)
+
+
+class ReadReplicaMiddleware:
+    """
+    Send the database reads of safe requests to the API to the read replicas
+    (``DB_REPLICAS``).
+
+    The replicas lag behind the default database, so after a successful write a client
+    reads from the default database for ``DB_REPLICA_STICKY_TTL`` seconds. The
+    response of the write has a ``primary_until`` cookie and a ``Primary-Until``
+    header with the end of that period (a Unix timestamp), which the client sends
+    back as cookie or as header.
+    """
+
+    sync_capable = True
+    async_capable = True
+    cookie_name = "primary_until"
+    header_name = "Primary-Until"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.api_roots = tuple(get_version_mapping())
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.reads_from_replica(request):
+            return self.process_response(request, self.get_response(request))
+
+        with replica_reads() as alias:
+            response = self.get_response(request)
+        return self.stream_from_replica(response, alias)
+
+    async def __acall__(self, request):
+        if not self.reads_from_replica(request):
+            return self.process_response(request, await self.get_response(request))
+
+        with replica_reads() as alias:
+            response = await self.get_response(request)
+        return self.stream_from_replica(response, alias)
+
+    def stream_from_replica(self, response, alias: str):
+        """
+        Keep reading from the same replica while the body of a streaming response is
+        produced, which is after the middleware returned.
+        """
+        if not response.streaming:
+            return response
+
+        content = response.streaming_content
+        if response.is_async:
+            response.streaming_content = self._astream(content, alias)
+        else:
+            response.streaming_content = self._stream(content, alias)
+        return response
+
+    @staticmethod
+    def _stream(content, alias: str):
+        iterator = iter(content)
+        while True:
+            # the context is entered per chunk, the server may switch contexts in
+            # between
+            with replica_reads(alias):
+                chunk = next(iterator, None)
+            if chunk is None:
+                return
+            yield chunk
+
+    @staticmethod
+    async def _astream(content, alias: str):
+        iterator = aiter(content)
+        while True:
+            with replica_reads(alias):
+                chunk = await anext(iterator, None)
+            if chunk is None:
+                return
+            yield chunk
+
+    def reads_from_replica(self, request) -> bool:
+        return (
+            bool(settings.DB_REPLICAS)
+            and request.method in SAFE_METHODS
+            and request.path.startswith(self.api_roots)
+            and not self.is_sticky(request)
+        )
+
+    def is_sticky(self, request) -> bool:
+        value = request.COOKIES.get(self.cookie_name) or request.headers.get(
+            self.header_name
+        )
+        try:
+            until = float(value)
+        except (TypeError, ValueError):
+            return False
+
+        now = time()
+        # a client can't keep itself on the default database for longer
+        return now < until <= now + settings.DB_REPLICA_STICKY_TTL
+
+    def process_response(self, request, response):
+        if (
+            not settings.DB_REPLICAS
+            or request.method in SAFE_METHODS
+            or not request.path.startswith(self.api_roots)
+            or response.status_code >= 400
+        ):
+            return response
+
+        ttl = settings.DB_REPLICA_STICKY_TTL
+        until = f"{time() + ttl:.3f}"
+        response[self.header_name] = until
+        response.set_cookie(
+            self.cookie_name,
+            until,
+            max_age=ttl,
+            secure=request.is_secure(),
+            httponly=True,
+            samesite="Lax",
+        )
+        return response
+
+
 class PyInstrumentMiddleware:  # pragma:no cover
     """
     Middleware that's included in dev environments if `USE_PYINSTRUMENT=true`,
@@ -0,0 +1,135 @@
+"""
+Per request performance metrics, see :class:`~openzaak_new.utils.middleware.PerformanceMiddleware`.
+
+The metrics of the current request are kept in a context variable, so code anywhere
+in the request can add a timing with :func:`timed` without passing the request
+around. Outside of a measured request, :func:`timed` does nothing.
+"""
+
+import traceback
+from collections import defaultdict
+from contextlib import ExitStack, asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import AsyncIterator, Iterator
+
+from django.db import connections
+
+from asgiref.sync import sync_to_async
+from rest_framework import serializers
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper that counts the queries and their duration.
+
+    With ``capture=True``, the SQL and the stack of every query are kept as well.
+    """
+
+    def __init__(self, capture: bool = False):
+        self.capture = capture
+        self.count = 0
+        self.duration = 0.0
+        self.queries: list[tuple[str, traceback.StackSummary]] = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += perf_counter() - start
+            if self.capture:
+                self.queries.append((sql, traceback.extract_stack()[:-1]))
+
+    @contextmanager
+    def record(self, using: str | None = None) -> Iterator["QueryRecorder"]:
+        """
+        Record the queries on the ``using`` database, or on all databases.
+        """
+        aliases = [using] if using else list(connections)
+        with ExitStack() as stack:
+            for alias in aliases:
+                stack.enter_context(connections[alias].execute_wrapper(self))
+            yield self
+
+
+@dataclass
+class RequestMetrics:
+    queries: QueryRecorder = field(default_factory=QueryRecorder)
+    timings: dict[str, float] = field(default_factory=lambda: defaultdict(float))
+
+
+_metrics: ContextVar[RequestMetrics | None] = ContextVar("metrics", default=None)
+
+
+@contextmanager
+def measure() -> Iterator[RequestMetrics]:
+    """
+    Collect the metrics of the code in the block.
+    """
+    metrics = RequestMetrics()
+    token = _metrics.set(metrics)
+    try:
+        with metrics.queries.record():
+            yield metrics
+    finally:
+        _metrics.reset(token)
+
+
+@asynccontextmanager
+async def ameasure() -> AsyncIterator[RequestMetrics]:
+    """
+    Async variant of :func:`measure`.
+
+    The connections are local to the thread, so the queries are recorded in the
+    thread the sync code of the request runs in (``sync_to_async``).
+    """
+    metrics = RequestMetrics()
+    token = _metrics.set(metrics)
+    recording = ExitStack()
+    try:
+        await sync_to_async(recording.enter_context)(metrics.queries.record())
+        yield metrics
+    finally:
+        await sync_to_async(recording.close)()
+        _metrics.reset(token)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """
+    Add the duration of the block to the ``name`` timing of the measured request.
+    """
+    metrics = _metrics.get()
+    if metrics is None:
+        yield
+        return
+
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        metrics.timings[name] += perf_counter() - start
+
+
+class TimedListSerializer(serializers.ListSerializer):
+    @property
+    def data(self):
+        with timed("serialize"):
+            return super().data
+
+
+class TimedSerializerMixin:
+    """
+    Add the time spent in ``serializer.data`` to the ``serialize`` timing.
+
+    Set ``list_serializer_class = TimedListSerializer`` in the ``Meta`` of the
+    serializer to time lists as well.
+    """
+
+    @property
+    def data(self):
+        with timed("serialize"):
+            return super().data
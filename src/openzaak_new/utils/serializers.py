@@ -0,0 +1,705 @@
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+from types import SimpleNamespace
+from typing import Any, Callable, NamedTuple
+
+from django.contrib.postgres.expressions import ArraySubquery
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db.models import (
+    Expression,
+    F,
+    Field,
+    ForeignObjectRel,
+    OuterRef,
+    Prefetch,
+    QuerySet,
+)
+from django.utils.encoding import is_protected_type
+
+from djangorestframework_camel_case.util import camelize
+from rest_framework import ISO_8601, serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import Hyperlink, PKOnlyObject
+from rest_framework.settings import api_settings
+from vng_api_common.descriptors import GegevensGroepType
+from vng_api_common.serializers import CacheMixin, GegevensGroepSerializer
+
+from .fields import GeoJSONGeometryField, get_geojson_key
+from .url_templates import URLTemplate, get_url_template
+
+Getter = Callable[[Any], Any]
+Converter = Callable[[Any], Any]
+# builds the getter and converter of a field, given the field of the serializer
+# instance that is being rendered
+FieldStep = Callable[[serializers.Field], tuple[Getter, Converter]]
+
+
+@lru_cache
+def get_readable_field_names(
+    serializer_class: type[serializers.Serializer],
+) -> tuple[str, ...]:
+    return tuple(
+        name
+        for name, field in serializer_class().fields.items()
+        if not field.write_only
+    )
+
+
+@lru_cache
+def get_field_names_by_key(
+    serializer_class: type[serializers.Serializer],
+) -> dict[str, str]:
+    """
+    Map the keys of the readable fields in the (camelCase) output to their names.
+    """
+    names = get_readable_field_names(serializer_class)
+    return dict(zip(camelize(dict.fromkeys(names)), names))
+
+
+def _get_readable_fields(
+    serializer_class: type[serializers.Serializer],
+    field_names: frozenset[str] | None,
+):
+    for name, field in serializer_class().fields.items():
+        if field.write_only:
+            continue
+        if field_names is not None and name not in field_names:
+            continue
+        yield name, field
+
+
+@lru_cache
+def get_only_fields(
+    serializer_class: type[serializers.ModelSerializer],
+    select_related: tuple[str, ...] = (),
+    field_names: frozenset[str] | None = None,
+) -> tuple[str, ...]:
+    """
+    Determine which model fields are needed to represent the serializer output.
+
+    The result can be passed to ``QuerySet.only()`` so that only the columns the
+    serializer actually reads are fetched. Relations in ``select_related`` are
+    narrowed down to the lookup field used for their URL, other forward relations
+    only need their FK column (for ``prefetch_related``). Reverse relations are left to ``prefetch_related``.
+
+    :param field_names: limit the result to these serializer fields.
+    """
+    model = serializer_class.Meta.model
+    only = [model._meta.pk.name]
+
+    for _name, field in _get_readable_fields(serializer_class, field_names):
+        # identity fields (``url``) only need the lookup field of the object itself
+        if field.source == "*":
+            only.append(getattr(field, "lookup_field", model._meta.pk.name))
+            continue
+
+        source = field.source.split(".")[0]
+        descriptor = getattr(model, source, None)
+        if isinstance(descriptor, GegevensGroepType):
+            only.extend(model_field.name for model_field in descriptor.mapping.values())
+            continue
+
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            continue
+
+        if not model_field.is_relation:
+            only.append(model_field.name)
+        elif model_field.many_to_one or model_field.one_to_one:
+            if source in select_related:
+                lookup_field = getattr(field, "lookup_field", "pk")
+                only.append(f"{source}__{lookup_field}")
+            else:
+                only.append(model_field.name)
+
+    return tuple(dict.fromkeys(only))
+
+
+def _get_select_related_paths(select_related: dict, prefix: str = "") -> list[str]:
+    paths = []
+    for name, nested in select_related.items():
+        path = f"{prefix}{name}"
+        paths.extend(_get_select_related_paths(nested, f"{path}__") or [path])
+    return paths
+
+
+def prune_related(
+    queryset: QuerySet,
+    serializer_class: type[serializers.ModelSerializer],
+    field_names: frozenset[str] | None,
+) -> QuerySet:
+    """
+    Drop the ``select_related`` and ``prefetch_related`` of the relations that are not
+    read by the serializer fields in ``field_names``.
+
+    Combine this with :func:`get_only_fields` for the same fields, which doesn't
+    select the columns of the dropped relations.
+    """
+    if field_names is None:
+        return queryset
+
+    sources = {
+        field.source.split(".")[0]
+        for _name, field in _get_readable_fields(serializer_class, field_names)
+    }
+
+    select_related = queryset.query.select_related
+    if isinstance(select_related, dict):
+        paths = [
+            path
+            for path in _get_select_related_paths(select_related)
+            if path.split("__")[0] in sources
+        ]
+        queryset = queryset.select_related(None)
+        if paths:
+            queryset = queryset.select_related(*paths)
+
+    lookups = [
+        lookup
+        for lookup in queryset._prefetch_related_lookups
+        if (lookup.prefetch_through if isinstance(lookup, Prefetch) else lookup).split(
+            "__"
+        )[0]
+        in sources
+    ]
+    return queryset.prefetch_related(None).prefetch_related(*lookups)
+
+
+def _identity(value):
+    return value
+
+
+def _date_isoformat(value):
+    return value if isinstance(value, str) else value.isoformat()
+
+
+def _compile_value(field: serializers.Field) -> Converter | None:
+    """
+    Return a function equivalent to ``field.to_representation`` for values that are
+    not ``None``, or ``None`` if the field has no context-free equivalent.
+    """
+    to_representation = type(field).to_representation
+
+    if to_representation is serializers.CharField.to_representation:
+        return str
+
+    if to_representation is serializers.ChoiceField.to_representation:
+        choices = field.choice_strings_to_values
+        return lambda value: value if value == "" else choices.get(str(value), value)
+
+    if to_representation is serializers.DateField.to_representation:
+        output_format = getattr(field, "format", api_settings.DATE_FORMAT)
+        if output_format is None:
+            return _identity
+        if output_format.lower() == ISO_8601:
+            return _date_isoformat
+
+    if to_representation is serializers.ListField.to_representation:
+        child = _compile_value(field.child)
+        if child is not None:
+            return lambda value: [
+                None if item is None else child(item) for item in value
+            ]
+
+    return None
+
+
+def _get_hyperlink_format(field: serializers.HyperlinkedRelatedField) -> str | None:
+    # see ``HyperlinkedRelatedField.to_representation``
+    format = field.context.get("format")
+    if format and field.format and field.format != format:
+        format = field.format
+    return format
+
+
+def _has_url_template(field: serializers.HyperlinkedRelatedField) -> bool:
+    """
+    Check whether the URLs of the field only differ in their lookup value, like the
+    reverse cache of :class:`vng_api_common.serializers.CacheMixin` assumes.
+    """
+    return isinstance(field, CacheMixin) and type(field).get_url is CacheMixin.get_url
+
+
+def _get_url_template(field: serializers.HyperlinkedRelatedField) -> URLTemplate:
+    return get_url_template(
+        field.view_name,
+        field.lookup_url_kwarg,
+        request=field.context["request"],
+        format=_get_hyperlink_format(field),
+        **field.get_extra_reverse_kwargs(),
+    )
+
+
+def _compile_hyperlink(field: serializers.HyperlinkedRelatedField) -> Converter:
+    """
+    Equivalent of ``HyperlinkedRelatedField.to_representation``, with the URL built
+    from a template when possible.
+    """
+    if not _has_url_template(field):
+        request = field.context["request"]
+        format = _get_hyperlink_format(field)
+        get_url, view_name = field.get_url, field.view_name
+
+        def convert(obj):
+            url = get_url(obj, view_name, request, format)
+            return None if url is None else Hyperlink(url, obj)
+
+        return convert
+
+    prefix, suffix = _get_url_template(field)
+    lookup_url_kwarg = field.lookup_url_kwarg
+
+    def convert(obj):
+        # unsaved objects don't have a URL
+        if hasattr(obj, "pk") and obj.pk in (None, ""):
+            return None
+        return Hyperlink(f"{prefix}{getattr(obj, lookup_url_kwarg)}{suffix}", obj)
+
+    return convert
+
+
+def _compile_gegevensgroep(
+    serializer_class: type[serializers.ModelSerializer],
+    nested: GegevensGroepSerializer,
+    get_column: Callable[[str], Getter] = attrgetter,
+) -> Converter:
+    """
+    Read the gegevensgroep from the model columns of its mapping, instead of
+    through the descriptor and the nested serializer.
+    """
+    descriptor = getattr(serializer_class.Meta.model, nested.Meta.gegevensgroep)
+    none_for_empty = descriptor.none_for_empty
+
+    columns = []
+    for name, field in nested.fields.items():
+        if field.write_only:
+            continue
+        convert = _compile_value(field)
+        if convert is None:
+            convert = field.to_representation
+        columns.append((name, get_column(descriptor.mapping[name].name), convert))
+
+    def convert(instance):
+        ret = {}
+        for name, getter, convert_value in columns:
+            value = getter(instance)
+            if none_for_empty and not isinstance(value, bool) and not value:
+                value = None
+            ret[name] = None if value is None else convert_value(value)
+        return ret
+
+    return convert
+
+
+def _get_model_field(model, name: str) -> Field | ForeignObjectRel | None:
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def _get_model_attribute(model, field: serializers.Field) -> Getter | None:
+    """
+    Return a plain attribute getter if ``field.get_attribute`` boils down to reading
+    a model field.
+    """
+    if len(field.source_attrs) != 1:
+        return None
+
+    get_attribute = type(field).get_attribute
+    if get_attribute is serializers.RelatedField.get_attribute:
+        if field.use_pk_only_optimization():
+            return None
+    elif get_attribute is not serializers.Field.get_attribute:
+        return None
+
+    model_field = _get_model_field(model, field.source)
+    if model_field is None:
+        return None
+    if model_field.many_to_many or model_field.one_to_many or not model_field.concrete:
+        return None
+
+    return attrgetter(field.source)
+
+
+def _get_lookup_array(
+    model, field: serializers.ManyRelatedField
+) -> tuple[str, Expression] | None:
+    """
+    Return the name and the expression of an array with the lookup values of the
+    related objects of a hyperlinked reverse relation.
+    """
+    child = field.child_relation
+    model_field = _get_model_field(model, field.source)
+    if (
+        not _has_url_template(child)
+        or model_field is None
+        or not model_field.one_to_many
+    ):
+        return None
+
+    related = model_field.related_model._default_manager.filter(
+        **{model_field.field.name: OuterRef("pk")}
+    )
+    return (
+        f"{field.source}_{child.lookup_url_kwarg}s",
+        ArraySubquery(related.order_by("pk").values(child.lookup_url_kwarg)),
+    )
+
+
+@lru_cache
+def get_lookup_arrays(
+    serializer_class: type[serializers.ModelSerializer],
+    field_names: frozenset[str] | None = None,
+) -> dict[str, Expression]:
+    """
+    Determine the annotations that select the hyperlinked reverse relations of a
+    serializer as arrays of lookup values.
+
+    With these annotations the URLs are built straight from the values by
+    :class:`CompiledRepresentationMixin`, instead of from related objects that have to
+    be prefetched.
+
+    :param field_names: limit the result to these serializer fields.
+    """
+    model = serializer_class.Meta.model
+    annotations = {}
+    for _name, field in _get_readable_fields(serializer_class, field_names):
+        if not isinstance(field, serializers.ManyRelatedField):
+            continue
+        if (lookup_array := _get_lookup_array(model, field)) is not None:
+            key, annotation = lookup_array
+            annotations[key] = annotation
+    return annotations
+
+
+def _compile_field(serializer_class, field: serializers.Field) -> FieldStep:
+    model = serializer_class.Meta.model
+
+    if isinstance(field, serializers.ManyRelatedField) and isinstance(
+        field.child_relation, serializers.HyperlinkedRelatedField
+    ):
+        lookup_array = _get_lookup_array(model, field)
+        key = lookup_array[0] if lookup_array is not None else None
+
+        def many_hyperlinks(field):
+            get_attribute = field.get_attribute
+            convert_child = _compile_hyperlink(field.child_relation)
+            if key is None:
+                return get_attribute, lambda value: [
+                    convert_child(obj) for obj in value
+                ]
+
+            convert_child_value = _compile_hyperlink_value(field.child_relation)
+
+            def get_urls(instance) -> list:
+                # annotated by the queryset, see ``get_lookup_arrays``
+                if key in instance.__dict__:
+                    return [
+                        convert_child_value(item) for item in instance.__dict__[key]
+                    ]
+                return [convert_child(obj) for obj in get_attribute(instance)]
+
+            return get_urls, _identity
+
+        return many_hyperlinks
+
+    getter = _get_model_attribute(model, field)
+    if field.source == "*":
+        getter = _identity
+
+    if isinstance(field, serializers.HyperlinkedRelatedField) and getter is not None:
+        return lambda field: (getter, _compile_hyperlink(field))
+
+    if (
+        isinstance(field, GegevensGroepSerializer)
+        and type(field).to_representation is GegevensGroepSerializer.to_representation
+        and field.source == field.Meta.gegevensgroep
+    ):
+        convert = _compile_gegevensgroep(serializer_class, field)
+        return lambda field: (_identity, convert)
+
+    if getter is not None and not isinstance(field, serializers.RelatedField):
+        if (convert := _compile_value(field)) is not None:
+            return lambda field: (getter, convert)
+        return lambda field: (getter, field.to_representation)
+
+    # anything else goes through the field itself
+    def fallback(field):
+        convert = field.to_representation
+        if isinstance(field, serializers.RelatedField):
+            convert_related = convert
+
+            def convert(value):
+                # mirror the ``None`` check of ``Serializer.to_representation``
+                if isinstance(value, PKOnlyObject) and value.pk is None:
+                    return None
+                return convert_related(value)
+
+        return field.get_attribute, convert
+
+    return fallback
+
+
+def _bind_steps(
+    steps: list[tuple[str, FieldStep]],
+) -> Callable[[serializers.ModelSerializer], Callable[[Any], dict]]:
+    def bind(serializer: serializers.ModelSerializer) -> Callable[[Any], dict]:
+        fields = serializer.fields
+        bound = [(name, *step(fields[name])) for name, step in steps]
+
+        def to_representation(instance) -> dict:
+            ret = {}
+            for name, getter, convert in bound:
+                try:
+                    value = getter(instance)
+                except SkipField:
+                    continue
+                ret[name] = None if value is None else convert(value)
+            return ret
+
+        return to_representation
+
+    return bind
+
+
+@lru_cache
+def compile_representation(
+    serializer_class: type[serializers.ModelSerializer],
+    field_names: frozenset[str] | None = None,
+) -> Callable[[serializers.ModelSerializer], Callable[[Any], dict]]:
+    """
+    Compile the ``to_representation`` of a serializer class into a flat function.
+
+    The readable fields are inspected once per class, and reduced to an attribute
+    getter and a value converter each. Plain model fields are read with
+    :func:`operator.attrgetter` and converted without going through the DRF field,
+    gegevensgroepen are read straight from their columns and hyperlinks are built
+    with the request resolved up front. Fields without such an equivalent fall back
+    to their own ``get_attribute`` and ``to_representation``, so the output is the
+    same as that of the serializer.
+
+    The result is called with a serializer instance (for the request and other
+    context) and returns the function that represents a single instance.
+
+    :param field_names: only represent these serializer fields.
+    """
+    steps = [
+        (name, _compile_field(serializer_class, field))
+        for name, field in _get_readable_fields(serializer_class, field_names)
+    ]
+
+    return _bind_steps(steps)
+
+
+class ValuesRepresentation(NamedTuple):
+    fields: tuple[str, ...]
+    annotations: dict[str, Expression]
+    bind: Callable[[serializers.ModelSerializer], Callable[[dict], dict]]
+
+    def get_queryset(
+        self, queryset: QuerySet, annotations: dict[str, Expression] | None = None
+    ) -> QuerySet:
+        """
+        Turn ``queryset`` into one returning the rows for the representation.
+
+        :param annotations: replace the expressions of some of the annotations, e.g.
+          to select a geometry as GeoJSON with :func:`~.fields.as_geojson`.
+        """
+        if annotations:
+            annotations = {
+                key: annotations.get(key, expression)
+                for key, expression in self.annotations.items()
+            }
+        else:
+            annotations = self.annotations
+        return (
+            queryset.select_related(None)
+            .prefetch_related(None)
+            .values(*self.fields, **annotations)
+        )
+
+
+def _compile_hyperlink_value(field: serializers.HyperlinkedRelatedField) -> Converter:
+    """
+    Build the URL of a hyperlinked field from the value of its lookup field.
+    """
+    prefix, suffix = _get_url_template(field)
+    return lambda value: Hyperlink(f"{prefix}{value}{suffix}", None)
+
+
+def _compile_values_field(
+    serializer_class, field: serializers.Field
+) -> tuple[tuple[str, ...], dict[str, Expression], FieldStep]:
+    """
+    Determine what to select for ``field`` and how to represent it from the row.
+    """
+    model = serializer_class.Meta.model
+
+    if isinstance(field, serializers.ManyRelatedField):
+        if (lookup_array := _get_lookup_array(model, field)) is not None:
+            key, annotation = lookup_array
+
+            def many_hyperlinks(field):
+                convert_child = _compile_hyperlink_value(field.child_relation)
+                return itemgetter(key), lambda value: [
+                    convert_child(item) for item in value
+                ]
+
+            return (), {key: annotation}, many_hyperlinks
+
+    elif isinstance(field, serializers.HyperlinkedRelatedField):
+        if _has_url_template(field):
+            if field.source == "*":
+                key = field.lookup_url_kwarg
+            elif _get_model_attribute(model, field) is not None:
+                key = f"{field.source}__{field.lookup_url_kwarg}"
+            else:
+                key = None
+            if key is not None:
+                return (
+                    (key,),
+                    {},
+                    lambda field: (itemgetter(key), _compile_hyperlink_value(field)),
+                )
+
+    elif isinstance(field, GegevensGroepSerializer):
+        descriptor = getattr(model, field.Meta.gegevensgroep)
+        columns = tuple(model_field.name for model_field in descriptor.mapping.values())
+
+        if type(field).to_representation is GegevensGroepSerializer.to_representation:
+            convert = _compile_gegevensgroep(serializer_class, field, itemgetter)
+            return columns, {}, lambda field: (_identity, convert)
+
+        # a custom representation gets the same input as from the descriptor
+        def get_gegevensgroep(row) -> dict:
+            values = {}
+            for key, model_field in descriptor.mapping.items():
+                value = row[model_field.name]
+                if descriptor.none_for_empty and not isinstance(value, bool):
+                    value = value or None
+                values[key] = value
+            return values
+
+        return columns, {}, lambda field: (get_gegevensgroep, field.to_representation)
+
+    elif isinstance(field, GeoJSONGeometryField):
+        # the geometry itself by default, which can be replaced by its GeoJSON
+        key = get_geojson_key(field.source)
+        return (
+            (),
+            {key: F(field.source)},
+            lambda field: (itemgetter(key), field.to_representation),
+        )
+
+    elif isinstance(field, serializers.ModelField):
+        model_field = field.model_field
+
+        def convert(value):
+            if is_protected_type(value):
+                return value
+            # ``value_to_string`` reads the value from an object
+            return model_field.value_to_string(
+                SimpleNamespace(**{model_field.attname: value})
+            )
+
+        getter = itemgetter(model_field.name)
+        return (model_field.name,), {}, lambda field: (getter, convert)
+
+    elif _get_model_attribute(model, field) is not None:
+        getter = itemgetter(field.source)
+        if (convert := _compile_value(field)) is not None:
+            return (field.source,), {}, lambda field: (getter, convert)
+        return (field.source,), {}, lambda field: (getter, field.to_representation)
+
+    raise ImproperlyConfigured(
+        f"The field '{field.field_name}' of {serializer_class.__name__} can't be "
+        "represented from values."
+    )
+
+
+@lru_cache
+def compile_values_representation(
+    serializer_class: type[serializers.ModelSerializer],
+    field_names: frozenset[str] | None = None,
+) -> ValuesRepresentation:
+    """
+    Compile the ``to_representation`` of a serializer class for ``QuerySet.values()``
+    rows, see :func:`compile_representation`.
+
+    Only the columns that are serialized are selected. Hyperlinks to forward
+    relations select the lookup field of the related object through a join, and
+    hyperlinks to reverse relations are aggregated into an array with a subquery,
+    so no model instances are built and nothing needs to be prefetched.
+
+    :param field_names: only represent these serializer fields.
+    :raises ImproperlyConfigured: if a field can't be represented from a row.
+    """
+    # the primary key is used for the pagination
+    fields = ["pk"]
+    annotations = {}
+    steps = []
+    for name, field in _get_readable_fields(serializer_class, field_names):
+        field_values, field_annotations, step = _compile_values_field(
+            serializer_class, field
+        )
+        fields.extend(field_values)
+        annotations.update(field_annotations)
+        steps.append((name, step))
+
+    return ValuesRepresentation(
+        tuple(dict.fromkeys(fields)), annotations, _bind_steps(steps)
+    )
+
+
+class CompiledRepresentationMixin:
+    """
+    Represent instances with the function from :func:`compile_representation`, or
+    from :func:`compile_values_representation` for rows from
+    :meth:`ValuesRepresentation.get_queryset`.
+
+    This only speeds up the output of the serializer, input is validated and saved
+    as usual.
+    """
+
+    _compiled_representation = None
+    _compiled_values_representation = None
+
+    def to_representation(self, instance):
+        if isinstance(instance, dict):
+            if self._compiled_values_representation is None:
+                self._compiled_values_representation = compile_values_representation(
+                    type(self), self._get_field_names()
+                ).bind(self)
+            return self._compiled_values_representation(instance)
+
+        if self._compiled_representation is None:
+            self._compiled_representation = compile_representation(
+                type(self), self._get_field_names()
+            )(self)
+        return self._compiled_representation(instance)
+
+    def _get_field_names(self) -> frozenset[str] | None:
+        field_names = frozenset(self.fields)
+        # share the compiled representation of all fields, whatever the subset is
+        if field_names.issuperset(get_readable_field_names(type(self))):
+            return None
+        return field_names
+
+
+class SparseFieldsMixin:
+    """
+    Only represent the fields named in ``context["fields"]``, if it's given.
+
+    The view sets the context for responses of a subset of the fields. It should
+    leave the context out for requests with input, since the input is validated
+    with the same fields.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        field_names = self.context.get("fields")
+        if field_names is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in field_names}
@@ -0,0 +1,105 @@
+"""
+In-process cache of the :class:`zgw_consumers.models.Service` records.
+
+External URLs (e.g. of zaaktypen) are stored as a ``Service`` FK and a relative
+URL. Composing the URL reads the service of every object, and decomposing a URL
+into both parts (to store or filter on it) looks up the service with the longest
+matching API root. There are only a handful of services, so all of them are read
+at once and kept in the process, instead of querying them for every object or
+URL.
+
+Saving or deleting a service clears the cache of the process. The other processes
+read the services again after ``SERVICE_CACHE_TIMEOUT`` seconds, or as soon as a
+service or URL is not found, since it may have been created by another process.
+"""
+
+import threading
+from time import monotonic
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from zgw_consumers.models import Service
+
+
+class _Services(NamedTuple):
+    loaded: float
+    expires: float
+    by_pk: dict[int, Service]
+    # the longest API roots first, the most specific one matches a URL
+    by_api_root: list[Service]
+
+
+class ServiceCache:
+    def __init__(self):
+        self._services: _Services | None = None
+        self._lock = threading.Lock()
+
+    def _get_services(self) -> _Services:
+        services = self._services
+        if services is not None and services.expires > monotonic():
+            return services
+        return self._reload(services)
+
+    def _reload(self, stale: _Services | None) -> _Services:
+        with self._lock:
+            # another thread may have read the services already
+            if self._services is stale:
+                all_services = list(Service.objects.all())
+                loaded = monotonic()
+                self._services = _Services(
+                    loaded=loaded,
+                    expires=loaded + settings.SERVICE_CACHE_TIMEOUT,
+                    by_pk={service.pk: service for service in all_services},
+                    by_api_root=sorted(
+                        all_services,
+                        key=lambda service: len(service.api_root),
+                        reverse=True,
+                    ),
+                )
+            return self._services
+
+    def get(self, pk: int) -> Service | None:
+        start = monotonic()
+        services = self._get_services()
+        # unless they were read just now, the service may have been created by
+        # another process since
+        if pk not in services.by_pk and services.loaded < start:
+            services = self._reload(services)
+        return services.by_pk.get(pk)
+
+    def get_for_url(self, url: str) -> Service | None:
+        """
+        Return the service with the longest API root the ``url`` starts with, like
+        :meth:`Service.get_service`.
+        """
+        start = monotonic()
+        services = self._get_services()
+        service = self._match(services, url)
+        if service is None and services.loaded < start:
+            service = self._match(self._reload(services), url)
+        return service
+
+    @staticmethod
+    def _match(services: _Services, url: str) -> Service | None:
+        for service in services.by_api_root:
+            if url.startswith(service.api_root):
+                return service
+        return None
+
+    def clear(self) -> None:
+        self._services = None
+
+
+service_cache = ServiceCache()
+
+
+@receiver(post_save, sender=Service, dispatch_uid="services.clear_cache_on_save")
+@receiver(post_delete, sender=Service, dispatch_uid="services.clear_cache_on_delete")
+def clear_cache(sender, **kwargs):
+    service_cache.clear()
+    # the cache may have been filled by another thread before the change committed
+    transaction.on_commit(service_cache.clear)
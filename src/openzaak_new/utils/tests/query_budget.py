@@ -0,0 +1,54 @@
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from django.conf import settings
+
+from ..performance import QueryRecorder
+
+HARNESS_FILES = {__file__, str(Path(__file__).parent.parent / "performance.py")}
+
+
+def format_queries(recorder: QueryRecorder) -> str:
+    """
+    Format the recorded queries with the frames of the project that executed them.
+    """
+    project_dir = str(settings.DJANGO_PROJECT_DIR)
+    lines = []
+    for number, (sql, stack) in enumerate(recorder.queries, start=1):
+        lines.append(f"{number}. {sql}")
+        for frame in stack:
+            if frame.filename.startswith(project_dir) and (
+                frame.filename not in HARNESS_FILES
+            ):
+                lines.append(
+                    f"     {frame.filename}:{frame.lineno} in {frame.name}\n"
+                    f"       {frame.line}"
+                )
+    return "\n".join(lines)
+
+
+class QueryBudgetMixin:
+    """
+    Guard against N+1 queries with a budget of queries per request.
+    """
+
+    @contextmanager
+    def assertQueryBudget(
+        self, budget: int, using: str = "default"
+    ) -> Iterator[QueryRecorder]:
+        """
+        Fail when the block executes more than ``budget`` queries on the database,
+        with the SQL and the stack of every query.
+
+        The recorder is returned, so the number of queries of variants of a request
+        (page sizes, related objects) can be compared.
+        """
+        with QueryRecorder(capture=True).record(using) as recorder:
+            yield recorder
+
+        if recorder.count > budget:
+            self.fail(
+                f"{recorder.count} queries executed, the budget is {budget}:\n"
+                f"{format_queries(recorder)}"
+            )
@@ -0,0 +1,78 @@
+from unittest.mock import MagicMock, patch
+
+from django.db import OperationalError
+from django.test import SimpleTestCase, override_settings
+
+from ..db import ReplicaRouter, replica_reads, warm_up_connections
+
+
+def get_connection(conn_max_age: int = 0, pool: dict | None = None) -> MagicMock:
+    connection = MagicMock(alias="default")
+    connection.settings_dict = {
+        "CONN_MAX_AGE": conn_max_age,
+        "OPTIONS": {"pool": pool} if pool else {},
+    }
+    return connection
+
+
+class WarmUpConnectionsTests(SimpleTestCase):
+    def warm_up(self, *connections: MagicMock):
+        with patch("openzaak_new.utils.db.connections") as handler:
+            handler.all.return_value = list(connections)
+            warm_up_connections()
+
+    def test_persistent_connection(self):
+        connection = get_connection(conn_max_age=60)
+
+        self.warm_up(connection)
+
+        connection.ensure_connection.assert_called_once_with()
+        # kept open for the first request
+        connection.close.assert_not_called()
+
+    def test_pool(self):
+        connection = get_connection(pool={"min_size": 2})
+
+        self.warm_up(connection)
+
+        connection.ensure_connection.assert_called_once_with()
+        # returned to the pool
+        connection.close.assert_called_once_with()
+
+    def test_connection_per_request(self):
+        connection = get_connection(conn_max_age=0)
+
+        self.warm_up(connection)
+
+        connection.ensure_connection.assert_not_called()
+
+    def test_database_unavailable(self):
+        unavailable = get_connection(conn_max_age=60)
+        unavailable.ensure_connection.side_effect = OperationalError
+        connection = get_connection(conn_max_age=60)
+
+        with self.assertLogs("openzaak_new.utils.db", level="WARNING"):
+            self.warm_up(unavailable, connection)
+
+        connection.ensure_connection.assert_called_once_with()
+
+
+@override_settings(DB_REPLICAS=["replica_0", "replica_1", "replica_2"])
+class ReplicaRouterTests(SimpleTestCase):
+    def test_one_replica_per_context(self):
+        router = ReplicaRouter()
+
+        for _ in range(10):
+            with replica_reads() as alias:
+                databases = {router.db_for_read(None) for _ in range(20)}
+
+            self.assertEqual(databases, {alias})
+
+    def test_outside_context(self):
+        self.assertIsNone(ReplicaRouter().db_for_read(None))
+
+    @override_settings(DB_REPLICAS=[])
+    def test_without_replicas(self):
+        with replica_reads() as alias:
+            self.assertIsNone(alias)
+            self.assertIsNone(ReplicaRouter().db_for_read(None))
@@ -0,0 +1,234 @@
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from django_loose_fk.loaders import FetchError
+from zgw_consumers.constants import APITypes, AuthTypes
+from zgw_consumers.test.factories import ServiceFactory
+
+from openzaak_new.components.zaken.models import Zaak
+from openzaak_new.components.zaken.tests.factories import ZaakFactory
+
+from ..loaders import CachedServiceLoader, TTLCache, prefetch_loose_fk
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "axes": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+}
+
+
+class StubCatalogiHandler(BaseHTTPRequestHandler):
+    """
+    Serve ``/catalogi/api/v1/zaaktypen/<identificatie>``, slowly, and count the
+    requests.
+    """
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests[self.path] += 1
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            time.sleep(server.delay)
+            identificatie = self.path.rstrip("/").rsplit("/", 1)[-1]
+            if identificatie == "missing":
+                self.send_response(404)
+                self.end_headers()
+                return
+
+            body = json.dumps(
+                {
+                    "url": f"{server.api_root}zaaktypen/{identificatie}",
+                    "identificatie": identificatie,
+                }
+            ).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+@override_settings(CACHES=LOCMEM_CACHES, ALLOWED_HOSTS=["testserver"])
+class CachedServiceLoaderTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # the stub Catalogi API, before ``setUpTestData`` configures its service
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubCatalogiHandler)
+        cls.server.api_root = (
+            f"http://127.0.0.1:{cls.server.server_port}/catalogi/api/v1/"
+        )
+        cls.server.lock = threading.Lock()
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.addClassCleanup(cls.server.server_close)
+        cls.addClassCleanup(cls.server.shutdown)
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.service = ServiceFactory.create(
+            api_root=cls.server.api_root,
+            api_type=APITypes.ztc,
+            auth_type=AuthTypes.no_auth,
+        )
+
+    def setUp(self):
+        super().setUp()
+        caches["default"].clear()
+        self.server.requests = Counter()
+        self.server.active = self.server.max_active = 0
+        self.server.delay = 0
+        self.loader = CachedServiceLoader()
+
+    def get_url(self, identificatie: str) -> str:
+        return f"{self.server.api_root}zaaktypen/{identificatie}"
+
+    def get_requests(self, identificatie: str) -> int:
+        return self.server.requests[f"/catalogi/api/v1/zaaktypen/{identificatie}"]
+
+    def create_zaak(self, identificatie: str) -> Zaak:
+        return ZaakFactory.create(
+            _zaaktype_base_url=self.service,
+            _zaaktype_relative_url=f"zaaktypen/{identificatie}",
+        )
+
+    def test_fetch_is_cached_in_the_process(self):
+        for _ in range(3):
+            data = self.loader.fetch_object(self.get_url("ZKT-1"))
+
+        self.assertEqual(data["identificatie"], "ZKT-1")
+        self.assertEqual(self.get_requests("ZKT-1"), 1)
+
+    def test_fetch_is_cached_between_processes(self):
+        self.loader.fetch_object(self.get_url("ZKT-1"))
+
+        # another process has its own local cache
+        data = CachedServiceLoader().fetch_object(self.get_url("ZKT-1"))
+
+        self.assertEqual(data["identificatie"], "ZKT-1")
+        self.assertEqual(self.get_requests("ZKT-1"), 1)
+
+    def test_local_cache_expires(self):
+        self.loader.fetch_object(self.get_url("ZKT-1"))
+        caches["default"].clear()
+
+        with patch(
+            "openzaak_new.utils.loaders.monotonic", return_value=time.monotonic() + 61
+        ):
+            self.loader.fetch_object(self.get_url("ZKT-1"))
+
+        self.assertEqual(self.get_requests("ZKT-1"), 2)
+
+    def test_concurrent_fetches_are_coalesced(self):
+        self.server.delay = 0.2
+        url = self.get_url("ZKT-1")
+        results = []
+
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    self.loader.fetch_object(url, self.service)
+                )
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 5)
+        self.assertEqual(self.get_requests("ZKT-1"), 1)
+
+    def test_fetch_error(self):
+        with self.assertRaises(FetchError):
+            self.loader.fetch_object(self.get_url("missing"))
+        # errors aren't cached
+        with self.assertRaises(FetchError):
+            self.loader.fetch_object(self.get_url("missing"))
+
+        self.assertEqual(self.get_requests("missing"), 2)
+
+    def test_no_service(self):
+        with self.assertRaises(FetchError):
+            self.loader.fetch_object("https://unknown.example.com/zaaktypen/1")
+
+    def test_prefetch(self):
+        self.server.delay = 0.1
+        identificaties = ["ZKT-1", "ZKT-2", "ZKT-3", "ZKT-1", "missing"]
+
+        self.loader.prefetch(map(self.get_url, identificaties))
+
+        for identificatie in set(identificaties):
+            self.assertEqual(self.get_requests(identificatie), 1)
+        # the distinct URLs were fetched in parallel
+        self.assertGreater(self.server.max_active, 1)
+
+        with self.assertNumQueries(0):
+            data = self.loader.fetch_object(self.get_url("ZKT-2"))
+        self.assertEqual(data["identificatie"], "ZKT-2")
+        self.assertEqual(self.get_requests("ZKT-2"), 1)
+
+    def test_prefetch_from_shared_cache(self):
+        CachedServiceLoader().fetch_object(self.get_url("ZKT-1"))
+
+        with self.assertNumQueries(0):
+            self.loader.prefetch([self.get_url("ZKT-1")])
+
+        self.assertEqual(self.get_requests("ZKT-1"), 1)
+
+    @override_settings(
+        DEFAULT_LOOSE_FK_LOADER="openzaak_new.utils.loaders.CachedServiceLoader"
+    )
+    def test_zaaktype_of_zaken(self):
+        self.create_zaak("ZKT-1")
+        self.create_zaak("ZKT-2")
+        self.create_zaak("ZKT-1")
+        ZaakFactory.create()
+
+        zaken = list(Zaak.objects.order_by("pk"))
+        prefetch_loose_fk(zaken, "zaaktype")
+
+        self.assertEqual(
+            [zaak.zaaktype and zaak.zaaktype.identificatie for zaak in zaken],
+            ["ZKT-1", "ZKT-2", "ZKT-1", None],
+        )
+        self.assertEqual(self.get_requests("ZKT-1"), 1)
+        self.assertEqual(self.get_requests("ZKT-2"), 1)
+
+
+class TTLCacheTests(SimpleTestCase):
+    def test_least_recently_used_is_evicted(self):
+        cache = TTLCache(maxsize=2, timeout=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_entries_expire(self):
+        cache = TTLCache(maxsize=2, timeout=60)
+        cache.set("a", 1)
+
+        with patch(
+            "openzaak_new.utils.loaders.monotonic", return_value=time.monotonic() + 61
+        ):
+            self.assertIsNone(cache.get("a"))
@@ -0,0 +1,113 @@
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse, reverse_lazy
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from openzaak_new.components.zaken.tests.factories import ZaakFactory
+
+from ..performance import measure, timed
+
+
+@override_settings(
+    PERFORMANCE_SAMPLE_RATE=1,
+    PERFORMANCE_SERVER_TIMING=True,
+)
+class PerformanceMiddlewareTests(APITestCase):
+    list_url = reverse_lazy("zaak-list", kwargs={"version": "1"})
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.zaken = ZaakFactory.create_batch(3)
+
+    def test_logs_metrics(self):
+        with self.assertLogs("performance", "INFO") as logs:
+            response = self.client.get(self.list_url, {"countStrategy": "exact"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        [record] = logs.records
+        values = record.performance
+        self.assertEqual(values["method"], "GET")
+        self.assertEqual(values["view"], "zaak-list")
+        self.assertEqual(values["status"], 200)
+        self.assertEqual(values["queries"], 2)
+        self.assertEqual(values["size"], len(response.content))
+        self.assertIn("serialize", values)
+        self.assertGreaterEqual(values["duration"], values["db"])
+        self.assertIn("queries=2", record.getMessage())
+
+    async def test_async_request(self):
+        with self.assertLogs("performance", "INFO") as logs:
+            response = await self.async_client.get(
+                self.list_url, {"countStrategy": "exact"}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # the queries of the view are made in another thread than the middleware's
+        self.assertEqual(logs.records[0].performance["queries"], 2)
+        self.assertIn("Server-Timing", response)
+
+    def test_server_timing(self):
+        url = reverse(
+            "zaak-detail", kwargs={"version": "1", "uuid": self.zaken[0].uuid}
+        )
+
+        response = self.client.get(url)
+
+        timings = [
+            timing.split(";")[0] for timing in response["Server-Timing"].split(", ")
+        ]
+        self.assertEqual(timings, ["db", "serialize", "total"])
+        self.assertIn('desc="', response["Server-Timing"])
+
+    @override_settings(PERFORMANCE_SERVER_TIMING=False)
+    def test_without_server_timing(self):
+        with self.assertLogs("performance", "INFO"):
+            response = self.client.get(self.list_url)
+
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(PERFORMANCE_SAMPLE_RATE=0.5)
+    def test_sampling(self):
+        with patch("openzaak_new.utils.middleware.random.random", return_value=0.7):
+            with self.assertNoLogs("performance"):
+                response = self.client.get(self.list_url)
+        self.assertNotIn("Server-Timing", response)
+
+        with patch("openzaak_new.utils.middleware.random.random", return_value=0.3):
+            with self.assertLogs("performance", "INFO"):
+                response = self.client.get(self.list_url)
+        self.assertIn("Server-Timing", response)
+
+    @override_settings(PERFORMANCE_SAMPLE_RATE=0)
+    def test_disabled(self):
+        with self.assertNoLogs("performance"):
+            response = self.client.get(self.list_url)
+
+        self.assertNotIn("Server-Timing", response)
+
+    def test_streaming_response(self):
+        with self.assertLogs("performance", "INFO") as logs:
+            response = self.client.get(self.list_url, {"stream": "true"})
+            b"".join(response.streaming_content)
+
+        self.assertEqual(logs.records[0].performance["size"], "-")
+
+
+class TimedTests(SimpleTestCase):
+    def test_outside_of_measured_block(self):
+        with timed("serialize"):
+            pass
+
+    def test_timings_add_up(self):
+        with measure() as metrics:
+            with timed("serialize"):
+                pass
+            with timed("serialize"):
+                pass
+
+        self.assertEqual(list(metrics.timings), ["serialize"])
+        self.assertEqual(metrics.queries.count, 0)
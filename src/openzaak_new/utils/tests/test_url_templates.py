@@ -0,0 +1,132 @@
+import uuid
+from unittest.mock import patch
+
+from django.http import HttpResponse
+from django.test import SimpleTestCase, override_settings
+from django.urls import path
+
+from rest_framework.request import Request
+from rest_framework.reverse import reverse
+from rest_framework.test import APIRequestFactory
+from rest_framework.versioning import URLPathVersioning
+
+from openzaak_new.components.zaken.models import Zaak
+from openzaak_new.utils import url_templates
+from openzaak_new.utils.url_templates import clear_url_templates, get_url_template
+
+# the detail view of the zaken identified by their primary key
+urlpatterns = [
+    path(
+        "api/v<version>/zaken/<int:pk>",
+        lambda request, **kwargs: HttpResponse(),
+        name="zaak-detail",
+    ),
+]
+
+
+def get_request(
+    host: str = "testserver", secure: bool = False, data: dict | None = None
+) -> Request:
+    request = Request(
+        APIRequestFactory().get("/", data, HTTP_HOST=host, secure=secure),
+    )
+    request.version = "1"
+    request.versioning_scheme = URLPathVersioning()
+    return request
+
+
+class URLTemplateTests(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        clear_url_templates()
+        self.addCleanup(clear_url_templates)
+
+    def test_same_url_as_reverse(self):
+        identifier = uuid.uuid4()
+
+        for request in (None, get_request(), get_request("example.com", secure=True)):
+            with self.subTest(request=request):
+                template = get_url_template(
+                    "zaak-detail", "uuid", request=request, version="1"
+                )
+
+                self.assertEqual(
+                    template.format(identifier),
+                    reverse(
+                        "zaak-detail",
+                        kwargs={"version": "1", "uuid": identifier},
+                        request=request,
+                    ),
+                )
+
+    def test_reversed_once(self):
+        with patch.object(url_templates, "reverse", wraps=reverse) as mock_reverse:
+            for _ in range(3):
+                get_url_template("zaak-detail", "uuid", request=get_request())
+
+        mock_reverse.assert_called_once()
+
+    @override_settings(ALLOWED_HOSTS=["*"])
+    def test_keyed_on_scheme_and_host(self):
+        path = reverse("zaak-list", kwargs={"version": "1"})
+
+        templates = {
+            get_url_template("zaak-detail", "uuid", request=request).prefix
+            for request in (
+                get_request("a.example.com"),
+                get_request("b.example.com"),
+                get_request("a.example.com", secure=True),
+            )
+        }
+
+        self.assertEqual(
+            templates,
+            {
+                f"http://a.example.com{path}/",
+                f"http://b.example.com{path}/",
+                f"https://a.example.com{path}/",
+            },
+        )
+
+    def test_keyed_on_format_override(self):
+        identifier = uuid.uuid4()
+        path = reverse("zaak-detail", kwargs={"version": "1", "uuid": identifier})
+
+        urls = [
+            get_url_template("zaak-detail", "uuid", request=request).format(identifier)
+            for request in (get_request(data={"format": "json"}), get_request())
+        ]
+
+        self.assertEqual(
+            urls,
+            [f"http://testserver{path}?format=json", f"http://testserver{path}"],
+        )
+
+    def test_cleared_when_urlconf_changes(self):
+        get_url_template("zaak-detail", "uuid", request=get_request())
+
+        with override_settings(ROOT_URLCONF="openzaak_new.urls"):
+            self.assertEqual(url_templates._templates, {})
+
+
+class AbsoluteAPIURLTests(SimpleTestCase):
+    def test_get_absolute_api_url(self):
+        zaak = Zaak(uuid=uuid.uuid4())
+        path = reverse("zaak-detail", kwargs={"version": "1", "uuid": zaak.uuid})
+
+        self.assertEqual(
+            zaak.get_absolute_api_url(request=get_request()),
+            f"http://testserver{path}",
+        )
+        self.assertEqual(zaak.get_absolute_api_url(), path)
+
+    @override_settings(ROOT_URLCONF=__name__)
+    def test_lookup_field(self):
+        zaak = Zaak(pk=5)
+
+        with patch.object(Zaak, "lookup_field", "pk"):
+            self.assertEqual(
+                zaak.get_absolute_api_url(request=get_request()),
+                "http://testserver/api/v1/zaken/5",
+            )
+            self.assertEqual(zaak.get_absolute_api_url(), "/api/v1/zaken/5")
@@ -0,0 +1,98 @@
+"""
+Templates for the URLs of API resources.
+
+Reversing a URL goes through the URL resolver for every call, while the URLs of the
+objects of a single resource only differ in their identifier. A template is
+reversed once with a placeholder for the identifier, after which the URL of every
+object is built with string formatting.
+
+Templates are shared between requests in a module level cache, keyed on everything
+that makes the URL differ: the view name and kwargs, the API version and format, the
+scheme, host and script prefix of the request, and its ``?format=`` override, which
+DRF keeps in the URL.
+"""
+
+from typing import NamedTuple
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import get_script_prefix
+
+from rest_framework.reverse import reverse
+from rest_framework.settings import api_settings
+
+PLACEHOLDER = "id-placeholder"
+
+# the number of templates kept, which bounds the cache for unexpected hosts
+MAX_TEMPLATES = 1000
+
+_templates: dict[tuple, "URLTemplate"] = {}
+
+
+class URLTemplate(NamedTuple):
+    prefix: str
+    suffix: str
+
+    def format(self, identifier) -> str:
+        return f"{self.prefix}{identifier}{self.suffix}"
+
+
+def get_url_template(
+    view_name: str,
+    lookup_url_kwarg: str,
+    request=None,
+    format: str | None = None,
+    **kwargs,
+) -> URLTemplate:
+    """
+    Return the template of the URL of ``view_name`` with ``lookup_url_kwarg`` as the
+    identifier.
+
+    Like :func:`rest_framework.reverse.reverse`, the URL is absolute if ``request`` is
+    given, and versioned according to the versioning scheme of the request.
+    """
+    if request is not None:
+        scheme, host = request.scheme, request.get_host()
+        # appended as query string by ``preserve_builtin_query_params``
+        format_override = request.GET.get(api_settings.URL_FORMAT_OVERRIDE)
+    else:
+        scheme = host = format_override = None
+
+    key = (
+        view_name,
+        getattr(request, "version", None),
+        scheme,
+        host,
+        get_script_prefix(),
+        format,
+        format_override,
+        lookup_url_kwarg,
+        tuple(sorted(kwargs.items())),
+    )
+    try:
+        return _templates[key]
+    except KeyError:
+        pass
+
+    url = reverse(
+        view_name,
+        kwargs={**kwargs, lookup_url_kwarg: PLACEHOLDER},
+        request=request,
+        format=format,
+    )
+    prefix, _, suffix = url.partition(PLACEHOLDER)
+
+    if len(_templates) >= MAX_TEMPLATES:
+        _templates.clear()
+    template = _templates[key] = URLTemplate(prefix, suffix)
+    return template
+
+
+def clear_url_templates() -> None:
+    _templates.clear()
+
+
+@receiver(setting_changed, dispatch_uid="url_templates.clear_on_setting_changed")
+def clear_on_setting_changed(*, setting, **kwargs):
+    if setting in ("ROOT_URLCONF", "FORCE_SCRIPT_NAME"):
+        clear_url_templates()
@@ -14,3 +14,12 @@ from openzaak_new.setup import setup_env
 setup_env()
 
 application = get_wsgi_application()
+
+try:
+    from uwsgidecorators import postfork
+except ImportError:  # not running under uwsgi
+    pass
+else:
+    from openzaak_new.utils.db import warm_up_connections
+
+    postfork(warm_up_connections)